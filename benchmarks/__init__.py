@@ -0,0 +1 @@
+"""Offline benchmarks for the agent loop and tools (no API calls)."""
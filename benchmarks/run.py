@@ -0,0 +1,252 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.call_function import get_project_root, tool_cache  # noqa: E402
+from agent_core.engine import MAX_ITERATIONS, run_session  # noqa: E402
+from agent_core.providers.prompt_loader import get_settings  # noqa: E402
+from agent_core.tracing import (  # noqa: E402
+    configure_tracing,
+    flush_tracing,
+    read_spans,
+    summarize,
+)
+from benchmarks.scripted_model import ScriptedAgentModel  # noqa: E402
+from benchmarks.workloads import WORKLOADS  # noqa: E402
+
+# Workloads are built here; the directory is removed after each run
+WORKDIR = os.path.join(root_dir, "benchmarks", "workdir")
+
+# Metrics compared against a baseline, where larger is worse
+GATED_METRICS = ("wall_ms", "peak_alloc_bytes", "peak_rss_kb")
+
+
+def _prepare(name):
+    """Create a fresh directory for a workload and build its files."""
+    workdir = os.path.join(WORKDIR, name)
+    shutil.rmtree(workdir, ignore_errors=True)
+    os.makedirs(workdir)
+    rel_dir = os.path.relpath(workdir, get_project_root())
+    return WORKLOADS[name](workdir, rel_dir.replace(os.sep, "/"))
+
+
+def _run_once(name, stream):
+    """Run a workload's scripted session once; returns wall time in ms."""
+    prompt, script = _prepare(name)
+    tool_cache.clear()
+    agent_model = ScriptedAgentModel(script)
+    tool_workers = get_settings().get("MAX_TOOL_WORKERS", 1)
+
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        result = asyncio.run(run_session(
+            agent_model,
+            "You are a benchmark.",
+            prompt,
+            tool_workers=tool_workers,
+            max_iterations=MAX_ITERATIONS,
+            stream=stream,
+            checkpoint=False,
+        ))
+    elapsed = (time.perf_counter() - started) * 1000
+    if result["response"] is None:
+        raise RuntimeError(f"Workload {name} did not finish")
+    return elapsed
+
+
+def measure(name, repeat=3, stream=False):
+    """
+    Measure one workload in the current process.
+
+    Timed runs are traced to get per-tool latency; one more run under
+    tracemalloc measures peak allocations.
+
+    Returns:
+        dict: 'wall_ms' (median), 'wall_ms_runs', 'tools' (per-tool
+              p50/p95 from the trace), 'peak_alloc_bytes' and
+              'peak_rss_kb'
+    """
+    try:
+        with tempfile.TemporaryDirectory() as trace_dir:
+            trace_path = os.path.join(trace_dir, "trace.jsonl")
+            configure_tracing(trace_path)
+            runs = [_run_once(name, stream) for _ in range(repeat)]
+            flush_tracing()
+            configure_tracing(None)
+            tools = {
+                row["name"]: {
+                    "count": row["count"] // repeat,
+                    "p50_ms": row["p50_ms"],
+                    "p95_ms": row["p95_ms"],
+                }
+                for row in summarize(read_spans([trace_path]))
+                if row["kind"] == "tool"
+            }
+
+        tracemalloc.start()
+        try:
+            _run_once(name, stream)
+            peak_alloc = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    finally:
+        shutil.rmtree(os.path.join(WORKDIR, name), ignore_errors=True)
+        with contextlib.suppress(OSError):
+            os.rmdir(WORKDIR)
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_rss //= 1024
+
+    return {
+        "wall_ms": round(statistics.median(runs), 3),
+        "wall_ms_runs": [round(run, 3) for run in runs],
+        "tools": tools,
+        "peak_alloc_bytes": peak_alloc,
+        "peak_rss_kb": peak_rss,
+    }
+
+
+def measure_in_subprocess(name, repeat, stream):
+    """Measure a workload in a fresh interpreter, so peak RSS is its own."""
+    command = [
+        sys.executable, "-m", "benchmarks.run",
+        "--child", name, "--repeat", str(repeat),
+    ]
+    if stream:
+        command.append("--stream")
+    completed = subprocess.run(
+        command, cwd=root_dir, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"Workload {name} failed:\n{completed.stderr.strip()}"
+        )
+    return json.loads(completed.stdout)
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results with a baseline.
+
+    Returns:
+        list: Human-readable descriptions of metrics that got worse by more
+              than tolerance (a fraction of the baseline value)
+    """
+    regressions = []
+    for name, metrics in results.items():
+        expected = baseline.get(name)
+        if not expected:
+            continue
+        for metric in GATED_METRICS:
+            old, new = expected.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            if new > old * (1 + tolerance):
+                regressions.append(
+                    f"{name}.{metric}: {old} -> {new} "
+                    f"(+{(new / old - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def print_report(results):
+    for name, metrics in results.items():
+        print(
+            f"{name}: {metrics['wall_ms']:.1f} ms, "
+            f"peak alloc {metrics['peak_alloc_bytes'] / 1e6:.1f} MB, "
+            f"peak RSS {metrics['peak_rss_kb'] / 1024:.1f} MB"
+        )
+        for tool, stats in sorted(metrics["tools"].items()):
+            print(
+                f"    {tool:<18} x{stats['count']:<4} "
+                f"p50 {stats['p50_ms']:8.2f} ms  "
+                f"p95 {stats['p95_ms']:8.2f} ms"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the offline agent benchmarks"
+    )
+    parser.add_argument(
+        "workloads",
+        nargs="*",
+        help=f"Workloads to run (default: all of {', '.join(WORKLOADS)})"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per workload"
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Drive the loop through the streaming code path"
+    )
+    parser.add_argument(
+        "--save-baseline", type=str, help="Write the results to this file"
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        help="Fail if any workload is slower or larger than this baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed regression against the baseline (default: 0.25)"
+    )
+    parser.add_argument("--child", type=str, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.repeat, args.stream)))
+        return
+
+    names = args.workloads or list(WORKLOADS)
+    unknown = [name for name in names if name not in WORKLOADS]
+    if unknown:
+        parser.error(f"unknown workloads: {', '.join(unknown)}")
+
+    results = {
+        name: measure_in_subprocess(name, args.repeat, args.stream)
+        for name in names
+    }
+    print_report(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("Regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import json
+import os
+import sys
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+# Add src directory to Python path for imports
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+src_dir = os.path.join(root_dir, "src")
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from agent_core.engine import AgentModel  # noqa: E402
+
+# Characters of text per streamed chunk
+STREAM_CHUNK_CHARS = 16
+
+
+def tool_call(name, args, call_id):
+    """Build a tool call dict for a scripted AIMessage."""
+    return {"name": name, "args": args, "id": call_id, "type": "tool_call"}
+
+
+def scripted_response(content="", tool_calls=None, prompt_tokens=0,
+                      completion_tokens=0):
+    """
+    Build an AIMessage for a script, with OpenAI-style token usage.
+
+    Returns:
+        AIMessage: The canned response
+    """
+    return AIMessage(
+        content=content,
+        tool_calls=tool_calls or [],
+        response_metadata={"token_usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+        }},
+        usage_metadata={
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    )
+
+
+class ScriptedChatModel:
+    """
+    Deterministic stand-in for ChatOpenAI that replays canned responses.
+
+    Each ainvoke() or astream() call returns the next AIMessage of the
+    script, whatever the messages are. Streaming splits the text and each
+    tool call's JSON arguments into several chunks, like the real API.
+    """
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = 0
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _next(self):
+        if self.calls >= len(self.script):
+            raise RuntimeError("Scripted model ran out of responses")
+        response = self.script[self.calls]
+        self.calls += 1
+        return response
+
+    async def ainvoke(self, messages):
+        return self._next()
+
+    async def astream(self, messages):
+        response = self._next()
+        content = response.content or ""
+        for start in range(0, len(content), STREAM_CHUNK_CHARS):
+            yield AIMessageChunk(
+                content=content[start:start + STREAM_CHUNK_CHARS]
+            )
+
+        for index, call in enumerate(response.tool_calls):
+            args = json.dumps(call["args"])
+            middle = len(args) // 2
+            yield AIMessageChunk(content="", tool_call_chunks=[{
+                "name": call["name"], "args": args[:middle],
+                "id": call["id"], "index": index,
+            }])
+            yield AIMessageChunk(content="", tool_call_chunks=[{
+                "name": None, "args": args[middle:], "id": None,
+                "index": index,
+            }])
+
+        yield AIMessageChunk(
+            content="", usage_metadata=response.usage_metadata
+        )
+
+
+class ScriptedAgentModel(AgentModel):
+    """An AgentModel whose ChatOpenAI is replaced by a ScriptedChatModel."""
+
+    def __init__(self, script, model="scripted"):
+        self.model = model
+        self.temperature = 0
+        self.llm_with_tools = self._bind(ScriptedChatModel(script))
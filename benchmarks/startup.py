@@ -0,0 +1,150 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.providers.prompt_loader import get_settings  # noqa: E402
+
+# Startup scenarios: name -> interpreter arguments. "help" is the CLI's
+# cheapest path; "engine" is what any real query (including one answered
+# from the response cache) has to import before the first model call.
+SCENARIOS = {
+    "help": [os.path.join("src", "agent_core", "main.py"), "--help"],
+    "engine": ["-c", "import agent_core.engine"],
+}
+
+
+def parse_importtime(stderr):
+    """
+    Parse the report written by `python -X importtime`.
+
+    Args:
+        stderr: The interpreter's stderr
+
+    Returns:
+        list: (module, cumulative_us) for every top-level import, that is
+              one not triggered by another import
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        # Nested imports are indented past the single separating space
+        if parts[2].startswith("  "):
+            continue
+        imports.append((parts[2].strip(), int(parts[1])))
+    return imports
+
+
+def run_importtime(args):
+    """Run the interpreter once under -X importtime; returns the imports."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.path.join(root_dir, "src"), env.get("PYTHONPATH", "")]
+    ).rstrip(os.pathsep)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=root_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"{' '.join(args)} failed:\n{completed.stderr.strip()[-2000:]}"
+        )
+    return parse_importtime(completed.stderr)
+
+
+def measure(args, repeat):
+    """
+    Measure the import time of one scenario.
+
+    Returns:
+        dict: 'import_ms' (median over the runs) and 'slowest', the
+              top-level imports of the median run ordered by cost
+    """
+    runs = []
+    for _ in range(repeat):
+        imports = run_importtime(args)
+        runs.append((sum(us for _, us in imports), imports))
+    runs.sort(key=lambda run: run[0])
+    total, imports = runs[len(runs) // 2]
+    return {
+        "import_ms": round(total / 1000, 1),
+        "slowest": sorted(imports, key=lambda item: item[1], reverse=True),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure CLI import time with -X importtime and fail when it "
+            "exceeds STARTUP_IMPORT_BUDGET_MS"
+        )
+    )
+    parser.add_argument(
+        "scenarios",
+        nargs="*",
+        help=f"Scenarios to run (default: all of {', '.join(SCENARIOS)})"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per scenario"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=5,
+        help="Number of slowest top-level imports to show per scenario"
+    )
+    args = parser.parse_args()
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    budgets = get_settings().get("STARTUP_IMPORT_BUDGET_MS") or {}
+    # The interpreter's own startup imports (site, encodings, .pth files)
+    # are measured once and subtracted, so budgets only cover the agent
+    interpreter = measure(["-c", "pass"], args.repeat)
+    interpreter_ms = interpreter["import_ms"]
+    startup_modules = {module for module, _ in interpreter["slowest"]}
+    print(f"interpreter: {interpreter_ms:.1f} ms (not counted)")
+
+    over_budget = []
+    for name in names:
+        result = measure(SCENARIOS[name], args.repeat)
+        import_ms = round(max(0.0, result["import_ms"] - interpreter_ms), 1)
+        budget = budgets.get(name)
+        print(
+            f"{name}: {import_ms:.1f} ms"
+            + (f" (budget {budget} ms)" if budget is not None else "")
+        )
+        slowest = [
+            (module, us) for module, us in result["slowest"]
+            if module not in startup_modules
+        ]
+        for module, us in slowest[:args.top]:
+            print(f"    {module:<40} {us / 1000:8.1f} ms")
+        if budget is not None and import_ms > budget:
+            over_budget.append(f"{name}: {import_ms:.1f} ms > {budget} ms")
+
+    if over_budget:
+        print("Over budget:")
+        for line in over_budget:
+            print(f"  {line}")
+        sys.exit(1)
+    print("Startup within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import os
+
+from benchmarks.scripted_model import scripted_response, tool_call
+
+# Synthetic workloads: name -> function(workdir, rel_dir) that creates the
+# workload's files under workdir and returns (prompt, script). rel_dir is
+# workdir relative to the project root, as the tools see it.
+WORKLOADS = {}
+
+
+def workload(func):
+    """Register a workload under its function name."""
+    WORKLOADS[func.__name__] = func
+    return func
+
+
+def _final(text="Done."):
+    return scripted_response(
+        content=text, prompt_tokens=1000, completion_tokens=20
+    )
+
+
+def _turn(calls, turn):
+    return scripted_response(
+        tool_calls=[
+            tool_call(name, args, f"call_{turn}_{i}")
+            for i, (name, args) in enumerate(calls)
+        ],
+        prompt_tokens=1000,
+        completion_tokens=50,
+    )
+
+
+@workload
+def many_small_reads(workdir, rel_dir):
+    """Four turns of 50 parallel reads of small files."""
+    for i in range(200):
+        with open(os.path.join(workdir, f"module_{i:03d}.py"), "w") as f:
+            f.write(f"# module {i}\n" + "x = 1\n" * 300)
+
+    script = [
+        _turn([
+            ("get_file_content",
+             {"file_path": f"{rel_dir}/module_{turn * 50 + i:03d}.py"})
+            for i in range(50)
+        ], turn)
+        for turn in range(4)
+    ]
+    return "Read every module.", script + [_final()]
+
+
+@workload
+def deep_tree(workdir, rel_dir):
+    """Recursive listings and a search over a tree six levels deep."""
+    def build(path, depth):
+        for i in range(4):
+            with open(os.path.join(path, f"file_{i}.py"), "w") as f:
+                f.write(f"VALUE_{depth}_{i} = {i}\n")
+        if depth == 6:
+            return
+        for i in range(3):
+            child = os.path.join(path, f"dir_{i}")
+            os.makedirs(child, exist_ok=True)
+            build(child, depth + 1)
+
+    build(workdir, 0)
+    script = [
+        _turn([("get_files_info",
+                {"directory": rel_dir, "max_depth": 0, "page_size": 1000})],
+              0),
+        _turn([("get_files_info",
+                {"directory": rel_dir, "max_depth": 0,
+                 "include": ["*file_3.py"], "page_size": 1000})], 1),
+        _turn([("search_files",
+                {"pattern": "VALUE_6_3", "directory": rel_dir})], 2),
+    ]
+    return "Explore the tree.", script + [_final()]
+
+
+@workload
+def large_file(workdir, rel_dir):
+    """Ranged reads at ten positions of a 64 MB file."""
+    line = "y" * 63 + "\n"
+    with open(os.path.join(workdir, "big.log"), "w") as f:
+        for _ in range(64):
+            f.write(line * 16384)
+
+    total_lines = 64 * 16384
+    script = [
+        _turn([
+            ("get_file_content",
+             {"file_path": f"{rel_dir}/big.log",
+              "start_line": 1 + (turn * 5 + i) * total_lines // 10,
+              "end_line": 100 + (turn * 5 + i) * total_lines // 10})
+            for i in range(5)
+        ], turn)
+        for turn in range(2)
+    ]
+    return "Sample the log.", script + [_final()]
+
+
+@workload
+def chatty_script(workdir, rel_dir):
+    """Three runs of a script that prints 20 MB."""
+    with open(os.path.join(workdir, "chatty.py"), "w") as f:
+        f.write(
+            "import sys\n"
+            "line = 'z' * 99 + '\\n'\n"
+            "for _ in range(200000):\n"
+            "    sys.stdout.write(line)\n"
+        )
+    script = [
+        _turn([("run_python_file", {"file_path": f"{rel_dir}/chatty.py"})],
+              turn)
+        for turn in range(3)
+    ]
+    return "Run the script.", script + [_final()]
+
+
+@workload
+def long_session(workdir, rel_dir):
+    """A 20-iteration session that cycles through every tool."""
+    with open(os.path.join(workdir, "app.py"), "w") as f:
+        f.write("COUNTER = 0\n" + "def f():\n    return 1\n" * 200)
+    with open(os.path.join(workdir, "hello.py"), "w") as f:
+        f.write("print('hello')\n")
+
+    cycle = [
+        ("get_files_info", {"directory": rel_dir}),
+        ("get_file_content", {"file_path": f"{rel_dir}/app.py"}),
+        ("search_files", {"pattern": "COUNTER", "directory": rel_dir}),
+        ("run_python_file", {"file_path": f"{rel_dir}/hello.py"}),
+    ]
+    script = []
+    for turn in range(19):
+        name, args = cycle[turn % len(cycle)]
+        if turn % 5 == 4:
+            name, args = "edit_file", {
+                "file_path": f"{rel_dir}/app.py",
+                "edits": [{"search": f"COUNTER = {turn // 5}\n",
+                           "replace": f"COUNTER = {turn // 5 + 1}\n"}],
+            }
+        script.append(_turn([(name, args)], turn))
+    return "Work on the app.", script + [_final()]
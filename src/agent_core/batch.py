@@ -0,0 +1,302 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.normpath(os.path.join(current_dir, ".."))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+# The engine (LangChain, the OpenAI SDK and the tools) is imported where it
+# is first needed, so --help and argument errors start quickly
+from agent_core.llm_cache import CACHE_MODES  # noqa: E402
+
+# Keys checked, in order, for the query text of an input record
+QUERY_KEYS = ("query", "prompt", "body")
+
+# Keys checked, in order, for the id of an input record
+ID_KEYS = ("id", "request_id")
+
+
+def read_requests(input_path):
+    """
+    Stream (record_id, query) pairs from a JSONL file.
+
+    Blank lines are skipped. Records without an id get their line number,
+    and records without a query are yielded with query None so they still
+    get a result line.
+
+    Args:
+        input_path: Path to the input JSONL file
+
+    Yields:
+        tuple: (record_id, query)
+    """
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                yield f"line_{line_number}", None
+                continue
+            if not isinstance(record, dict):
+                yield f"line_{line_number}", None
+                continue
+
+            record_id = next(
+                (str(record[k]) for k in ID_KEYS if record.get(k)),
+                f"line_{line_number}",
+            )
+            query = next(
+                (record[k] for k in QUERY_KEYS if record.get(k)), None
+            )
+            yield record_id, query
+
+
+def read_completed_ids(output_path):
+    """
+    Collect the ids that already have a successful result in output_path.
+
+    Returns:
+        set: Ids to skip when re-running a batch after a crash
+    """
+    completed = set()
+    if not os.path.isfile(output_path):
+        return completed
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A partial line from a crash mid-write
+                continue
+            if record.get("error") is None and "id" in record:
+                completed.add(record["id"])
+    return completed
+
+
+async def run_batch(
+    input_path,
+    output_path,
+    agent_model,
+    system_template,
+    concurrency=4,
+    tool_workers=1,
+):
+    """
+    Run every query in input_path and append one result per query.
+
+    At most `concurrency` sessions run at once, and the input file is read
+    only as fast as sessions finish. Each result is written and flushed as
+    soon as its session ends, so a crash loses at most the sessions still
+    running. Ids that already have a successful result are skipped.
+
+    Args:
+        input_path: Path to the input JSONL file
+        output_path: Path to the output JSONL file (appended to)
+        agent_model: The AgentModel shared by all sessions
+        system_template: The system prompt text
+        concurrency: Maximum number of sessions to run at once
+        tool_workers: Maximum number of tool calls to run concurrently
+                      within one session
+
+    Returns:
+        dict: Counts of 'completed', 'failed' and 'skipped' records
+    """
+    from agent_core.engine import run_session
+
+    completed_ids = read_completed_ids(output_path)
+    counts = {"completed": 0, "failed": 0, "skipped": 0}
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    tasks = set()
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    with open(output_path, "a", encoding="utf-8") as out:
+
+        def write_result(record):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+
+        async def run_one(record_id, query):
+            started = time.perf_counter()
+            record = {"id": record_id, "query": query}
+            try:
+                if query is None:
+                    raise ValueError("record has no query")
+                result = await run_session(
+                    agent_model,
+                    system_template,
+                    query,
+                    tool_workers=tool_workers,
+                )
+                record["response"] = result["response"]
+                record["usage"] = result["usage"]
+                record["iterations"] = result["iterations"]
+                record["session_id"] = result["session_id"]
+                record["llm_cache_hits"] = result["llm_cache"]["hits"]
+                record["error"] = (
+                    None if result["response"] is not None
+                    else "Maximum iterations reached without a final answer"
+                )
+            except Exception as e:
+                record["error"] = f"{type(e).__name__}: {e}"
+            finally:
+                semaphore.release()
+
+            record["elapsed_seconds"] = round(
+                time.perf_counter() - started, 3
+            )
+            write_result(record)
+            counts["failed" if record["error"] else "completed"] += 1
+            print(
+                f"[{record_id}] "
+                f"{'failed' if record['error'] else 'done'} in "
+                f"{record['elapsed_seconds']}s",
+                file=sys.stderr,
+            )
+
+        for record_id, query in read_requests(input_path):
+            if record_id in completed_ids:
+                counts["skipped"] += 1
+                continue
+
+            # Wait for a free slot before reading further into the input
+            await semaphore.acquire()
+            task = asyncio.ensure_future(run_one(record_id, query))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a JSONL file of queries through the agent"
+    )
+    parser.add_argument(
+        "--input",
+        type=str,
+        default="requests.jsonl",
+        help=(
+            "JSONL file with one request per line; the query is read from "
+            "'query', 'prompt' or 'body' (default: requests.jsonl)"
+        )
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=os.path.join("logs", "batch_results.jsonl"),
+        help=(
+            "JSONL file results are appended to "
+            "(default: logs/batch_results.jsonl)"
+        )
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help=(
+            "Maximum number of sessions to run at once "
+            "(default: BATCH_CONCURRENCY from settings)"
+        )
+    )
+    parser.add_argument(
+        "--tool-workers",
+        type=int,
+        default=None,
+        help=(
+            "Maximum number of tool calls from one response to run "
+            "concurrently (default: MAX_TOOL_WORKERS from settings)"
+        )
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        default=None,
+        help=(
+            "Append timing spans for every model call and tool call to this "
+            "JSONL file (default: TRACE_FILE from settings)"
+        )
+    )
+    parser.add_argument(
+        "--llm-cache",
+        choices=CACHE_MODES,
+        default=None,
+        help=(
+            "Record model responses to, or replay them from, the local "
+            "response cache (default: LLM_CACHE_MODE from settings)"
+        )
+    )
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+
+    from agent_core.call_function import get_tool_cache_stats
+    from agent_core.engine import AgentModel
+    from agent_core.providers.prompt_loader import (
+        get_active_system_prompt,
+        get_settings,
+    )
+    from agent_core.tracing import configure_tracing
+
+    load_dotenv()
+
+    model = os.environ.get("OPENAI_MODEL")
+    settings = get_settings()
+
+    # Load configuration and build the model once for the whole batch
+    system_template, parameters = get_active_system_prompt()
+    temperature = parameters.get("temperature", 0)
+    agent_model = AgentModel(model, temperature, cache_mode=args.llm_cache)
+
+    concurrency = args.concurrency
+    if concurrency is None:
+        concurrency = settings.get("BATCH_CONCURRENCY", 4)
+    tool_workers = args.tool_workers
+    if tool_workers is None:
+        tool_workers = settings.get("MAX_TOOL_WORKERS", 1)
+    configure_tracing(
+        args.trace if args.trace is not None
+        else settings.get("TRACE_FILE")
+    )
+
+    counts = asyncio.run(
+        run_batch(
+            args.input,
+            args.output,
+            agent_model,
+            system_template,
+            concurrency=concurrency,
+            tool_workers=tool_workers,
+        )
+    )
+    print(
+        f"Batch finished: {counts['completed']} completed, "
+        f"{counts['failed']} failed, {counts['skipped']} skipped"
+    )
+    cache_stats = get_tool_cache_stats()
+    print(
+        f"Tool cache: {cache_stats['hits']} hits, "
+        f"{cache_stats['misses']} misses, {cache_stats['entries']} entries "
+        f"({cache_stats['bytes']} bytes)"
+    )
+    if counts["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
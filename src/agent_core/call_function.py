@@ -1,34 +1,27 @@
-import copy
+import asyncio
+import contextvars
+import json
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 
-from agent_core.tools.get_files_info import (
-    get_files_info,
-    get_files_info_schema,
-)
-from agent_core.tools.get_file_content import (
-    get_file_content,
-    get_file_content_schema,
-)
-from agent_core.tools.run_python_file import (
-    run_python_file,
-    run_python_file_schema,
-)
-from agent_core.tools.write_file import write_file, write_file_schema
+from agent_core.providers.prompt_loader import get_settings
+from agent_core.sandbox import clear_resolve_cache
+from agent_core.search_index import mark_stale
+from agent_core.tool_registry import ToolArgumentError, load_tools
+from agent_core.tracing import span
 
-available_tools = [
-    get_files_info_schema,
-    get_file_content_schema,
-    run_python_file_schema,
-    write_file_schema,
-]
+# Every module in agent_core/tools registers its tools on import
+TOOLS = load_tools()
+
+available_tools = [tool.schema for tool in TOOLS.values()]
 
 # Map tool names to their function implementations
-function_map = {
-    "get_files_info": get_files_info,
-    "get_file_content": get_file_content,
-    "run_python_file": run_python_file,
-    "write_file": write_file,
-}
+function_map = {name: tool.func for name, tool in TOOLS.items()}
+
+# Map tool names to their async implementations
+async_function_map = {name: tool.async_func for name, tool in TOOLS.items()}
 
 
 def get_project_root():
@@ -43,17 +36,19 @@ def get_project_root():
     return project_root
 
 
-def call_function(tool_call, verbose=False):
+# The sandbox root every tool call runs in, resolved once
+PROJECT_ROOT = get_project_root()
+
+
+def parse_tool_call(tool_call):
     """
-    Execute a tool call and return the result.
+    Extract the tool name and arguments from a tool call.
 
     Args:
         tool_call: Tool call object from LangChain (dict or ToolCall object)
-        verbose: If True, print detailed function call info
 
     Returns:
-        dict: Dictionary with 'content' key containing the result string,
-              compatible with LangChain's ToolMessage format
+        tuple: (tool_name, tool_args)
     """
     # Extract tool name and args from tool_call
     if isinstance(tool_call, dict):
@@ -81,35 +76,450 @@ def call_function(tool_call, verbose=False):
 
     # If args is a JSON string, parse it
     if isinstance(tool_args, str):
-        import json
         try:
             tool_args = json.loads(tool_args)
         except json.JSONDecodeError:
             pass
 
+    return tool_name, tool_args
+
+
+def get_tool_call_id(tool_call):
+    """
+    Get the id that links a tool call to its ToolMessage.
+
+    Args:
+        tool_call: Tool call object from LangChain (dict or ToolCall object)
+
+    Returns:
+        str: The tool call id
+    """
+    if isinstance(tool_call, dict):
+        return (
+            tool_call.get("id") or
+            tool_call.get("tool_call_id") or
+            f"call_{id(tool_call)}"
+        )
+    return getattr(
+        tool_call, "id",
+        getattr(tool_call, "tool_call_id", f"call_{id(tool_call)}")
+    )
+
+
+# Tools that only read from the working directory and can run side by side
+READ_ONLY_TOOLS = {name for name, tool in TOOLS.items() if tool.read_only}
+
+# Path argument (and its default) of each tool whose results are cached
+CACHEABLE_TOOLS = {
+    name: tool.cache_path
+    for name, tool in TOOLS.items()
+    if tool.cache_path is not None
+}
+
+
+class ToolResultCache:
+    """
+    LRU cache of read-only tool results bounded by entries and bytes.
+
+    Keys include the target path's mtime_ns and size, so a file that changes
+    on disk simply stops matching its old entries. Directory listings also
+    show the sizes of their entries, which can change without touching the
+    directory's own mtime, so they are dropped whenever a tool modifies the
+    working directory.
+    """
+
+    def __init__(self, max_bytes, max_entries):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> result string
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """Return the cached result for key, or None."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result):
+        """Store a result, evicting least recently used entries."""
+        size = len(result.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= len(self._entries.pop(key).encode("utf-8"))
+            self._entries[key] = result
+            self._bytes += size
+            while (self._bytes > self.max_bytes or
+                    len(self._entries) > self.max_entries):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.encode("utf-8"))
+                self.evictions += 1
+
+    def invalidate(self, path=None):
+        """
+        Drop entries affected by a change in the working directory.
+
+        Args:
+            path: Absolute path that was written; None means any file may
+                  have changed. Directory listings are always dropped.
+        """
+        with self._lock:
+            stale = [
+                key for key in self._entries
+                if key[0] == "get_files_info" or key[1] == path
+            ]
+            for key in stale:
+                self._bytes -= len(self._entries.pop(key).encode("utf-8"))
+            self.invalidations += len(stale)
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+            self.evictions = self.invalidations = 0
+
+    def stats(self):
+        """
+        Get the cache counters.
+
+        Returns:
+            dict: hits, misses, evictions, invalidations, entries and bytes
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+
+_settings = get_settings()
+tool_cache = ToolResultCache(
+    max_bytes=_settings.get("TOOL_CACHE_MAX_BYTES", 32 * 1024 * 1024),
+    max_entries=_settings.get("TOOL_CACHE_MAX_ENTRIES", 1024),
+)
+
+
+def get_tool_cache_stats():
+    """Get the hit/miss counters of the shared tool result cache."""
+    return tool_cache.stats()
+
+
+def _cache_key(tool, args):
+    """
+    Build the cache key for a tool call, or None if it isn't cacheable.
+
+    The key is (tool, normalized path, mtime_ns, size, other args).
+    Recursive listings and later pages are not cached: they cover
+    subdirectories whose changes don't touch the listed directory's mtime.
+    """
+    if tool.cache_path is None or not tool_cache.max_entries:
+        return None
+    if tool.name == "get_files_info" and (
+        args.get("max_depth", 1) != 1 or args.get("cursor")
+    ):
+        return None
+    arg_name, default = tool.cache_path
+    target = args.get(arg_name, default)
+    if not isinstance(target, str):
+        return None
+
+    path = os.path.normpath(os.path.join(args["working_directory"], target))
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    other_args = json.dumps(
+        {k: v for k, v in args.items()
+         if k not in (arg_name, "working_directory")},
+        sort_keys=True,
+        default=str,
+    )
+    return (tool.name, path, stat.st_mtime_ns, stat.st_size, other_args)
+
+
+def _after_call(tool, args, key, result):
+    """Update the caches once a tool call has finished."""
+    if not tool.read_only:
+        # Make the next search rescan for the files this call changed, and
+        # re-resolve paths in case directories or symlinks changed
+        mark_stale()
+        clear_resolve_cache()
+
+    if key is not None:
+        if isinstance(result, str) and not result.startswith("Error:"):
+            tool_cache.put(key, result)
+    elif tool.writes:
+        tool_cache.invalidate(os.path.normpath(os.path.join(
+            args["working_directory"], str(args.get("file_path", ""))
+        )))
+    elif not tool.read_only:
+        # Scripts can change any file
+        tool_cache.invalidate()
+
+
+def _describe_result(record, result, cached):
+    """Add a tool result's size, error flag and cache hit to its span."""
+    text = result if isinstance(result, str) else str(result)
+    record["result_chars"] = len(text)
+    record["error"] = text.startswith("Error:")
+    record["cached"] = cached
+
+
+def _prepare_call(tool_name, tool_args, verbose=False):
+    """
+    Print a parsed tool call and validate its arguments.
+
+    Returns:
+        tuple: (tool, kwargs, error) where tool is the registered Tool and
+               kwargs its validated keyword arguments, or error is a result
+               dict for unknown tools and invalid arguments
+    """
     # Print calling function info
     if verbose:
         print(f"Calling function: {tool_name}({tool_args})")
     else:
         print(f"- Calling function: {tool_name}")
 
-    # Get the function from function_map
-    if tool_name not in function_map:
-        return {
+    tool = TOOLS.get(tool_name)
+    if tool is None:
+        return None, None, {
             "content": f"Error: Unknown function '{tool_name}'"
         }
 
-    func = function_map[tool_name]
+    if tool_args is None or tool_args == "":
+        tool_args = {}
+    elif isinstance(tool_args, dict) and "working_directory" in tool_args:
+        # The sandbox root is always set here, never by the model
+        tool_args = {
+            k: v for k, v in tool_args.items() if k != "working_directory"
+        }
+    try:
+        kwargs = tool.validate(tool_args)
+    except ToolArgumentError as e:
+        return None, None, {
+            "content": f"Error: Invalid arguments for '{tool_name}': {e}"
+        }
+    kwargs["working_directory"] = PROJECT_ROOT
 
-    # Create a shallow copy of args and force working_directory
-    args_copy = copy.copy(tool_args) if tool_args else {}
-    if not isinstance(args_copy, dict):
-        args_copy = {}
-    args_copy["working_directory"] = get_project_root()
+    return tool, kwargs, None
 
-    # Call the function with **args_copy
-    try:
-        result = func(**args_copy)
-        return {"content": result}
-    except Exception as e:
-        return {"content": f"Error: {str(e)}"}
+
+def call_function(tool_call, verbose=False):
+    """
+    Execute a tool call and return the result.
+
+    Args:
+        tool_call: Tool call object from LangChain (dict or ToolCall object)
+        verbose: If True, print detailed function call info
+
+    Returns:
+        dict: Dictionary with 'content' key containing the result string,
+              compatible with LangChain's ToolMessage format
+    """
+    tool_name, tool_args = parse_tool_call(tool_call)
+    with span(
+        "tool", tool=tool_name, call_id=get_tool_call_id(tool_call)
+    ) as record:
+        tool, kwargs, error = _prepare_call(tool_name, tool_args, verbose)
+        if error:
+            # Unknown tools and invalid arguments are traced as errors too
+            _describe_result(record, error["content"], False)
+            return error
+
+        # Serve read-only tools from the cache when the target is unchanged
+        key = _cache_key(tool, kwargs)
+        cached = tool_cache.get(key) if key is not None else None
+        if cached is not None:
+            result = cached
+        else:
+            func = tool.func
+
+            # Call the function with **kwargs
+            try:
+                result = func(**kwargs)
+            except Exception as e:
+                result = f"Error: {str(e)}"
+            _after_call(tool, kwargs, key, result)
+        _describe_result(record, result, cached is not None)
+    return {"content": result}
+
+
+async def call_function_async(tool_call, verbose=False):
+    """
+    Async version of call_function using the tools' async implementations.
+
+    Args:
+        tool_call: Tool call object from LangChain (dict or ToolCall object)
+        verbose: If True, print detailed function call info
+
+    Returns:
+        dict: Dictionary with 'content' key containing the result string
+    """
+    tool_name, tool_args = parse_tool_call(tool_call)
+    with span(
+        "tool", tool=tool_name, call_id=get_tool_call_id(tool_call)
+    ) as record:
+        tool, kwargs, error = _prepare_call(tool_name, tool_args, verbose)
+        if error:
+            # Unknown tools and invalid arguments are traced as errors too
+            _describe_result(record, error["content"], False)
+            return error
+
+        # Serve read-only tools from the cache when the target is unchanged
+        key = _cache_key(tool, kwargs)
+        cached = tool_cache.get(key) if key is not None else None
+        if cached is not None:
+            result = cached
+        else:
+            func = tool.async_func
+
+            # Call the function with **kwargs
+            try:
+                result = await func(**kwargs)
+            except Exception as e:
+                result = f"Error: {str(e)}"
+            _after_call(tool, kwargs, key, result)
+        _describe_result(record, result, cached is not None)
+    return {"content": result}
+
+
+def tool_calls_conflict(first, second):
+    """
+    Check whether two tool calls must run in their original order.
+
+    Only calls to tools registered read_only=True may run at the same time.
+    Any other tool (writes, edits, script runs, unknown tools) can create,
+    change or delete files, so it is ordered against every other call.
+
+    Args:
+        first: The earlier (tool_name, tool_args) pair
+        second: The later (tool_name, tool_args) pair
+
+    Returns:
+        bool: True if second has to wait for first to finish
+    """
+    return not (first[0] in READ_ONLY_TOOLS and second[0] in READ_ONLY_TOOLS)
+
+
+def call_functions(tool_calls, verbose=False, max_workers=1):
+    """
+    Execute all tool calls from one model response.
+
+    With max_workers above 1 the calls run on a bounded thread pool. Each
+    call waits only for the earlier calls it conflicts with (see
+    tool_calls_conflict), so the results are the same as running them one
+    at a time.
+
+    Args:
+        tool_calls: List of tool call objects from a single AIMessage
+        verbose: If True, print detailed function call info
+        max_workers: Maximum number of tool calls to run at once
+
+    Returns:
+        list: One result dict per tool call, in the original order
+    """
+    if max_workers <= 1 or len(tool_calls) <= 1:
+        return [call_function(tc, verbose=verbose) for tc in tool_calls]
+
+    parsed = [parse_tool_call(tc) for tc in tool_calls]
+
+    def run(index, dependencies):
+        # Dependencies were submitted earlier, and the pool starts work in
+        # submission order, so they are already running or finished here
+        wait(dependencies)
+        return call_function(tool_calls[index], verbose=verbose)
+
+    futures = []
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(tool_calls))
+    ) as executor:
+        for index in range(len(tool_calls)):
+            dependencies = [
+                futures[earlier]
+                for earlier in range(index)
+                if tool_calls_conflict(parsed[earlier], parsed[index])
+            ]
+            # Run in a copy of the caller's context so trace spans keep
+            # their session and iteration
+            futures.append(executor.submit(
+                contextvars.copy_context().run, run, index, dependencies
+            ))
+
+    return [future.result() for future in futures]
+
+
+class AsyncToolScheduler:
+    """
+    Runs tool calls as asyncio tasks as soon as they are submitted.
+
+    Each call waits for the earlier submitted calls it conflicts with (see
+    tool_calls_conflict) and a semaphore bounds how many run at once, so
+    calls can be submitted one by one (for example while a response is
+    still streaming) and still produce the same results as running them in
+    order.
+    """
+
+    def __init__(self, verbose=False, max_workers=1):
+        self.verbose = verbose
+        self._semaphore = asyncio.Semaphore(max(1, max_workers))
+        self._submitted = []
+
+    def submit(self, tool_call):
+        """
+        Start executing a tool call.
+
+        Args:
+            tool_call: Tool call object from LangChain (dict or ToolCall)
+
+        Returns:
+            asyncio.Task: Task resolving to the call's result dict
+        """
+        parsed = parse_tool_call(tool_call)
+        dependencies = [
+            task for earlier, task in self._submitted
+            if tool_calls_conflict(earlier, parsed)
+        ]
+        task = asyncio.ensure_future(self._run(tool_call, dependencies))
+        self._submitted.append((parsed, task))
+        return task
+
+    async def _run(self, tool_call, dependencies):
+        if dependencies:
+            await asyncio.wait(dependencies)
+        async with self._semaphore:
+            return await call_function_async(tool_call, verbose=self.verbose)
+
+
+async def call_functions_async(tool_calls, verbose=False, max_workers=1):
+    """
+    Async version of call_functions for the asyncio agent loop.
+
+    Args:
+        tool_calls: List of tool call objects from a single AIMessage
+        verbose: If True, print detailed function call info
+        max_workers: Maximum number of tool calls to run at once
+
+    Returns:
+        list: One result dict per tool call, in the original order
+    """
+    scheduler = AsyncToolScheduler(verbose=verbose, max_workers=max_workers)
+    tasks = [scheduler.submit(tool_call) for tool_call in tool_calls]
+    return list(await asyncio.gather(*tasks))
@@ -0,0 +1,185 @@
+import json
+import os
+import time
+
+from langchain_core.messages import messages_from_dict, messages_to_dict
+
+from agent_core.providers.prompt_loader import get_cache_dir, get_settings
+
+
+class CheckpointError(Exception):
+    """Raised when a session cannot be resumed from its checkpoint."""
+
+
+def checkpoint_path(session_id):
+    """
+    Get the checkpoint file of a session (CACHE_DIR/checkpoints).
+
+    Returns:
+        str: Absolute path of the session's JSONL checkpoint
+    """
+    if not session_id or os.sep in session_id or session_id in (".", ".."):
+        raise CheckpointError(f"Invalid session id {session_id!r}")
+    checkpoint_dir = os.path.join(get_cache_dir(), "checkpoints")
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    return os.path.join(checkpoint_dir, f"{session_id}.jsonl")
+
+
+class SessionCheckpoint:
+    """
+    Append-only JSONL checkpoint of one session.
+
+    The first line holds the initial messages, and every iteration appends
+    one line with the messages it added and the accumulated token usage.
+    Only unfinished sessions can be resumed, so the file is deleted once a
+    session has its final answer. Each line is flushed to the OS as soon as
+    it is written, so a crash or kill loses nothing, and
+    the file is fsync'ed every fsync_every iterations (and when closed) to
+    survive power loss as well. A partly written last line is dropped when
+    the checkpoint is loaded.
+
+    Attributes:
+        iterations: Iterations completed, including those before a resume
+        prompt_tokens: Accumulated prompt tokens
+        completion_tokens: Accumulated completion tokens
+        cache_hit_iterations: Iterations answered from the LLM cache
+    """
+
+    def __init__(self, session_id, fsync_every=None):
+        if fsync_every is None:
+            fsync_every = get_settings().get("CHECKPOINT_FSYNC_EVERY", 5)
+        self.session_id = session_id
+        self.path = checkpoint_path(session_id)
+        self.fsync_every = max(1, fsync_every)
+        self.iterations = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cache_hit_iterations = []
+        self._saved_messages = 0
+        self._unsynced = 0
+        self._file = None
+
+    def _append(self, record, sync=False):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if sync or self._unsynced >= self.fsync_every:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def start(self, messages, **fields):
+        """
+        Record the start of a session.
+
+        Args:
+            messages: The initial messages (system prompt and query)
+            **fields: Extra fields to keep, such as the model name
+        """
+        self._append({
+            "type": "start",
+            "session_id": self.session_id,
+            "created": time.time(),
+            "messages": messages_to_dict(messages),
+            **fields,
+        }, sync=True)
+        self._saved_messages = len(messages)
+
+    def save(self, messages, iterations, prompt_tokens, completion_tokens,
+             cache_hit_iterations):
+        """
+        Record a finished iteration.
+
+        Only the messages added since the last save are written.
+        """
+        self.iterations = iterations
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.cache_hit_iterations = list(cache_hit_iterations)
+        self._append({
+            "type": "iteration",
+            "iteration": iterations,
+            "messages": messages_to_dict(messages[self._saved_messages:]),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached": iterations in cache_hit_iterations,
+        })
+        self._saved_messages = len(messages)
+
+    def finish(self):
+        """Delete the checkpoint of a session that has its final answer."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._unsynced = 0
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        """Write out anything not yet fsync'ed and close the file."""
+        if self._file is None:
+            return
+        if self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+        self._file.close()
+        self._file = None
+
+    @classmethod
+    def load(cls, session_id):
+        """
+        Rebuild a session from its checkpoint to continue it.
+
+        Args:
+            session_id: The id of the session to resume
+
+        Returns:
+            tuple: (checkpoint, messages, info) where checkpoint appends to
+                   the same file, messages are the LangChain messages so
+                   far and info holds the fields of the start record
+
+        Raises:
+            CheckpointError: If there is no usable checkpoint
+        """
+        checkpoint = cls(session_id)
+        if not os.path.isfile(checkpoint.path):
+            raise CheckpointError(f"No checkpoint for session {session_id}")
+
+        with open(checkpoint.path, "rb") as f:
+            data = f.read()
+        # Drop a partial last line from a crash mid-write, so the next
+        # record starts on a line of its own
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            os.truncate(checkpoint.path, end)
+
+        info = None
+        messages = []
+        for line in data[:end].decode("utf-8").splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            kind = record.pop("type", None)
+            if kind == "start":
+                messages = messages_from_dict(record.pop("messages"))
+                info = record
+            elif kind == "iteration" and info is not None:
+                messages.extend(messages_from_dict(record["messages"]))
+                checkpoint.iterations = record["iteration"]
+                checkpoint.prompt_tokens = record["prompt_tokens"]
+                checkpoint.completion_tokens = record["completion_tokens"]
+                if record.get("cached"):
+                    checkpoint.cache_hit_iterations.append(
+                        record["iteration"]
+                    )
+
+        if info is None:
+            raise CheckpointError(
+                f"Checkpoint for session {session_id} has no start record"
+            )
+        checkpoint._saved_messages = len(messages)
+        return checkpoint, messages, info
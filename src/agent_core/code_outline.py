@@ -0,0 +1,187 @@
+import ast
+import json
+import os
+import sqlite3
+
+from agent_core.providers.prompt_loader import get_cache_dir
+
+# Bump when the outline format changes, so cached outlines are rebuilt
+OUTLINE_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outlines (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    outline TEXT NOT NULL
+);
+"""
+
+
+def _first_doc_line(node):
+    docstring = ast.get_docstring(node, clean=True)
+    if not docstring:
+        return None
+    return docstring.strip().splitlines()[0]
+
+
+def _signature(node):
+    """Render a def's parameters and return annotation, or a class's bases."""
+    if isinstance(node, ast.ClassDef):
+        bases = [ast.unparse(base) for base in node.bases] + [
+            ast.unparse(keyword) for keyword in node.keywords
+        ]
+        return f"({', '.join(bases)})" if bases else ""
+    signature = f"({ast.unparse(node.args)})"
+    if node.returns is not None:
+        signature += f" -> {ast.unparse(node.returns)}"
+    return signature
+
+
+def _symbols(body, depth):
+    """Collect the classes and functions of a body, recursing into classes."""
+    symbols = []
+    for node in body:
+        if isinstance(node, ast.ClassDef):
+            kind = "class"
+        elif isinstance(node, ast.AsyncFunctionDef):
+            kind = "async def"
+        elif isinstance(node, ast.FunctionDef):
+            kind = "def"
+        else:
+            continue
+        # A symbol's range starts at its first decorator
+        start = min(
+            [node.lineno] + [d.lineno for d in node.decorator_list]
+        )
+        symbols.append({
+            "kind": kind,
+            "name": node.name,
+            "signature": _signature(node),
+            "doc": _first_doc_line(node),
+            "start": start,
+            "end": node.end_lineno,
+            "depth": depth,
+        })
+        # Methods and nested classes are part of a class's interface;
+        # functions nested in functions are implementation details
+        if kind == "class":
+            symbols.extend(_symbols(node.body, depth + 1))
+    return symbols
+
+
+def build_outline(source):
+    """
+    Parse Python source into an outline of its classes and functions.
+
+    Args:
+        source: The module source text
+
+    Returns:
+        dict: 'doc' (first docstring line of the module), 'lines' (line
+              count) and 'symbols', a list of dicts with 'kind', 'name',
+              'signature', 'doc', 'start', 'end' (1-based, inclusive) and
+              'depth' (0 for top-level symbols); or 'error' if the source
+              doesn't parse
+    """
+    lines = source.count("\n") + (
+        1 if source and not source.endswith("\n") else 0
+    )
+    try:
+        tree = ast.parse(source)
+    except SyntaxError as e:
+        where = f" (line {e.lineno})" if e.lineno else ""
+        return {"lines": lines, "error": f"cannot parse{where}: {e.msg}"}
+    except ValueError as e:
+        # Source containing null bytes
+        return {"lines": lines, "error": f"cannot parse: {e}"}
+    return {
+        "doc": _first_doc_line(tree),
+        "lines": lines,
+        "symbols": _symbols(tree.body, 0),
+    }
+
+
+class OutlineCache:
+    """
+    Persistent cache of file outlines (SQLite under CACHE_DIR).
+
+    Outlines are keyed on the file's absolute path and reused while its
+    mtime_ns and size are unchanged, so only edited files are parsed again.
+    Rows of deleted files are dropped by prune() when their directory is
+    outlined again.
+    """
+
+    def __init__(self, db_path=None):
+        if db_path is None:
+            db_path = os.path.join(get_cache_dir(), "code_outline.sqlite")
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(db_path, timeout=30)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def get(self, path, stat=None):
+        """
+        Get the outline of a Python file, parsing it only if it changed.
+
+        Args:
+            path: Absolute path of the file
+            stat: os.stat() result of the file, if already known
+
+        Returns:
+            dict: The build_outline() result
+        """
+        if stat is None:
+            stat = os.stat(path)
+        row = self._conn.execute(
+            "SELECT mtime_ns, size, version, outline FROM outlines "
+            "WHERE path = ?",
+            (path,),
+        ).fetchone()
+        if row is not None and row[:3] == (
+            stat.st_mtime_ns, stat.st_size, OUTLINE_VERSION
+        ):
+            self.hits += 1
+            return json.loads(row[3])
+
+        self.misses += 1
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            outline = build_outline(f.read())
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO outlines "
+                "(path, mtime_ns, size, version, outline) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (path, stat.st_mtime_ns, stat.st_size, OUTLINE_VERSION,
+                 json.dumps(outline)),
+            )
+        return outline
+
+    def prune(self, directory, keep):
+        """
+        Drop the outlines of files under a directory that are gone.
+
+        Args:
+            directory: Absolute path of the outlined directory
+            keep: Absolute paths of the Python files it still holds
+
+        Returns:
+            int: Number of outlines removed
+        """
+        prefix = os.path.join(directory, "")
+        rows = self._conn.execute(
+            "SELECT path FROM outlines WHERE substr(path, 1, ?) = ?",
+            (len(prefix), prefix),
+        ).fetchall()
+        stale = [(path,) for (path,) in rows if path not in keep]
+        if stale:
+            with self._conn:
+                self._conn.executemany(
+                    "DELETE FROM outlines WHERE path = ?", stale
+                )
+        return len(stale)
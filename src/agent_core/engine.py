@@ -0,0 +1,779 @@
+import asyncio
+import json
+import os
+import sys
+import uuid
+from datetime import datetime
+
+from langchain_core.messages import (
+    AIMessageChunk,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+    message_chunk_to_message,
+)
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.normpath(os.path.join(current_dir, ".."))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from agent_core.call_function import (  # noqa: E402
+    AsyncToolScheduler,
+    available_tools,
+    call_functions_async,
+    get_tool_cache_stats,
+    get_tool_call_id,
+)
+from agent_core.checkpoint import SessionCheckpoint  # noqa: E402
+from agent_core.history import compact_history  # noqa: E402
+from agent_core.llm_cache import (  # noqa: E402
+    CACHE_MODES,
+    LLMCacheMiss,
+    LLMResponseCache,
+    cache_key,
+)
+from agent_core.providers.model_client import (  # noqa: E402
+    create_chat_model,
+    retry_delay,
+    set_capability,
+)
+from agent_core.providers.prompt_loader import get_settings  # noqa: E402
+from agent_core.tracing import (  # noqa: E402
+    set_trace_iteration,
+    set_trace_session,
+    span,
+)
+
+# Maximum number of model invocations per session
+MAX_ITERATIONS = 20
+
+
+class AgentModel:
+    """
+    A ChatOpenAI model with the agent's tools bound to it.
+
+    One instance can be shared by any number of concurrent sessions on the
+    same event loop. Responses can be recorded to and replayed from an
+    LLMResponseCache (see cache_mode); replayed responses carry
+    response_metadata["llm_cache"] == "hit".
+    """
+
+    cache_mode = "off"
+    cache = None
+    _llm_with_tools = None
+    _sent_temperature = None
+
+    def __init__(self, model, temperature=0, cache_mode=None):
+        self.model = model
+        self.temperature = temperature
+
+        if cache_mode is None:
+            cache_mode = get_settings().get("LLM_CACHE_MODE", "off")
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(
+                f"Unknown LLM cache mode {cache_mode!r} "
+                f"(expected one of {', '.join(CACHE_MODES)})"
+            )
+        self.cache_mode = cache_mode
+        if cache_mode != "off":
+            self.cache = LLMResponseCache()
+
+    @property
+    def llm_with_tools(self):
+        """
+        The tool-bound chat model, created on first use.
+
+        langchain_openai and the OpenAI SDK take most of the CLI's import
+        time, so they are only imported once a response actually has to
+        come from the model (never in replay mode). The client comes from
+        create_chat_model(), which reuses one connection pool per model.
+        """
+        if self._llm_with_tools is None:
+            # Some models don't support temperature=0, so we'll use None
+            # (default) if 0
+            llm, self._sent_temperature = create_chat_model(
+                self.model, self.temperature or None
+            )
+            self._llm_with_tools = self._bind(llm)
+        return self._llm_with_tools
+
+    @llm_with_tools.setter
+    def llm_with_tools(self, llm):
+        self._llm_with_tools = llm
+
+    @staticmethod
+    def _bind(llm):
+        # Bind tools to the model with auto tool selection
+        return llm.bind_tools(available_tools, tool_choice="auto")
+
+    def _cached_response(self, messages):
+        """
+        Look up the response cache for a conversation.
+
+        Returns:
+            tuple: (response, key) where response is the cached AIMessage
+                   (or None) and key is None when caching is off
+        """
+        if self.cache is None:
+            return None, None
+        key = cache_key(
+            self.model, self.temperature, available_tools, messages
+        )
+        if self.cache_mode in ("replay", "read-through"):
+            response = self.cache.get(key)
+            if response is not None:
+                response.response_metadata["llm_cache"] = "hit"
+                return response, key
+            if self.cache_mode == "replay":
+                raise LLMCacheMiss(
+                    "No cached model response for this conversation "
+                    "(LLM cache is in replay mode)"
+                )
+        return None, key
+
+    def _store_response(self, key, response):
+        if key is not None and self.cache_mode in ("record", "read-through"):
+            self.cache.put(key, self.model, response)
+
+    async def ainvoke(self, messages):
+        """
+        Invoke the model asynchronously with the current messages.
+
+        Args:
+            messages: The conversation history
+
+        Returns:
+            AIMessage: The model response
+        """
+        cached, key = self._cached_response(messages)
+        if cached is not None:
+            return cached
+
+        attempt = 0
+        while True:
+            try:
+                response = await self.llm_with_tools.ainvoke(messages)
+                break
+            except Exception as e:
+                attempt = await self._before_retry(e, attempt)
+        self._store_response(key, response)
+        return response
+
+    async def astream(self, messages):
+        """
+        Stream the model response as AIMessageChunks.
+
+        A cached response is yielded as a single chunk.
+
+        Args:
+            messages: The conversation history
+
+        Yields:
+            AIMessageChunk: Response chunks as they arrive
+        """
+        cached, key = self._cached_response(messages)
+        if cached is not None:
+            yield _message_to_chunk(cached)
+            return
+
+        full = None
+        async for chunk in self._astream_model(messages):
+            full = chunk if full is None else full + chunk
+            yield chunk
+        if full is not None:
+            self._store_response(key, message_chunk_to_message(full))
+
+    async def _astream_model(self, messages):
+        attempt = 0
+        while True:
+            started = False
+            try:
+                async for chunk in self.llm_with_tools.astream(messages):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                # Chunks already yielded can't be taken back
+                if started:
+                    raise
+                attempt = await self._before_retry(e, attempt)
+
+    async def _before_retry(self, error, attempt):
+        """
+        Prepare to retry a failed model call, or re-raise its error.
+
+        A rejected temperature is recorded for the model (so later runs
+        don't send it) and the call is retried at once without it. Rate
+        limits and transient errors are retried after retry_delay().
+
+        Returns:
+            int: The number of backoff retries made so far
+        """
+        if (self._sent_temperature is not None and
+                "temperature" in str(error).lower()):
+            set_capability(self.model, "temperature", False)
+            self._drop_temperature()
+            return attempt
+        delay = retry_delay(error, attempt)
+        if delay is None:
+            raise error
+        await asyncio.sleep(delay)
+        return attempt + 1
+
+    def _drop_temperature(self):
+        # Rebuild the model without any temperature parameter
+        llm, self._sent_temperature = create_chat_model(self.model)
+        self.llm_with_tools = self._bind(llm)
+
+
+def _message_to_chunk(message):
+    """Turn a complete AIMessage into one equivalent AIMessageChunk."""
+    return AIMessageChunk(
+        content=message.content,
+        id=message.id,
+        tool_call_chunks=[
+            {
+                "name": call["name"],
+                "args": json.dumps(call["args"]),
+                "id": call["id"],
+                "index": index,
+            }
+            for index, call in enumerate(message.tool_calls)
+        ],
+        response_metadata=message.response_metadata,
+        usage_metadata=message.usage_metadata,
+    )
+
+
+def build_messages(system_template, prompt):
+    """
+    Initialize conversation history with system message and user prompt.
+
+    Returns:
+        list: The initial messages
+    """
+    return [
+        SystemMessage(content=system_template),
+        HumanMessage(content=prompt),
+    ]
+
+
+def print_messages(messages):
+    """Print a short preview of each message (used in verbose mode)."""
+    print("=" * 80)
+    print("Initial messages:")
+    print("=" * 80)
+    for i, msg in enumerate(messages, 1):
+        print(f"\nMessage {i}:")
+        print(f"  Type: {msg.type}")
+        content_preview = (
+            f"{msg.content[:200]}..."
+            if len(str(msg.content)) > 200
+            else str(msg.content)
+        )
+        print(f"  Content: {content_preview}")
+    print("=" * 80)
+    print()
+
+
+def get_token_usage(response):
+    """
+    Get (prompt_tokens, completion_tokens) reported for a model response.
+
+    Invoked responses carry OpenAI's token_usage in response_metadata;
+    streamed responses only carry LangChain's usage_metadata.
+    """
+    if (hasattr(response, "response_metadata") and
+            response.response_metadata):
+        usage = response.response_metadata.get("token_usage")
+        if usage:
+            return (
+                usage.get("prompt_tokens", 0),
+                usage.get("completion_tokens", 0),
+            )
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    return 0, 0
+
+
+async def stream_response(
+    agent_model, messages, verbose=False, tool_workers=1, on_event=None
+):
+    """
+    Stream one model response, printing text and starting tools early.
+
+    Text tokens are printed as they arrive (or passed to on_event as "text"
+    events instead). Each tool call is submitted for execution as soon as
+    its streamed argument JSON parses, while the rest of the response is
+    still being generated. If the stream fails or the call is cancelled,
+    the tools already started are cancelled before the error propagates.
+
+    Args:
+        agent_model: The AgentModel to stream from
+        messages: The conversation history
+        verbose: If True, print detailed function call info
+        tool_workers: Maximum number of tool calls to run concurrently
+        on_event: Optional callback receiving progress event dicts
+
+    Returns:
+        tuple: (AIMessage, results) where results holds one result dict per
+               entry of the message's tool_calls, in order
+    """
+    scheduler = AsyncToolScheduler(verbose=verbose, max_workers=tool_workers)
+    full = None
+    tasks = {}  # tool call id -> task
+    printed_text = False
+
+    try:
+        async for chunk in agent_model.astream(messages):
+            full = chunk if full is None else full + chunk
+
+            if isinstance(chunk.content, str) and chunk.content:
+                if on_event is not None:
+                    on_event({"event": "text", "text": chunk.content})
+                else:
+                    print(chunk.content, end="", flush=True)
+                    printed_text = True
+
+            # Dispatch every tool call whose argument JSON is now complete
+            for call_chunk in full.tool_call_chunks:
+                call_id = call_chunk.get("id")
+                if not call_id or call_id in tasks:
+                    continue
+                try:
+                    call_args = json.loads(call_chunk.get("args") or "")
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(call_args, dict):
+                    tasks[call_id] = scheduler.submit({
+                        "name": call_chunk.get("name"),
+                        "args": call_args,
+                        "id": call_id,
+                        "type": "tool_call",
+                    })
+
+        if printed_text:
+            print()
+
+        response = message_chunk_to_message(full)
+
+        # Calls whose arguments never parsed on their own run with the final
+        # arguments LangChain parsed from the whole message
+        for tool_call in response.tool_calls:
+            call_id = get_tool_call_id(tool_call)
+            if call_id not in tasks:
+                tasks[call_id] = scheduler.submit(tool_call)
+
+        results = [
+            await tasks[get_tool_call_id(tool_call)]
+            for tool_call in response.tool_calls
+        ]
+    except BaseException:
+        # The stream failed or the turn was cancelled: stop the tools that
+        # were already started instead of leaving them running unowned
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+    return response, results
+
+
+async def run_agent_loop(
+    agent_model,
+    messages,
+    verbose=False,
+    tool_workers=1,
+    max_iterations=MAX_ITERATIONS,
+    stream=False,
+    token_budget=None,
+    checkpoint=None,
+    on_event=None,
+):
+    """
+    Run the agent feedback loop until the model gives a final answer.
+
+    The messages list is extended in place with every AIMessage and
+    ToolMessage, so callers can keep it for follow-up turns. Before each
+    model call, older tool outputs are elided once the estimated history
+    size passes token_budget (see history.compact_history).
+
+    Args:
+        agent_model: The AgentModel to invoke
+        messages: The conversation history to continue
+        verbose: If True, print each iteration, tool call and result
+        tool_workers: Maximum number of tool calls to run concurrently
+        max_iterations: Maximum number of model invocations
+        stream: If True, stream text to stdout and start tools while the
+                response is still streaming
+        token_budget: Estimated prompt token budget for the history
+                      (default: HISTORY_TOKEN_BUDGET from settings, 0
+                      disables compaction)
+        checkpoint: SessionCheckpoint saved after every iteration; the
+                    loop continues from its iteration count and token
+                    usage, and max_iterations more iterations may run
+        on_event: Optional callback receiving a dict for each step:
+                  "iteration", "text" (streamed text), "llm" (token usage
+                  and requested tools) and "tool_result"
+
+    Returns:
+        dict: 'response' (final answer, or None if max_iterations was
+              reached), 'usage' with accumulated token counts (responses
+              replayed from the LLM cache are not counted), 'iterations',
+              'history_compaction' (one entry per iteration that elided
+              tool outputs) and 'llm_cache' (mode, hits and the
+              iterations that were served from the cache)
+    """
+    settings = get_settings()
+    if token_budget is None:
+        token_budget = settings.get("HISTORY_TOKEN_BUDGET", 0)
+    keep_recent_turns = settings.get("HISTORY_KEEP_RECENT_TURNS", 2)
+
+    response_content = None
+    total_prompt_tokens = 0
+    total_completion_tokens = 0
+    iterations = 0
+    compactions = []
+    cache_hit_iterations = []
+    if checkpoint is not None:
+        total_prompt_tokens = checkpoint.prompt_tokens
+        total_completion_tokens = checkpoint.completion_tokens
+        iterations = checkpoint.iterations
+        cache_hit_iterations = list(checkpoint.cache_hit_iterations)
+    first_iteration = iterations
+
+    for iteration in range(max_iterations):
+        iterations = first_iteration + iteration + 1
+        set_trace_iteration(iterations)
+        if on_event is not None:
+            on_event({"event": "iteration", "iteration": iterations})
+        with span("iteration"):
+            if verbose:
+                print(
+                    f"\n--- Iteration {iteration + 1}/{max_iterations} ---"
+                )
+
+            # Keep the history within the token budget
+            if token_budget:
+                stats = compact_history(
+                    messages, token_budget, keep_recent_turns
+                )
+                if stats["elided_messages"]:
+                    stats["iteration"] = iterations
+                    stats["tokens_saved"] = (
+                        stats["tokens_before"] - stats["tokens_after"]
+                    )
+                    compactions.append(stats)
+                    if verbose:
+                        print(
+                            f"History compacted: "
+                            f"~{stats['tokens_before']} -> "
+                            f"~{stats['tokens_after']} tokens "
+                            f"({stats['elided_messages']} tool outputs elided)"
+                        )
+
+            # Invoke the model with current messages
+            results = None
+            with span("llm", model=agent_model.model, stream=stream) as llm:
+                if stream:
+                    response, results = await stream_response(
+                        agent_model, messages, verbose, tool_workers,
+                        on_event,
+                    )
+                else:
+                    response = await agent_model.ainvoke(messages)
+
+                # Extract token usage and record it on the span
+                prompt_tokens, completion_tokens = get_token_usage(response)
+                llm["prompt_tokens"] = prompt_tokens
+                llm["completion_tokens"] = completion_tokens
+                llm["tool_calls"] = len(
+                    getattr(response, "tool_calls", None) or []
+                )
+                metadata = getattr(response, "response_metadata", None) or {}
+                llm["cached"] = metadata.get("llm_cache") == "hit"
+
+            if on_event is not None:
+                on_event({
+                    "event": "llm",
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "cached": llm["cached"],
+                    "tool_calls": [
+                        tool_call["name"]
+                        for tool_call in getattr(response, "tool_calls", [])
+                    ],
+                })
+
+            # Capture model response: append to messages list
+            messages.append(response)
+
+            # Accumulate token usage (cached responses cost nothing)
+            if llm["cached"]:
+                cache_hit_iterations.append(iterations)
+            else:
+                total_prompt_tokens += prompt_tokens
+                total_completion_tokens += completion_tokens
+
+            # Handle tool calls if present
+            if hasattr(response, "tool_calls") and response.tool_calls:
+                # Execute the tool calls (concurrently when tool_workers > 1)
+                if results is None:
+                    results = await call_functions_async(
+                        response.tool_calls,
+                        verbose=verbose,
+                        max_workers=tool_workers,
+                    )
+
+                # Append results in the original tool call order
+                for tool_call, result_dict in zip(
+                    response.tool_calls, results
+                ):
+                    # Create ToolMessage and add to message history
+                    tool_message = ToolMessage(
+                        content=result_dict["content"],
+                        tool_call_id=get_tool_call_id(tool_call)
+                    )
+                    messages.append(tool_message)
+
+                    if on_event is not None:
+                        on_event({
+                            "event": "tool_result",
+                            "tool": tool_call["name"],
+                            "tool_call_id": tool_message.tool_call_id,
+                            "chars": len(str(result_dict["content"])),
+                            "error": str(result_dict["content"]).startswith(
+                                "Error:"
+                            ),
+                        })
+
+                    # Print result if verbose
+                    if verbose:
+                        print(f"-> {result_dict['content']}")
+            else:
+                # Final text answer (no tool calls) - extract content
+                response_content = response.content
+                if verbose:
+                    print(f"\nFinal response: {response_content}")
+
+            if checkpoint is not None:
+                checkpoint.save(
+                    messages,
+                    iterations,
+                    total_prompt_tokens,
+                    total_completion_tokens,
+                    cache_hit_iterations,
+                )
+
+        # Continue the loop to process tool results, or stop at the answer
+        if response_content is not None:
+            break
+
+    return {
+        "response": response_content,
+        "usage": {
+            "prompt_tokens": (
+                total_prompt_tokens if total_prompt_tokens > 0 else None
+            ),
+            "completion_tokens": (
+                total_completion_tokens
+                if total_completion_tokens > 0 else None
+            ),
+        },
+        "iterations": iterations,
+        "history_compaction": compactions,
+        "llm_cache": {
+            "mode": agent_model.cache_mode,
+            "hits": len(cache_hit_iterations),
+            "hit_iterations": cache_hit_iterations,
+        },
+    }
+
+
+async def run_session(
+    agent_model,
+    system_template,
+    prompt,
+    verbose=False,
+    tool_workers=1,
+    max_iterations=MAX_ITERATIONS,
+    stream=False,
+    token_budget=None,
+    session_id=None,
+    checkpoint=None,
+    on_event=None,
+):
+    """
+    Run one complete agent session for a single prompt.
+
+    Args:
+        agent_model: The AgentModel to invoke
+        system_template: The system prompt text
+        prompt: The user's query
+        verbose: If True, print the initial messages and loop progress
+        tool_workers: Maximum number of tool calls to run concurrently
+        max_iterations: Maximum number of model invocations
+        stream: If True, stream the model output (see stream_response)
+        token_budget: Estimated prompt token budget for the history
+                      (default: HISTORY_TOKEN_BUDGET from settings)
+        session_id: Identifier recorded on trace spans and used to name the
+                    checkpoint (default: a new random id)
+        checkpoint: If True, checkpoint the session after every iteration
+                    so it can be continued with resume_session() (default:
+                    CHECKPOINTS from settings)
+        on_event: Optional progress callback (see run_agent_loop)
+
+    Returns:
+        dict: The run_agent_loop result plus the final 'messages' and the
+              'session_id'
+    """
+    if session_id is None:
+        session_id = uuid.uuid4().hex[:12]
+    if checkpoint is None:
+        checkpoint = get_settings().get("CHECKPOINTS", True)
+    set_trace_session(session_id)
+
+    messages = build_messages(system_template, prompt)
+
+    # Print initial messages if verbose
+    if verbose:
+        print_messages(messages)
+
+    session_checkpoint = None
+    if checkpoint:
+        session_checkpoint = SessionCheckpoint(session_id)
+        session_checkpoint.start(
+            messages, model=agent_model.model, prompt=prompt
+        )
+
+    return await _run_checkpointed(
+        agent_model, messages, session_id, session_checkpoint,
+        verbose=verbose,
+        tool_workers=tool_workers,
+        max_iterations=max_iterations,
+        stream=stream,
+        token_budget=token_budget,
+        on_event=on_event,
+    )
+
+
+async def resume_session(
+    agent_model,
+    session_id,
+    verbose=False,
+    tool_workers=1,
+    max_iterations=MAX_ITERATIONS,
+    stream=False,
+    token_budget=None,
+    on_event=None,
+):
+    """
+    Continue a session from its checkpoint.
+
+    The conversation is rebuilt from the checkpoint, and the loop runs up
+    to max_iterations more iterations, adding to the saved iteration count
+    and token usage.
+
+    Args:
+        agent_model: The AgentModel to invoke
+        session_id: The id of the session to continue
+        (other arguments as for run_session)
+
+    Returns:
+        dict: Same as run_session, plus the original 'prompt' and
+              'system_prompt'
+
+    Raises:
+        CheckpointError: If the session has no checkpoint (it never
+                         started, or its checkpoint was deleted when it
+                         got its final answer)
+    """
+    session_checkpoint, messages, info = SessionCheckpoint.load(session_id)
+    set_trace_session(session_id)
+
+    if verbose:
+        print(
+            f"Resuming session {session_id} after "
+            f"{session_checkpoint.iterations} iterations "
+            f"({len(messages)} messages)"
+        )
+
+    result = await _run_checkpointed(
+        agent_model, messages, session_id, session_checkpoint,
+        verbose=verbose,
+        tool_workers=tool_workers,
+        max_iterations=max_iterations,
+        stream=stream,
+        token_budget=token_budget,
+        on_event=on_event,
+    )
+    result["prompt"] = info.get("prompt")
+    result["system_prompt"] = (
+        messages[0].content if messages and messages[0].type == "system"
+        else None
+    )
+    return result
+
+
+async def _run_checkpointed(agent_model, messages, session_id,
+                            session_checkpoint, **loop_kwargs):
+    """Run the loop, deleting the checkpoint once there is an answer."""
+    try:
+        result = await run_agent_loop(
+            agent_model, messages, checkpoint=session_checkpoint,
+            **loop_kwargs
+        )
+        if session_checkpoint is not None and result["response"] is not None:
+            session_checkpoint.finish()
+    finally:
+        if session_checkpoint is not None:
+            session_checkpoint.close()
+
+    result["messages"] = messages
+    result["session_id"] = session_id
+    return result
+
+
+def write_session_log(model, system_template, prompt, result, logs_dir="logs"):
+    """
+    Write a finished session to a timestamped JSON file in logs_dir.
+
+    Args:
+        model: The model name
+        system_template: The system prompt text
+        prompt: The user's query
+        result: The dict returned by run_session
+        logs_dir: Directory for session logs
+
+    Returns:
+        str: Path of the written log file
+    """
+    # Create logs directory if it doesn't exist
+    os.makedirs(logs_dir, exist_ok=True)
+
+    # Generate timestamped log filename (JSON format)
+    timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_filename = f"session_{timestamp_str}.json"
+    log_file = os.path.join(logs_dir, log_filename)
+
+    # Prepare log entry with all required fields
+    log_entry = {
+        "timestamp": datetime.now().isoformat(),
+        "session_id": result.get("session_id"),
+        "model": model,
+        "system_prompt": system_template,
+        "prompt": prompt,
+        "response": result["response"],
+        "usage": result["usage"],
+        "history_compaction": result.get("history_compaction", []),
+        "llm_cache": result.get("llm_cache"),
+        "tool_cache": get_tool_cache_stats(),
+    }
+
+    # Write pretty-printed JSON log entry to file
+    with open(log_file, "w", encoding="utf-8") as f:
+        json.dump(log_entry, f, indent=4, ensure_ascii=False)
+
+    return log_file
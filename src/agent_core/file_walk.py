@@ -0,0 +1,99 @@
+import fnmatch
+import os
+
+from agent_core.gitignore import IgnoreRules
+
+
+def as_patterns(value):
+    """Accept a single glob string or a list of globs."""
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(value)
+
+
+def matches(rel_path, patterns):
+    """Check a relative path (or its basename) against glob patterns."""
+    name = rel_path.rsplit("/", 1)[-1]
+    return any(
+        fnmatch.fnmatch(rel_path, p) or fnmatch.fnmatch(name, p)
+        for p in patterns
+    )
+
+
+def walk_entries(target_dir, max_depth=1, include=(), exclude=(),
+                 respect_gitignore=True, cursor=None, top=None):
+    """
+    Walk a directory tree with os.scandir in sorted, depth-first order.
+
+    Stat results and directory flags come from the DirEntry objects, so
+    each entry costs at most one stat call. Symlinked directories are
+    listed but not descended into.
+
+    Args:
+        target_dir: Absolute directory to walk
+        max_depth: Number of levels to walk (0 for unlimited)
+        include: Globs a file must match to be listed
+        exclude: Globs that skip a file or a whole directory
+        respect_gitignore: Skip paths ignored by .gitignore files
+        cursor: Relative path; only entries after it are yielded
+        top: Root of the tree target_dir is in (the working directory);
+             .gitignore files from top down to target_dir apply as well
+
+    Yields:
+        tuple: (relative_path, stat_result, is_dir)
+    """
+    cursor_parts = tuple(cursor.split("/")) if cursor else None
+    root_rules = None
+    if respect_gitignore:
+        root_rules = IgnoreRules.for_directory(top or target_dir, target_dir)
+
+    def walk(directory, parts, depth, rules):
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return
+
+        for entry in entries:
+            entry_parts = parts + (entry.name,)
+            rel_path = "/".join(entry_parts)
+            try:
+                is_dir = entry.is_dir()
+                stat = entry.stat()
+            except OSError:
+                # Skip items we can't access
+                continue
+
+            if rules is not None and rules.is_ignored(rel_path, is_dir):
+                continue
+            if exclude and matches(rel_path, exclude):
+                continue
+
+            # Entries up to the cursor were returned by an earlier page
+            after_cursor = cursor_parts is None or entry_parts > cursor_parts
+            listed = not include or (
+                not is_dir and matches(rel_path, include)
+            )
+            if after_cursor and listed:
+                yield rel_path, stat, is_dir
+
+            descend = (
+                is_dir and
+                (max_depth == 0 or depth < max_depth) and
+                not entry.is_symlink()
+            )
+            # Skip subtrees that lie entirely before the cursor
+            if descend and not after_cursor:
+                descend = cursor_parts[:len(entry_parts)] == entry_parts
+            if descend:
+                child_rules = (
+                    rules.child(entry.path, rel_path)
+                    if rules is not None else None
+                )
+                yield from walk(
+                    entry.path, entry_parts, depth + 1, child_rules
+                )
+
+    yield from walk(target_dir, (), 1, root_rules)
@@ -0,0 +1,180 @@
+import os
+import re
+
+# Directories that are never listed or searched when ignore rules apply
+ALWAYS_IGNORED = {".git"}
+
+
+def _translate(pattern):
+    """Translate a gitignore glob (without leading/trailing '/') to a regex."""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            parts.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                parts.append(re.escape("["))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append(f"[{body}]")
+                i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(parts) + r"\Z")
+
+
+def parse_gitignore(text):
+    """
+    Parse the contents of a .gitignore file.
+
+    Args:
+        text: The file contents
+
+    Returns:
+        list: Rules as (regex, negate, dir_only, anchored) tuples
+    """
+    rules = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        # A slash anywhere but the end anchors the pattern to its directory
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if line:
+            rules.append((_translate(line), negate, dir_only, anchored))
+    return rules
+
+
+def load_gitignore(directory):
+    """
+    Load the rules of directory/.gitignore.
+
+    Returns:
+        list: Parsed rules (empty if there is no readable .gitignore)
+    """
+    try:
+        with open(
+            os.path.join(directory, ".gitignore"), "r", encoding="utf-8"
+        ) as f:
+            return parse_gitignore(f.read())
+    except (OSError, UnicodeDecodeError):
+        return []
+
+
+class IgnoreRules:
+    """
+    The gitignore rules in effect for one directory of a walk.
+
+    Each directory's rules extend its parent's with the rules of its own
+    .gitignore, so later (deeper) rules win, as in git.
+    """
+
+    def __init__(self, layers=()):
+        # Each layer is (base path relative to the walk root, lead, rules);
+        # lead is the walk root's path relative to the folder of a
+        # .gitignore above the walk root ("" for the others)
+        self.layers = tuple(layers)
+
+    @classmethod
+    def for_directory(cls, top, directory):
+        """
+        Get the rules in effect for a directory inside a tree.
+
+        Every .gitignore from top down to directory (both included) is
+        loaded, and each applies relative to its own folder.
+
+        Args:
+            top: Absolute path of the tree's root (the working directory)
+            directory: Absolute path of the directory a walk starts at
+
+        Returns:
+            IgnoreRules: Rules for the entries of directory
+        """
+        rel_dir = os.path.relpath(directory, top)
+        if rel_dir == "." or rel_dir.startswith(".."):
+            return cls().child(directory, "")
+
+        parts = rel_dir.replace(os.sep, "/").split("/")
+        layers = []
+        for depth in range(len(parts) + 1):
+            rules = load_gitignore(os.path.join(top, *parts[:depth]))
+            if rules:
+                lead = "/".join(parts[depth:])
+                layers.append(("", f"{lead}/" if lead else "", rules))
+        return cls(layers)
+
+    def child(self, directory, rel_dir):
+        """
+        Get the rules for a subdirectory, adding its .gitignore if any.
+
+        Args:
+            directory: Absolute path of the subdirectory
+            rel_dir: Its path relative to the walk root ("" for the root)
+
+        Returns:
+            IgnoreRules: Rules to apply to the subdirectory's entries
+        """
+        rules = load_gitignore(directory)
+        if not rules:
+            return self
+        return IgnoreRules(self.layers + ((rel_dir, "", rules),))
+
+    def is_ignored(self, rel_path, is_dir):
+        """
+        Check whether a path is ignored.
+
+        Args:
+            rel_path: Path relative to the walk root, using '/' separators
+            is_dir: Whether the path is a directory
+
+        Returns:
+            bool: True if the last matching rule ignores the path
+        """
+        name = rel_path.rsplit("/", 1)[-1]
+        if name in ALWAYS_IGNORED:
+            return True
+
+        ignored = False
+        for base, lead, rules in self.layers:
+            if base:
+                if not rel_path.startswith(base + "/"):
+                    continue
+                local_path = rel_path[len(base) + 1:]
+            else:
+                local_path = lead + rel_path
+            for regex, negate, dir_only, anchored in rules:
+                if dir_only and not is_dir:
+                    continue
+                if regex.match(local_path if anchored else name):
+                    ignored = not negate
+        return ignored
@@ -0,0 +1,118 @@
+import json
+
+from langchain_core.messages import ToolMessage
+
+# Rough characters-per-token ratio for English text and code
+CHARS_PER_TOKEN = 4
+
+# Fixed per-message cost for role and formatting tokens
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Characters of an elided tool output kept as a preview
+ELIDED_PREVIEW_CHARS = 200
+
+
+def _content_text(content):
+    """Return message content as a string (list content is JSON-encoded)."""
+    if isinstance(content, str):
+        return content
+    return json.dumps(content, ensure_ascii=False)
+
+
+def estimate_tokens(message):
+    """
+    Estimate the prompt tokens a message costs, without a tokenizer.
+
+    Args:
+        message: A LangChain message
+
+    Returns:
+        int: Estimated token count
+    """
+    chars = len(_content_text(message.content))
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        chars += len(tool_call.get("name") or "")
+        chars += len(json.dumps(tool_call.get("args") or {}))
+    return MESSAGE_OVERHEAD_TOKENS + (chars + CHARS_PER_TOKEN - 1) // (
+        CHARS_PER_TOKEN
+    )
+
+
+def estimate_history_tokens(messages):
+    """
+    Estimate the prompt tokens for a whole conversation.
+
+    Returns:
+        int: Estimated token count
+    """
+    return sum(estimate_tokens(message) for message in messages)
+
+
+def _elide(message):
+    """Return a copy of a ToolMessage with its content cut to a preview."""
+    text = _content_text(message.content)
+    preview = text[:ELIDED_PREVIEW_CHARS]
+    elided = len(text) - len(preview)
+    return ToolMessage(
+        content=(
+            f"{preview}\n[...{elided} characters of earlier tool output "
+            f"elided to save context; call the tool again if needed]"
+        ),
+        tool_call_id=message.tool_call_id,
+        name=message.name,
+    )
+
+
+def compact_history(messages, token_budget, keep_recent_turns=2):
+    """
+    Shrink older tool outputs until the history fits the token budget.
+
+    System and user messages, every AIMessage and the tool outputs of the
+    last keep_recent_turns model turns are kept verbatim. Older ToolMessages
+    are replaced, oldest first, by a short preview; the replacement keeps
+    its tool_call_id so every tool call still has its matching result.
+    The list is modified in place.
+
+    Args:
+        messages: The conversation history
+        token_budget: Target estimated prompt tokens (0 or None disables)
+        keep_recent_turns: Number of recent model turns left untouched
+
+    Returns:
+        dict: 'tokens_before', 'tokens_after' and 'elided_messages'
+    """
+    tokens_before = estimate_history_tokens(messages)
+    stats = {
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_before,
+        "elided_messages": 0,
+    }
+    if not token_budget or tokens_before <= token_budget:
+        return stats
+
+    # Tool outputs after the cutoff belong to the most recent turns
+    ai_indexes = [i for i, m in enumerate(messages) if m.type == "ai"]
+    if len(ai_indexes) <= keep_recent_turns:
+        return stats
+    cutoff = ai_indexes[-keep_recent_turns] if keep_recent_turns else len(
+        messages
+    )
+
+    tokens = tokens_before
+    for i in range(cutoff):
+        if tokens <= token_budget:
+            break
+        message = messages[i]
+        if message.type != "tool":
+            continue
+        # Skip outputs that are already small (or already elided)
+        if len(_content_text(message.content)) <= 2 * ELIDED_PREVIEW_CHARS:
+            continue
+
+        replacement = _elide(message)
+        tokens += estimate_tokens(replacement) - estimate_tokens(message)
+        messages[i] = replacement
+        stats["elided_messages"] += 1
+
+    stats["tokens_after"] = tokens
+    return stats
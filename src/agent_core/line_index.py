@@ -0,0 +1,189 @@
+import mmap
+import os
+import threading
+from collections import OrderedDict
+
+# A checkpoint is recorded every LINE_INDEX_STRIDE lines
+LINE_INDEX_STRIDE = 1024
+
+# Bytes scanned per bytes.count() call while building an index
+_SCAN_CHUNK = 1024 * 1024
+
+# Bytes counted at a time while skipping to a specific line
+_SKIP_BLOCK = 16 * 1024
+
+# Maximum number of files whose index is kept in memory
+MAX_INDEXED_FILES = 64
+
+# path -> ((st_mtime_ns, st_size), LineIndex)
+_index_cache = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+
+def skip_lines(buf, pos, end, count):
+    """
+    Find the offset just past the count-th newline at or after pos.
+
+    Whole blocks are skipped with bytes.count(), so skipping many lines
+    does not need one find() call per line.
+
+    Args:
+        buf: A bytes-like object or mmap
+        pos: Offset to start from
+        end: Offset to stop at
+        count: Number of newlines to skip
+
+    Returns:
+        tuple: (offset, skipped) where skipped < count means end was reached
+    """
+    skipped = 0
+    while skipped < count and pos < end:
+        block_end = min(pos + _SKIP_BLOCK, end)
+        in_block = buf[pos:block_end].count(b"\n")
+        if skipped + in_block < count:
+            skipped += in_block
+            pos = block_end
+            continue
+        while skipped < count:
+            pos = buf.find(b"\n", pos, block_end) + 1
+            skipped += 1
+    return min(pos, end), skipped
+
+
+class LineIndex:
+    """
+    Sparse map from line numbers to byte offsets in a file.
+
+    offsets[k] is the byte offset where line k * LINE_INDEX_STRIDE starts
+    (0-based), so finding any line costs at most one stride of scanning.
+    """
+
+    def __init__(self, offsets, total_lines):
+        self.offsets = offsets
+        self.total_lines = total_lines
+
+    @classmethod
+    def build(cls, buf, size):
+        """Scan a whole buffer once and record line checkpoints."""
+        offsets = [0]
+        lines_seen = 0
+        next_mark = LINE_INDEX_STRIDE
+        pos = 0
+        while pos < size:
+            end = min(pos + _SCAN_CHUNK, size)
+            in_chunk = buf[pos:end].count(b"\n")
+            # Walk to each checkpoint that falls inside this chunk
+            chunk_pos = pos
+            while lines_seen + in_chunk >= next_mark:
+                chunk_pos, skipped = skip_lines(
+                    buf, chunk_pos, end, next_mark - lines_seen
+                )
+                lines_seen += skipped
+                in_chunk -= skipped
+                offsets.append(chunk_pos)
+                next_mark += LINE_INDEX_STRIDE
+            lines_seen += in_chunk
+            pos = end
+
+        # A final line without a trailing newline still counts
+        total_lines = lines_seen
+        if size and buf[size - 1:size] != b"\n":
+            total_lines += 1
+        return cls(offsets, total_lines)
+
+    def line_offset(self, buf, size, line):
+        """
+        Get the byte offset where a 0-based line starts.
+
+        Returns:
+            int: The offset, or size if the file has fewer lines
+        """
+        checkpoint = min(line // LINE_INDEX_STRIDE, len(self.offsets) - 1)
+        start = self.offsets[checkpoint]
+        offset, _ = skip_lines(
+            buf, start, size, line - checkpoint * LINE_INDEX_STRIDE
+        )
+        return offset
+
+
+def get_line_index(path, buf, stat):
+    """
+    Get the cached LineIndex for a file, building it if the file changed.
+
+    Args:
+        path: Absolute path of the file
+        buf: The file's contents (an mmap)
+        stat: os.stat_result of the file
+
+    Returns:
+        LineIndex: The index for the current version of the file
+    """
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _index_cache_lock:
+        cached = _index_cache.get(path)
+        if cached is not None and cached[0] == version:
+            _index_cache.move_to_end(path)
+            return cached[1]
+
+    index = LineIndex.build(buf, stat.st_size)
+
+    with _index_cache_lock:
+        _index_cache[path] = (version, index)
+        _index_cache.move_to_end(path)
+        while len(_index_cache) > MAX_INDEXED_FILES:
+            _index_cache.popitem(last=False)
+    return index
+
+
+def read_window(path, start=None, end=None, offset=None, limit=None):
+    """
+    Read part of a file without reading the rest of it.
+
+    Either a line range (1-based, inclusive start and end) or a byte offset
+    is used. At most limit bytes are returned in either case.
+
+    Args:
+        path: Absolute path of the file
+        start: First line to read
+        end: Last line to read (default: as many lines as fit in limit)
+        offset: Byte offset to start reading from (used when start is None)
+        limit: Maximum number of bytes to read
+
+    Returns:
+        dict: 'data' (bytes), 'start'/'end' byte offsets, 'size' and, for
+              line ranges, 'first_line', 'last_line' and 'total_lines'
+    """
+    stat = os.stat(path)
+    size = stat.st_size
+    window = {"data": b"", "start": 0, "end": 0, "size": size}
+    if start is not None:
+        window.update(first_line=start, last_line=start - 1, total_lines=0)
+    if size == 0:
+        return window
+
+    with open(path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as buf:
+        if start is not None:
+            index = get_line_index(path, buf, stat)
+            window["total_lines"] = index.total_lines
+            window_start = index.line_offset(buf, size, start - 1)
+            window_end = size
+            if end is not None:
+                window_end, _ = skip_lines(
+                    buf, window_start, size, end - start + 1
+                )
+        else:
+            window_start = min(max(offset or 0, 0), size)
+            window_end = size
+
+        if limit is not None:
+            window_end = min(window_end, window_start + limit)
+        data = bytes(buf[window_start:window_end])
+
+    window.update(data=data, start=window_start, end=window_end)
+    if start is not None:
+        window["last_line"] = start - 1 + data.count(b"\n") + (
+            1 if data and not data.endswith(b"\n") else 0
+        )
+    return window
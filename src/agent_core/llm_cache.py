@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# "off": no caching; "record": always call the model and store responses;
+# "replay": only answer from the cache; "read-through": answer from the
+# cache and call the model (and store the response) on a miss
+CACHE_MODES = ("off", "record", "replay", "read-through")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT,
+    response TEXT NOT NULL,
+    created REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class LLMCacheMiss(Exception):
+    """Raised in replay mode when a conversation has no cached response."""
+
+
+def _canonical_message(message):
+    """
+    Reduce a message to the fields that determine the model's answer.
+
+    Run-specific metadata (message ids, token usage, response metadata) is
+    left out, so the same conversation always produces the same key.
+    """
+    entry = {"type": message.type, "content": message.content}
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        entry["tool_calls"] = [
+            {"name": call["name"], "args": call["args"], "id": call["id"]}
+            for call in tool_calls
+        ]
+    tool_call_id = getattr(message, "tool_call_id", None)
+    if tool_call_id:
+        entry["tool_call_id"] = tool_call_id
+    return entry
+
+
+def cache_key(model, temperature, tools, messages):
+    """
+    Hash everything that is sent to the model into a cache key.
+
+    Args:
+        model: The model name
+        temperature: The sampling temperature (None for the default)
+        tools: The bound tool schemas
+        messages: The conversation history
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        {
+            "model": model,
+            "temperature": temperature,
+            "tools": tools,
+            "messages": [_canonical_message(m) for m in messages],
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    SQLite store of model responses keyed on cache_key().
+
+    Responses are stored with LangChain's messages_to_dict(), so a replayed
+    AIMessage has the same content, tool calls and metadata as the
+    original. LangChain is imported on first use, so the CLIs can read
+    CACHE_MODES from this module without paying for it.
+    """
+
+    def __init__(self, db_path=None):
+        if db_path is None:
+            from agent_core.providers.prompt_loader import get_cache_dir
+
+            db_path = os.path.join(get_cache_dir(), "llm_cache.sqlite")
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key):
+        """
+        Look up a cached response.
+
+        Returns:
+            AIMessage or None: The stored response
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE responses SET hits = hits + 1 WHERE key = ?",
+                    (key,),
+                )
+        from langchain_core.messages import messages_from_dict
+
+        return messages_from_dict(json.loads(row[0]))[0]
+
+    def put(self, key, model, response):
+        """Store (or replace) the response for a key."""
+        from langchain_core.messages import messages_to_dict
+
+        data = json.dumps(messages_to_dict([response]), ensure_ascii=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, model, response, created) VALUES (?, ?, ?, ?)",
+                (key, model, data, time.time()),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,10 +1,6 @@
 import argparse
-import json
 import os
 import sys
-from datetime import datetime
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 
 # Add src directory to Python path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -12,18 +8,10 @@ src_dir = os.path.normpath(os.path.join(current_dir, ".."))
 if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 
-from agent_core.providers.prompt_loader import (  # noqa: E402
-    get_active_system_prompt
-)
-from agent_core.call_function import (  # noqa: E402
-    available_tools,
-    call_function,
-)
-from langchain_core.messages import (  # noqa: E402
-    HumanMessage,
-    SystemMessage,
-    ToolMessage,
-)
+# Only lightweight modules are imported here; LangChain, the OpenAI SDK and
+# the tools are imported in main() after the arguments are parsed, so
+# --help and argument errors don't pay for them
+from agent_core.llm_cache import CACHE_MODES, LLMCacheMiss  # noqa: E402
 
 
 def main():
@@ -44,7 +32,81 @@ def main():
         action="store_true",
         help="Print detailed information including prompt and token usage"
     )
+    parser.add_argument(
+        "--tool-workers",
+        type=int,
+        default=None,
+        help=(
+            "Maximum number of tool calls from one response to run "
+            "concurrently (default: MAX_TOOL_WORKERS from settings, "
+            "1 runs them sequentially)"
+        )
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Stream the model output to stdout as it is generated and start "
+            "tool calls as soon as their arguments are complete"
+        )
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        default=None,
+        help=(
+            "Append timing spans for every model call and tool call to this "
+            "JSONL file (default: TRACE_FILE from settings)"
+        )
+    )
+    parser.add_argument(
+        "--llm-cache",
+        choices=CACHE_MODES,
+        default=None,
+        help=(
+            "Record model responses to, or replay them from, the local "
+            "response cache (default: LLM_CACHE_MODE from settings)"
+        )
+    )
+    parser.add_argument(
+        "--resume",
+        type=str,
+        default=None,
+        metavar="SESSION_ID",
+        help=(
+            "Continue an unfinished session from its checkpoint instead of "
+            "starting a new one (--query is ignored)"
+        )
+    )
+    parser.add_argument(
+        "--interactive",
+        action="store_true",
+        help=(
+            "Start an interactive session: each line you enter continues "
+            "the same conversation (--query is ignored)"
+        )
+    )
     args = parser.parse_args()
+    if args.interactive and args.resume:
+        parser.error("--interactive cannot be combined with --resume")
+
+    import asyncio
+    import uuid
+
+    from dotenv import load_dotenv
+
+    from agent_core.checkpoint import CheckpointError
+    from agent_core.engine import (
+        AgentModel,
+        resume_session,
+        run_session,
+        write_session_log,
+    )
+    from agent_core.providers.prompt_loader import (
+        get_active_system_prompt,
+        get_settings,
+    )
+    from agent_core.tracing import configure_tracing
 
     load_dotenv()
 
@@ -55,114 +117,70 @@ def main():
     system_template, parameters = get_active_system_prompt()
     temperature = parameters.get("temperature", 0)
 
-    # Initialize LangChain ChatOpenAI model with parameters from YAML
-    # Some models don't support temperature=0, so we'll use None (default) if 0
-    llm_kwargs = {"model": model}
-    if temperature != 0:
-        llm_kwargs["temperature"] = temperature
-    llm = ChatOpenAI(**llm_kwargs)
-
-    # Bind tools to the model with auto tool selection
-    llm_with_tools = llm.bind_tools(available_tools, tool_choice="auto")
-
-    # Initialize conversation history with system message and user prompt
-    messages = [
-        SystemMessage(content=system_template),
-        HumanMessage(content=prompt),
-    ]
-
-    # Print initial messages if verbose
-    if args.verbose:
-        print("=" * 80)
-        print("Initial messages:")
-        print("=" * 80)
-        for i, msg in enumerate(messages, 1):
-            print(f"\nMessage {i}:")
-            print(f"  Type: {msg.type}")
-            content_preview = (
-                f"{msg.content[:200]}..."
-                if len(str(msg.content)) > 200
-                else str(msg.content)
-            )
-            print(f"  Content: {content_preview}")
-        print("=" * 80)
-        print()
+    settings = get_settings()
+    tool_workers = args.tool_workers
+    if tool_workers is None:
+        tool_workers = settings.get("MAX_TOOL_WORKERS", 1)
+    configure_tracing(
+        args.trace if args.trace is not None
+        else settings.get("TRACE_FILE")
+    )
 
-    # Agent loop with max 20 iterations
-    MAX_ITERATIONS = 20
-    response_content = None
-    total_prompt_tokens = 0
-    total_completion_tokens = 0
+    agent_model = AgentModel(model, temperature, cache_mode=args.llm_cache)
 
-    for iteration in range(MAX_ITERATIONS):
-        if args.verbose:
-            print(f"\n--- Iteration {iteration + 1}/{MAX_ITERATIONS} ---")
+    if args.interactive:
+        from agent_core.repl import InteractiveSession, run_repl
 
-        # Invoke the model with current messages
+        session = InteractiveSession(
+            agent_model,
+            system_template,
+            verbose=args.verbose,
+            tool_workers=tool_workers,
+            stream=args.stream,
+        )
         try:
-            response = llm_with_tools.invoke(messages)
-        except Exception as e:
-            # If temperature=0 is not supported, retry with default temp
-            if "temperature" in str(e).lower() and temperature == 0:
-                llm = ChatOpenAI(model=model)
-                llm_with_tools = llm.bind_tools(
-                    available_tools, tool_choice="auto"
-                )
-                response = llm_with_tools.invoke(messages)
-            else:
-                raise
-
-        # Capture model response: append to messages list
-        messages.append(response)
-
-        # Extract token usage and accumulate
-        if (hasattr(response, "response_metadata") and
-                response.response_metadata):
-            usage = response.response_metadata.get("token_usage", {})
-            total_prompt_tokens += usage.get("prompt_tokens", 0)
-            total_completion_tokens += usage.get("completion_tokens", 0)
-
-        # Handle tool calls if present
-        if hasattr(response, "tool_calls") and response.tool_calls:
-            # Execute each tool call
-            for tool_call in response.tool_calls:
-                # Call the function and get the result
-                result_dict = call_function(tool_call, verbose=args.verbose)
-
-                # Extract tool_call_id for ToolMessage
-                if isinstance(tool_call, dict):
-                    tool_call_id = (
-                        tool_call.get("id") or
-                        tool_call.get("tool_call_id") or
-                        f"call_{id(tool_call)}"
-                    )
-                else:
-                    tool_call_id = getattr(
-                        tool_call, "id",
-                        getattr(
-                            tool_call, "tool_call_id", f"call_{id(tool_call)}"
-                        )
-                    )
-
-                # Create ToolMessage and add to message history
-                tool_message = ToolMessage(
-                    content=result_dict["content"],
-                    tool_call_id=tool_call_id
-                )
-                messages.append(tool_message)
-
-                # Print result if verbose
-                if args.verbose:
-                    print(f"-> {result_dict['content']}")
-
-            # Continue loop to process tool results
-            continue
+            asyncio.run(run_repl(session))
+        except KeyboardInterrupt:
+            print()
+        return
+
+    # Run the async agent engine for this single query, or continue a
+    # checkpointed session
+    session_id = args.resume or uuid.uuid4().hex[:12]
+    resume_hint = (
+        f"Session {session_id} is checkpointed; continue it with "
+        f"--resume {session_id}"
+    )
+    loop_kwargs = {
+        "verbose": args.verbose,
+        "tool_workers": tool_workers,
+        "stream": args.stream,
+    }
+    try:
+        if args.resume:
+            result = asyncio.run(
+                resume_session(agent_model, session_id, **loop_kwargs)
+            )
+            prompt = result["prompt"]
+            system_template = result["system_prompt"] or system_template
         else:
-            # Final text answer (no tool calls) - extract content and break
-            response_content = response.content
-            if args.verbose:
-                print(f"\nFinal response: {response_content}")
-            break
+            result = asyncio.run(
+                run_session(
+                    agent_model,
+                    system_template,
+                    prompt,
+                    session_id=session_id,
+                    **loop_kwargs,
+                )
+            )
+    except (LLMCacheMiss, CheckpointError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except BaseException:
+        if settings.get("CHECKPOINTS", True):
+            print(resume_hint, file=sys.stderr)
+        raise
+    response_content = result["response"]
 
     # Check if we reached max iterations without a final answer
     if response_content is None:
@@ -170,43 +188,15 @@ def main():
             "Error: Maximum iterations reached without a final answer.",
             file=sys.stderr
         )
+        if settings.get("CHECKPOINTS", True):
+            print(resume_hint, file=sys.stderr)
         sys.exit(1)
 
     # Use accumulated token usage
-    prompt_tokens = total_prompt_tokens if total_prompt_tokens > 0 else None
-    completion_tokens = (
-        total_completion_tokens if total_completion_tokens > 0 else None
-    )
-
-    # Create logs directory if it doesn't exist
-    logs_dir = "logs"
-    os.makedirs(logs_dir, exist_ok=True)
-
-    # Generate timestamped log filename (JSON format)
-    timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_filename = f"session_{timestamp_str}.json"
-    log_file = os.path.join(logs_dir, log_filename)
-
-    # Prepare log entry with all required fields
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "model": model,
-        "system_prompt": system_template,
-        "prompt": prompt,
-        "response": response_content,
-        "usage": {
-            "prompt_tokens": (
-                prompt_tokens if prompt_tokens is not None else None
-            ),
-            "completion_tokens": (
-                completion_tokens if completion_tokens is not None else None
-            )
-        }
-    }
+    prompt_tokens = result["usage"]["prompt_tokens"]
+    completion_tokens = result["usage"]["completion_tokens"]
 
-    # Write pretty-printed JSON log entry to file
-    with open(log_file, "w", encoding="utf-8") as f:
-        json.dump(log_entry, f, indent=4, ensure_ascii=False)
+    write_session_log(model, system_template, prompt, result)
 
     # Handle verbose output
     if args.verbose:
@@ -230,7 +220,8 @@ def main():
             print(response_content)
     else:
         # Only print response_content if it exists (not None for tool calls)
-        if response_content is not None:
+        # and was not already streamed to stdout
+        if response_content is not None and not args.stream:
             print(response_content)
 
 
@@ -0,0 +1,150 @@
+import asyncio
+import os
+import threading
+
+# Bytes read from a pipe per call
+READ_CHUNK = 65536
+
+
+class BoundedBuffer:
+    """
+    Keep the first and last bytes written to a stream.
+
+    Half of max_bytes is kept from the start of the stream and half from the
+    end; everything in between is counted but not stored, so memory stays
+    flat however much is written.
+    """
+
+    def __init__(self, max_bytes):
+        self.tail_limit = max_bytes // 2
+        self.head_limit = max_bytes - self.tail_limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+
+    @property
+    def dropped(self):
+        """Number of bytes that were neither kept in the head nor the tail."""
+        return self.total - len(self.head) - len(self.tail)
+
+    def feed(self, data):
+        self.total += len(data)
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if data and self.tail_limit:
+            self.tail += data[-self.tail_limit:]
+            excess = len(self.tail) - self.tail_limit
+            if excess > 0:
+                del self.tail[:excess]
+
+    def text(self, decode):
+        """
+        Decode the kept bytes, marking where output was dropped.
+
+        Args:
+            decode: Function turning bytes into a string
+
+        Returns:
+            str: The captured output
+        """
+        if not self.dropped:
+            return decode(bytes(self.head + self.tail))
+        return (
+            f"{decode(bytes(self.head))}\n"
+            f"[...{self.dropped} bytes of output dropped...]\n"
+            f"{decode(bytes(self.tail))}"
+        )
+
+
+class OutputCapture:
+    """
+    Bounded stdout/stderr capture for one child process.
+
+    Once the two streams together pass kill_bytes, the kill callback given
+    to drain() is called (once) so a runaway script is stopped early.
+    """
+
+    def __init__(self, max_bytes, kill_bytes=None):
+        self.stdout = BoundedBuffer(max_bytes)
+        self.stderr = BoundedBuffer(max_bytes)
+        self.kill_bytes = kill_bytes
+        self.killed = False
+        self._lock = threading.Lock()
+
+    @property
+    def total(self):
+        return self.stdout.total + self.stderr.total
+
+    def feed(self, buffer, data, kill):
+        """Store a chunk and call kill if the output limit was passed."""
+        with self._lock:
+            buffer.feed(data)
+            if (not self.kill_bytes or self.killed or
+                    self.total <= self.kill_bytes):
+                return
+            self.killed = True
+        try:
+            kill()
+        except ProcessLookupError:
+            pass
+
+    def drain(self, stdout_pipe, stderr_pipe, kill):
+        """
+        Read both pipes to EOF in background threads.
+
+        Args:
+            stdout_pipe: Binary file object or file descriptor for stdout
+            stderr_pipe: Binary file object or file descriptor for stderr
+            kill: Callable that stops the child process
+
+        Returns:
+            list: The started reader threads
+        """
+        readers = [
+            threading.Thread(
+                target=self._read_pipe, args=(pipe, buffer, kill), daemon=True
+            )
+            for pipe, buffer in (
+                (stdout_pipe, self.stdout), (stderr_pipe, self.stderr)
+            )
+        ]
+        for reader in readers:
+            reader.start()
+        return readers
+
+    def _read_pipe(self, pipe, buffer, kill):
+        fd = pipe if isinstance(pipe, int) else pipe.fileno()
+        try:
+            while True:
+                data = os.read(fd, READ_CHUNK)
+                if not data:
+                    break
+                self.feed(buffer, data, kill)
+        finally:
+            if isinstance(pipe, int):
+                os.close(pipe)
+            else:
+                pipe.close()
+
+    async def drain_async(self, stdout_stream, stderr_stream, kill):
+        """
+        Read both asyncio streams of a subprocess to EOF.
+
+        Args:
+            stdout_stream: asyncio.StreamReader for stdout
+            stderr_stream: asyncio.StreamReader for stderr
+            kill: Callable that stops the child process
+        """
+        async def read_stream(stream, buffer):
+            while True:
+                data = await stream.read(READ_CHUNK)
+                if not data:
+                    break
+                self.feed(buffer, data, kill)
+
+        await asyncio.gather(
+            read_stream(stdout_stream, self.stdout),
+            read_stream(stderr_stream, self.stderr),
+        )
@@ -0,0 +1,237 @@
+import asyncio
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+
+from agent_core.providers.prompt_loader import get_cache_dir, get_settings
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and
+# transient server errors
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# Per-model HTTP clients. The sync pool is shared by the whole process; an
+# async pool can only be used on the event loop it was created on, so async
+# pools are kept per loop and go away with it.
+_sync_clients = {}
+_async_clients = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+# model -> {capability: value}, loaded from disk on first use
+_capabilities = None
+_capabilities_lock = threading.Lock()
+
+
+def _new_http_client(async_client):
+    import httpx
+
+    settings = get_settings()
+    limits = httpx.Limits(
+        max_connections=settings.get("LLM_MAX_CONNECTIONS", 20),
+        max_keepalive_connections=settings.get("LLM_MAX_CONNECTIONS", 20),
+    )
+    timeout = httpx.Timeout(
+        settings.get("LLM_REQUEST_TIMEOUT_SECONDS", 600), connect=10.0
+    )
+    client_class = httpx.AsyncClient if async_client else httpx.Client
+    return client_class(limits=limits, timeout=timeout)
+
+
+def get_http_clients(model):
+    """
+    Get the pooled HTTP clients used for a model.
+
+    Every ChatOpenAI created for the same model (in any session) reuses
+    these clients, so connections stay open between calls.
+
+    Args:
+        model: The model name
+
+    Returns:
+        tuple: (httpx.Client, httpx.AsyncClient); the async client belongs
+               to the running event loop, if there is one
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    with _clients_lock:
+        sync_client = _sync_clients.get(model)
+        if sync_client is None:
+            sync_client = _sync_clients[model] = _new_http_client(False)
+
+        if loop is None:
+            return sync_client, _new_http_client(True)
+        loop_clients = _async_clients.setdefault(loop, {})
+        async_client = loop_clients.get(model)
+        if async_client is None:
+            async_client = loop_clients[model] = _new_http_client(True)
+    return sync_client, async_client
+
+
+def _capabilities_path():
+    return os.path.join(get_cache_dir(), "model_capabilities.json")
+
+
+def _load_capabilities():
+    global _capabilities
+    if _capabilities is None:
+        try:
+            with open(_capabilities_path(), "r", encoding="utf-8") as f:
+                _capabilities = json.load(f)
+        except (OSError, ValueError):
+            _capabilities = {}
+    return _capabilities
+
+
+def get_capability(model, name, default=None):
+    """
+    Look up a cached fact about a model, such as whether it accepts a
+    temperature.
+
+    Args:
+        model: The model name
+        name: The capability name
+        default: Value returned when nothing is known
+
+    Returns:
+        The cached value, or default
+    """
+    with _capabilities_lock:
+        return _load_capabilities().get(model, {}).get(name, default)
+
+
+def set_capability(model, name, value):
+    """
+    Remember a fact about a model in CACHE_DIR/model_capabilities.json.
+
+    The file is replaced atomically, so concurrent processes never read a
+    partial file (the last writer wins).
+    """
+    with _capabilities_lock:
+        capabilities = _load_capabilities()
+        if capabilities.get(model, {}).get(name) == value:
+            return
+        capabilities.setdefault(model, {})[name] = value
+
+        path = _capabilities_path()
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path), suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(capabilities, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+
+
+def create_chat_model(model, temperature=None):
+    """
+    Create a ChatOpenAI client on the model's shared connection pool.
+
+    The OpenAI SDK's own retries are disabled, since callers retry with
+    retry_delay(), and the temperature is left out for models known not
+    to support it.
+
+    Args:
+        model: The model name
+        temperature: Sampling temperature, or None for the model default
+
+    Returns:
+        tuple: (ChatOpenAI, temperature) with the temperature actually sent
+    """
+    from langchain_openai import ChatOpenAI
+
+    if temperature is not None and not get_capability(
+        model, "temperature", True
+    ):
+        temperature = None
+
+    http_client, http_async_client = get_http_clients(model)
+    kwargs = {
+        "model": model,
+        # stream_usage makes streamed responses report token usage too
+        "stream_usage": True,
+        "max_retries": 0,
+        "http_client": http_client,
+        "http_async_client": http_async_client,
+    }
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    return ChatOpenAI(**kwargs), temperature
+
+
+def _retry_after(error):
+    """Seconds the server asked us to wait (retry-after headers), or None."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+        return max(0.0, retry_at - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_retryable(error):
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    # Connection errors and timeouts have no status code
+    try:
+        import openai
+    except ImportError:
+        return False
+    return isinstance(error, openai.APIConnectionError)
+
+
+def retry_delay(error, attempt):
+    """
+    Decide whether and how long to wait before retrying a failed call.
+
+    Rate limits (429), transient server errors and connection errors are
+    retried up to LLM_MAX_RETRIES times. A retry-after header from the
+    server is honored; otherwise the delay is exponential with full jitter.
+    Either way the delay is capped at LLM_RETRY_MAX_SECONDS.
+
+    Args:
+        error: The exception raised by the model call
+        attempt: Number of retries already made
+
+    Returns:
+        float or None: Seconds to wait, or None to give up
+    """
+    settings = get_settings()
+    if attempt >= settings.get("LLM_MAX_RETRIES", 4):
+        return None
+    if not _is_retryable(error):
+        return None
+
+    cap = settings.get("LLM_RETRY_MAX_SECONDS", 30)
+    server_delay = _retry_after(error)
+    if server_delay is not None:
+        return min(server_delay, cap)
+    base = settings.get("LLM_RETRY_BASE_SECONDS", 0.5)
+    return random.uniform(0, min(cap, base * 2 ** attempt))
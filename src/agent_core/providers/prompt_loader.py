@@ -1,24 +1,91 @@
 import os
+import threading
+from types import MappingProxyType
+
 import yaml
 
+# Project root directory, resolved once at import
+PROJECT_ROOT = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..")
+)
+
+# Parsed YAML files: path -> ((st_mtime_ns, st_size), snapshot)
+_yaml_cache = {}
+_yaml_cache_lock = threading.Lock()
+
+
+def _freeze(value):
+    """
+    Convert parsed YAML into an immutable snapshot.
+
+    Dicts become read-only MappingProxyType views and lists become tuples,
+    so a snapshot can be shared between sessions and threads safely.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def load_yaml(path):
+    """
+    Load a YAML mapping, parsing the file only when it has changed.
+
+    The file is stat'ed on every call; it is re-read and re-parsed only when
+    its mtime or size differs from the cached copy.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        MappingProxyType: Immutable snapshot of the file's contents
+    """
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _yaml_cache.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with open(path, "r", encoding="utf-8") as f:
+        snapshot = _freeze(yaml.safe_load(f) or {})
+
+    with _yaml_cache_lock:
+        _yaml_cache[path] = (version, snapshot)
+    return snapshot
+
+
+def clear_cache():
+    """Drop every cached YAML snapshot."""
+    with _yaml_cache_lock:
+        _yaml_cache.clear()
+
 
 def get_settings():
     """
     Load settings from config/settings.yaml.
 
     Returns:
-        dict: Dictionary containing all settings from the YAML file
+        MappingProxyType: Immutable snapshot of all settings from the YAML
+                          file
     """
-    # Get the project root directory
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.normpath(os.path.join(current_dir, "..", "..", ".."))
-
     # Read settings from config/settings.yaml
-    config_path = os.path.join(project_root, "config", "settings.yaml")
-    with open(config_path, "r", encoding="utf-8") as f:
-        settings = yaml.safe_load(f)
+    config_path = os.path.join(PROJECT_ROOT, "config", "settings.yaml")
+    return load_yaml(config_path)
 
-    return settings
+
+def get_cache_dir():
+    """
+    Get the directory for persistent caches (CACHE_DIR in settings).
+
+    Returns:
+        str: Absolute path of the cache directory (created if missing)
+    """
+    cache_dir = get_settings().get("CACHE_DIR", ".agent_cache")
+    cache_dir = os.path.join(PROJECT_ROOT, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
 
 
 def get_active_system_prompt():
@@ -26,25 +93,19 @@ def get_active_system_prompt():
     Load the active system prompt from YAML configuration.
 
     Returns:
-        tuple: (template_string, parameters_dict)
+        tuple: (template_string, parameters_mapping)
     """
-    # Get the project root directory
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.normpath(os.path.join(current_dir, "..", "..", ".."))
-
     # Read settings to get active prompt name
     settings = get_settings()
     active_prompt_name = settings.get("active_prompt", "v1_robot")
 
     # Load the corresponding prompt file
     prompt_path = os.path.join(
-        project_root, "system_prompts", f"{active_prompt_name}.yaml"
+        PROJECT_ROOT, "system_prompts", f"{active_prompt_name}.yaml"
     )
-    with open(prompt_path, "r", encoding="utf-8") as f:
-        prompt_data = yaml.safe_load(f)
+    prompt_data = load_yaml(prompt_path)
 
     template = prompt_data.get("template", "")
-    parameters = prompt_data.get("parameters", {})
+    parameters = prompt_data.get("parameters", MappingProxyType({}))
 
     return template, parameters
-
@@ -0,0 +1,332 @@
+"""
+Forkserver backend for run_python_file.
+
+A long-lived "python" process imports the configured modules once and then
+forks a fresh child for every script, so a run costs a fork instead of an
+interpreter start plus imports. The agent talks to it over a Unix socket and
+passes the write ends of its own stdout/stderr pipes with each request, so
+output is read exactly as from a normal subprocess.
+
+This module is also the forkserver's entry point and therefore only uses the
+standard library.
+"""
+import argparse
+import atexit
+import json
+import os
+import runpy
+import select
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+# Seconds to wait for a newly started forkserver to accept connections
+STARTUP_TIMEOUT = 10
+
+
+def _run_script(request, out_fd, err_fd):
+    """Run a script in the current (freshly forked) process and exit."""
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.dup2(out_fd, 1)
+    os.dup2(err_fd, 2)
+    for fd in (devnull, out_fd, err_fd):
+        os.close(fd)
+
+    script = request["script"]
+    os.chdir(request["cwd"])
+    sys.argv = [script] + list(request.get("args") or [])
+    # Like "python script.py", the script's directory comes first on the path
+    sys.path[0] = os.path.dirname(script)
+
+    code = 0
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException as e:
+        # Report the traceback from the script's own frames, as python does
+        tb = e.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename != script:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb or e.__traceback__)
+        code = 1
+
+    try:
+        atexit._run_exitfuncs()
+        sys.stdout.flush()
+        sys.stderr.flush()
+    finally:
+        os._exit(code & 0xFF)
+
+
+def _supervise(conn, request, out_fd, err_fd):
+    """Fork the script process, report its pid and exit code, then exit."""
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    pid = os.fork()
+    if pid == 0:
+        conn.close()
+        _run_script(request, out_fd, err_fd)
+
+    os.close(out_fd)
+    os.close(err_fd)
+    try:
+        conn.sendall(json.dumps({"pid": pid}).encode() + b"\n")
+        _, status = os.waitpid(pid, 0)
+        returncode = os.waitstatus_to_exitcode(status)
+        conn.sendall(json.dumps({"returncode": returncode}).encode() + b"\n")
+    finally:
+        os._exit(0)
+
+
+def serve(socket_path, preload=()):
+    """
+    Run the forkserver loop (inside the forkserver process).
+
+    Exits when stdin reaches EOF, i.e. when the agent process that started
+    it goes away.
+
+    Args:
+        socket_path: Unix socket path to listen on
+        preload: Module names to import before serving
+    """
+    for name in preload:
+        try:
+            __import__(name)
+        except Exception:
+            pass
+
+    # Supervisors are reaped automatically
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen(64)
+
+    while True:
+        readable, _, _ = select.select([server, sys.stdin], [], [])
+        if sys.stdin in readable and not os.read(sys.stdin.fileno(), 1):
+            break
+        if server not in readable:
+            continue
+
+        conn, _ = server.accept()
+        try:
+            message, fds, _, _ = socket.recv_fds(conn, 65536, 2)
+            request = json.loads(message)
+        except Exception:
+            conn.close()
+            continue
+        if len(fds) != 2:
+            for fd in fds:
+                os.close(fd)
+            conn.close()
+            continue
+
+        if os.fork() == 0:
+            server.close()
+            _supervise(conn, request, *fds)
+        conn.close()
+        for fd in fds:
+            os.close(fd)
+
+    server.close()
+
+
+class _LineReader:
+    """Read newline-terminated messages from a socket, with a deadline."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.buffer = b""
+
+    def readline(self, deadline=None):
+        while b"\n" not in self.buffer:
+            if deadline is None:
+                self.conn.settimeout(None)
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise socket.timeout("timed out")
+                self.conn.settimeout(remaining)
+            data = self.conn.recv(4096)
+            if not data:
+                raise RuntimeError("Python forkserver closed the connection")
+            self.buffer += data
+        line, self.buffer = self.buffer.split(b"\n", 1)
+        return line
+
+
+class ForkServer:
+    """
+    Client for a forkserver process started on first use.
+
+    run() mirrors subprocess.run(): it returns the exit code once the
+    script's output has been read and raises subprocess.TimeoutExpired
+    after killing a script that runs too long.
+    """
+
+    def __init__(self, python="python", preload=()):
+        self.python = python
+        self.preload = tuple(preload)
+        self._process = None
+        self._socket_dir = None
+        self._lock = threading.Lock()
+
+    @property
+    def socket_path(self):
+        return os.path.join(self._socket_dir, "forkserver.sock")
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                return
+            self.close()
+
+            self._socket_dir = tempfile.mkdtemp(prefix="agent_forkserver_")
+            self._process = subprocess.Popen(
+                [
+                    self.python, os.path.abspath(__file__),
+                    "--serve", self.socket_path,
+                    "--preload", ",".join(self.preload),
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            deadline = time.monotonic() + STARTUP_TIMEOUT
+            while not os.path.exists(self.socket_path):
+                if (self._process.poll() is not None or
+                        time.monotonic() > deadline):
+                    raise RuntimeError("Python forkserver failed to start")
+                time.sleep(0.01)
+
+    def close(self):
+        """Stop the forkserver process and remove its socket."""
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.stdin.close()
+                try:
+                    self._process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    self._process.kill()
+            self._process = None
+        if self._socket_dir is not None:
+            shutil.rmtree(self._socket_dir, ignore_errors=True)
+            self._socket_dir = None
+
+    def run(self, script, args, cwd, timeout, capture):
+        """
+        Run a script in a fresh fork of the forkserver.
+
+        Args:
+            script: Absolute path of the script
+            args: Command-line arguments for the script
+            cwd: Working directory for the script
+            timeout: Seconds before the script is killed
+            capture: Object whose drain(stdout_fd, stderr_fd, kill) starts
+                     and returns the threads that read the script's output
+
+        Returns:
+            int: The script's exit code
+        """
+        self._ensure_started()
+        deadline = time.monotonic() + timeout
+
+        out_r, out_w = os.pipe()
+        err_r, err_w = os.pipe()
+
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            conn.connect(self.socket_path)
+            request = {"script": script, "args": list(args or []), "cwd": cwd}
+            socket.send_fds(conn, [json.dumps(request).encode()],
+                            [out_w, err_w])
+        except BaseException:
+            for fd in (out_r, err_r):
+                os.close(fd)
+            conn.close()
+            raise
+        finally:
+            os.close(out_w)
+            os.close(err_w)
+
+        status = _LineReader(conn)
+        readers = None
+        timed_out = False
+        try:
+            pid = json.loads(status.readline())["pid"]
+            readers = capture.drain(
+                out_r, err_r, lambda: os.kill(pid, signal.SIGKILL)
+            )
+            try:
+                line = status.readline(deadline)
+            except socket.timeout:
+                timed_out = True
+                os.kill(pid, signal.SIGKILL)
+                line = status.readline()
+            returncode = json.loads(line)["returncode"]
+        finally:
+            conn.close()
+            if readers is None:
+                os.close(out_r)
+                os.close(err_r)
+
+        for reader in readers:
+            reader.join(max(0.1, deadline - time.monotonic()))
+
+        if timed_out:
+            raise subprocess.TimeoutExpired(
+                [script] + list(args or []), timeout
+            )
+        return returncode
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def get_fork_server(preload=()):
+    """
+    Get the process-wide ForkServer, replacing it if preload changed.
+
+    Args:
+        preload: Module names the forkserver should import up front
+
+    Returns:
+        ForkServer: The shared forkserver client
+    """
+    global _server
+    with _server_lock:
+        if _server is None or _server.preload != tuple(preload):
+            if _server is not None:
+                _server.close()
+            _server = ForkServer(preload=preload)
+            atexit.register(_server.close)
+        return _server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Python forkserver")
+    parser.add_argument("--serve", required=True, help="Unix socket path")
+    parser.add_argument(
+        "--preload", default="", help="Comma-separated modules to import"
+    )
+    args = parser.parse_args()
+    serve(args.serve, [name for name in args.preload.split(",") if name])
+
+
+if __name__ == "__main__":
+    main()
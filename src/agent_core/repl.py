@@ -0,0 +1,279 @@
+import asyncio
+import json
+import os
+import signal
+import sys
+import uuid
+from datetime import datetime
+
+try:
+    # Line editing for input(), and the partly typed line on Ctrl-C
+    import readline
+except ImportError:  # Not available on Windows
+    readline = None
+
+from langchain_core.messages import (
+    HumanMessage,
+    SystemMessage,
+    messages_to_dict,
+)
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.normpath(os.path.join(current_dir, ".."))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from agent_core.call_function import get_tool_cache_stats  # noqa: E402
+from agent_core.engine import MAX_ITERATIONS, run_agent_loop  # noqa: E402
+from agent_core.history import estimate_history_tokens  # noqa: E402
+from agent_core.tracing import set_trace_session  # noqa: E402
+
+HELP_TEXT = """Commands:
+  /usage        Show token usage of the last turn and the whole session
+  /clear        Forget the conversation (caches and settings are kept)
+  /save [PATH]  Save the transcript as JSON (default: logs/transcript_*.json)
+  /help         Show this help
+  /exit         Leave (Ctrl-D, or Ctrl-C at an empty prompt, works too)
+Ctrl-C during a turn cancels it and returns to the prompt."""
+
+
+class InteractiveSession:
+    """
+    A multi-turn conversation with the agent.
+
+    Every turn appends the user's message to the same messages list and
+    runs the agent loop on it, so follow-up questions can refer to files
+    and answers from earlier turns without reading them again. The
+    AgentModel, its connection pool, the tool result cache and the
+    settings are shared by all turns.
+
+    Attributes:
+        messages: The conversation so far, starting with the system prompt
+        turns: Number of user turns since the session started or was
+               cleared
+        last_usage: Token usage of the most recent turn
+        total_usage: Token usage of all turns, including cleared ones
+    """
+
+    def __init__(self, agent_model, system_template, verbose=False,
+                 tool_workers=1, max_iterations=MAX_ITERATIONS,
+                 stream=False):
+        self.agent_model = agent_model
+        self.system_template = system_template
+        self.verbose = verbose
+        self.tool_workers = tool_workers
+        self.max_iterations = max_iterations
+        self.stream = stream
+        self.session_id = uuid.uuid4().hex[:12]
+        self.total_usage = {"prompt_tokens": 0, "completion_tokens": 0}
+        self.model_calls = 0
+        self.clear()
+
+    def clear(self):
+        """Start a new conversation with only the system prompt."""
+        self.messages = [SystemMessage(content=self.system_template)]
+        self.turns = 0
+        self.last_usage = {"prompt_tokens": 0, "completion_tokens": 0}
+        set_trace_session(self.session_id)
+
+    async def ask(self, prompt):
+        """
+        Run one user turn.
+
+        If the turn fails, the messages it added are removed again, so the
+        conversation stays valid for the next turn.
+
+        Args:
+            prompt: The user's message
+
+        Returns:
+            dict: The run_agent_loop result for this turn
+        """
+        start = len(self.messages)
+        self.messages.append(HumanMessage(content=prompt))
+        try:
+            result = await run_agent_loop(
+                self.agent_model,
+                self.messages,
+                verbose=self.verbose,
+                tool_workers=self.tool_workers,
+                max_iterations=self.max_iterations,
+                stream=self.stream,
+            )
+        except BaseException:
+            del self.messages[start:]
+            raise
+
+        self.turns += 1
+        self.model_calls += result["iterations"]
+        self.last_usage = {
+            key: value or 0 for key, value in result["usage"].items()
+        }
+        for key, value in self.last_usage.items():
+            self.total_usage[key] += value
+        return result
+
+    def usage_report(self):
+        """
+        Describe token usage and the size of the conversation.
+
+        Returns:
+            str: The report printed by /usage
+        """
+        cache = get_tool_cache_stats()
+        return "\n".join([
+            f"Turns: {self.turns} ({self.model_calls} model calls in total)",
+            f"Last turn: {self.last_usage['prompt_tokens']} prompt + "
+            f"{self.last_usage['completion_tokens']} completion tokens",
+            f"Session: {self.total_usage['prompt_tokens']} prompt + "
+            f"{self.total_usage['completion_tokens']} completion tokens",
+            f"History: {len(self.messages)} messages, "
+            f"~{estimate_history_tokens(self.messages)} tokens (estimated)",
+            f"Tool cache: {cache['hits']} hits, {cache['misses']} misses",
+        ])
+
+    def save(self, path=None, logs_dir="logs"):
+        """
+        Write the transcript to a JSON file.
+
+        Args:
+            path: Output file (default: a timestamped file in logs_dir)
+            logs_dir: Directory for the default file name
+
+        Returns:
+            str: Path of the written file
+        """
+        if not path:
+            os.makedirs(logs_dir, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(
+                logs_dir, f"transcript_{self.session_id}_{timestamp}.json"
+            )
+        transcript = {
+            "timestamp": datetime.now().isoformat(),
+            "session_id": self.session_id,
+            "model": self.agent_model.model,
+            "turns": self.turns,
+            "usage": self.total_usage,
+            "messages": messages_to_dict(self.messages),
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(transcript, f, indent=4, ensure_ascii=False)
+        return path
+
+
+def _typed_text():
+    """Text typed at the prompt before Ctrl-C ("" without readline)."""
+    if readline is None:
+        return ""
+    return readline.get_line_buffer()
+
+
+async def _run_turn(session, line):
+    """
+    Run one turn as a task that Ctrl-C cancels.
+
+    While the turn runs, SIGINT cancels just the turn instead of the whole
+    event loop; InteractiveSession.ask() then drops the turn's messages.
+    Where the loop cannot take signal handlers (Windows, or not the main
+    thread) Ctrl-C still ends the whole session.
+
+    Cancelling stops the model call and kills scripts started by
+    run_python_file. Tools that run in a worker thread (asyncio.to_thread,
+    or scripts on the forkserver backend) cannot be interrupted: they run
+    to completion in the background and their results are dropped.
+
+    Returns:
+        dict: The run_agent_loop result for this turn
+
+    Raises:
+        KeyboardInterrupt: The turn was cancelled with Ctrl-C
+    """
+    loop = asyncio.get_running_loop()
+    task = asyncio.ensure_future(session.ask(line))
+    interrupted = []
+
+    def interrupt():
+        interrupted.append(True)
+        task.cancel()
+
+    try:
+        loop.add_signal_handler(signal.SIGINT, interrupt)
+        handled = True
+    except (NotImplementedError, RuntimeError, ValueError):
+        handled = False
+    try:
+        return await task
+    except asyncio.CancelledError:
+        if interrupted:
+            raise KeyboardInterrupt from None
+        raise
+    finally:
+        if handled:
+            # Back to KeyboardInterrupt, so Ctrl-C works at the prompt
+            loop.remove_signal_handler(signal.SIGINT)
+
+
+async def run_repl(session, read_line=input):
+    """
+    Read prompts and commands until /exit or end of input.
+
+    Ctrl-C cancels a running turn and returns to the prompt. At the prompt
+    it discards a partly typed line, and on an empty line it exits.
+
+    Args:
+        session: The InteractiveSession to run turns on
+        read_line: Function reading one line of input given a prompt
+                   (raises EOFError at end of input)
+    """
+    print(f"Interactive session {session.session_id}; /help for commands.")
+    while True:
+        try:
+            line = read_line("> ").strip()
+        except EOFError:
+            print()
+            break
+        except KeyboardInterrupt:
+            print()
+            if _typed_text().strip():
+                continue
+            break
+        if not line:
+            continue
+
+        if line.startswith("/"):
+            command, _, argument = line.partition(" ")
+            if command in ("/exit", "/quit"):
+                break
+            elif command == "/help":
+                print(HELP_TEXT)
+            elif command == "/usage":
+                print(session.usage_report())
+            elif command == "/clear":
+                session.clear()
+                print("Conversation cleared.")
+            elif command == "/save":
+                try:
+                    path = session.save(argument.strip() or None)
+                    print(f"Transcript saved to {path}")
+                except OSError as e:
+                    print(f"Error: Cannot save transcript: {e}")
+            else:
+                print(f"Unknown command {command}; /help lists commands.")
+            continue
+
+        try:
+            result = await _run_turn(session, line)
+        except KeyboardInterrupt:
+            print("\nTurn cancelled.")
+            continue
+        except Exception as e:
+            print(f"Error: {e}")
+            continue
+
+        if result["response"] is None:
+            print("Error: Maximum iterations reached without a final answer.")
+        elif not session.stream:
+            # A streamed answer is already on stdout
+            print(result["response"])
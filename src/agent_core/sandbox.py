@@ -0,0 +1,65 @@
+import os
+from functools import lru_cache
+
+# Resolved directories kept by the resolver; deep trees repeat the same
+# parent directories, so this bounds the realpath() work per lookup
+RESOLVE_CACHE_SIZE = 4096
+
+
+class SandboxError(ValueError):
+    """Raised when a path resolves outside the working directory."""
+
+
+@lru_cache(maxsize=RESOLVE_CACHE_SIZE)
+def _real_dir(path):
+    return os.path.realpath(path)
+
+
+@lru_cache(maxsize=64)
+def _root(working_directory):
+    """Resolve a working directory once; returns (root, prefix)."""
+    root = _real_dir(os.path.abspath(working_directory))
+    prefix = os.path.normcase(root.rstrip(os.sep) + os.sep)
+    return root, prefix
+
+
+def resolve_path(working_directory, path):
+    """
+    Resolve a path given to a tool and check that it stays in the sandbox.
+
+    The path is joined to the working directory and normalized, then
+    symlinks are resolved with realpath, so a link inside the working
+    directory cannot point a tool outside of it. Resolved parent
+    directories are cached; call clear_resolve_cache() after anything that
+    may have created, removed or replaced a directory or symlink.
+
+    Args:
+        working_directory: The base working directory that serves as the root
+        path: The path from the tool call (relative to working_directory)
+
+    Returns:
+        tuple: (root, target) with the resolved working directory and the
+               resolved absolute target path
+
+    Raises:
+        SandboxError: If the target is outside the working directory
+    """
+    root, prefix = _root(working_directory)
+    joined = os.path.normpath(os.path.join(root, path))
+    parent, name = os.path.split(joined)
+    if name:
+        target = os.path.join(_real_dir(parent), name)
+        if os.path.islink(target):
+            target = os.path.realpath(target)
+    else:
+        target = _real_dir(joined)
+
+    if target != root and not os.path.normcase(target).startswith(prefix):
+        raise SandboxError(f"{path} is outside the working directory")
+    return root, target
+
+
+def clear_resolve_cache():
+    """Forget resolved directories after the working tree was modified."""
+    _real_dir.cache_clear()
+    _root.cache_clear()
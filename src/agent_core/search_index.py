@@ -0,0 +1,263 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from agent_core.file_walk import walk_entries
+from agent_core.providers.prompt_loader import get_cache_dir, get_settings
+from agent_core.sandbox import SandboxError, resolve_path
+
+# Bytes sniffed from the start of a file to detect binary content
+BINARY_SNIFF_BYTES = 8192
+
+# Trigrams of a query used for filtering (any subset gives valid candidates)
+MAX_QUERY_TRIGRAMS = 64
+
+# Bump when the indexed trigrams change, so existing indexes are rebuilt
+INDEX_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    indexed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trigrams (
+    tri INTEGER NOT NULL,
+    file_id INTEGER NOT NULL,
+    PRIMARY KEY (tri, file_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS trigrams_file ON trigrams (file_id);
+"""
+
+# root -> monotonic time of the last completed update
+_last_update = {}
+_update_lock = threading.Lock()
+
+
+def mark_stale(root=None):
+    """
+    Force the next search to rescan the tree for changed files.
+
+    Args:
+        root: Root whose index is stale (None marks every root)
+    """
+    with _update_lock:
+        if root is None:
+            _last_update.clear()
+        else:
+            _last_update.pop(os.path.abspath(root), None)
+
+
+def trigrams(data):
+    """
+    Get the distinct case-folded byte trigrams of some data.
+
+    The data is decoded as UTF-8 and case-folded before it is split, so
+    non-ASCII letters fold the same way in files and queries ("Ärger" and
+    "ärger" share their trigrams) and the index never drops a file that a
+    case-insensitive search would match.
+
+    Returns:
+        set: Trigrams encoded as 24-bit integers
+    """
+    data = data.decode("utf-8", errors="replace").casefold().encode("utf-8")
+    return {
+        int.from_bytes(data[i:i + 3], "big")
+        for i in range(len(data) - 2)
+    }
+
+
+class SearchIndex:
+    """
+    Persistent trigram index of the files under a root directory.
+
+    Each file is recorded with its mtime_ns and size; update() re-indexes
+    only files whose stat changed and drops deleted ones. A search looks up
+    the files containing every trigram of the query and scans only those.
+    Symlinks that resolve outside the root are left out of the index.
+    """
+
+    def __init__(self, root, db_path=None):
+        self.root = os.path.abspath(root)
+        if db_path is None:
+            digest = hashlib.sha1(self.root.encode("utf-8")).hexdigest()
+            db_path = os.path.join(
+                get_cache_dir(), f"search_index_{digest[:12]}.sqlite"
+            )
+        self.db_path = db_path
+        self.max_file_bytes = get_settings().get(
+            "SEARCH_MAX_FILE_BYTES", 1024 * 1024
+        )
+        self._conn = sqlite3.connect(db_path, timeout=30)
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != INDEX_VERSION:
+            # Built with other trigrams; start over
+            self._conn.executescript(
+                "DROP TABLE IF EXISTS trigrams; DROP TABLE IF EXISTS files;"
+            )
+            self._conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+            mark_stale(self.root)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def update(self, max_age=None):
+        """
+        Bring the index up to date with the files on disk.
+
+        Args:
+            max_age: Skip the rescan if the last one finished less than this
+                     many seconds ago (default: SEARCH_INDEX_MAX_AGE_SECONDS)
+
+        Returns:
+            dict: Counts of 'indexed' and 'removed' files
+        """
+        if max_age is None:
+            max_age = get_settings().get("SEARCH_INDEX_MAX_AGE_SECONDS", 5)
+        counts = {"indexed": 0, "removed": 0}
+
+        with _update_lock:
+            last = _last_update.get(self.root)
+            if last is not None and time.monotonic() - last < max_age:
+                return counts
+
+            known = {
+                path: (file_id, mtime_ns, size)
+                for file_id, path, mtime_ns, size in self._conn.execute(
+                    "SELECT id, path, mtime_ns, size FROM files"
+                )
+            }
+            cache_dir = os.path.relpath(get_cache_dir(), self.root)
+            seen = set()
+
+            with self._conn:
+                for rel_path, stat, is_dir in walk_entries(
+                    self.root, max_depth=0, exclude=(cache_dir,)
+                ):
+                    if is_dir or not _inside(self.root, rel_path):
+                        continue
+                    seen.add(rel_path)
+                    old = known.get(rel_path)
+                    if old and old[1:] == (stat.st_mtime_ns, stat.st_size):
+                        continue
+                    self._index_file(rel_path, stat, old and old[0])
+                    counts["indexed"] += 1
+
+                for rel_path in known.keys() - seen:
+                    file_id = known[rel_path][0]
+                    self._conn.execute(
+                        "DELETE FROM trigrams WHERE file_id = ?", (file_id,)
+                    )
+                    self._conn.execute(
+                        "DELETE FROM files WHERE id = ?", (file_id,)
+                    )
+                    counts["removed"] += 1
+
+            _last_update[self.root] = time.monotonic()
+        return counts
+
+    def _index_file(self, rel_path, stat, file_id):
+        """Record one file and its trigrams (binary/huge files get none)."""
+        data = b""
+        if stat.st_size <= self.max_file_bytes:
+            try:
+                _, path = resolve_path(self.root, rel_path)
+                with open(path, "rb") as f:
+                    data = f.read()
+            except (OSError, SandboxError):
+                data = b""
+        indexed = bool(data) and b"\0" not in data[:BINARY_SNIFF_BYTES]
+
+        if file_id is None:
+            file_id = self._conn.execute(
+                "INSERT INTO files (path, mtime_ns, size, indexed) "
+                "VALUES (?, ?, ?, ?)",
+                (rel_path, stat.st_mtime_ns, stat.st_size, int(indexed)),
+            ).lastrowid
+        else:
+            self._conn.execute(
+                "UPDATE files SET mtime_ns = ?, size = ?, indexed = ? "
+                "WHERE id = ?",
+                (stat.st_mtime_ns, stat.st_size, int(indexed), file_id),
+            )
+            self._conn.execute(
+                "DELETE FROM trigrams WHERE file_id = ?", (file_id,)
+            )
+
+        if indexed:
+            self._conn.executemany(
+                "INSERT INTO trigrams (tri, file_id) VALUES (?, ?)",
+                ((tri, file_id) for tri in trigrams(data)),
+            )
+
+    def candidates(self, literal=None, prefix=""):
+        """
+        Get the indexed files that may contain a literal string.
+
+        Args:
+            literal: Text every candidate must contain (None or shorter than
+                     three bytes matches every indexed file)
+            prefix: Only return paths under this relative directory
+
+        Returns:
+            list: Sorted relative paths
+        """
+        query_trigrams = (
+            sorted(trigrams(literal.encode("utf-8")))[:MAX_QUERY_TRIGRAMS]
+            if literal else []
+        )
+
+        if not query_trigrams:
+            rows = self._conn.execute(
+                "SELECT path FROM files WHERE indexed = 1 ORDER BY path"
+            )
+        else:
+            placeholders = ",".join("?" * len(query_trigrams))
+            rows = self._conn.execute(
+                f"SELECT f.path FROM trigrams t JOIN files f "
+                f"ON f.id = t.file_id WHERE t.tri IN ({placeholders}) "
+                f"GROUP BY t.file_id HAVING COUNT(*) = ? ORDER BY f.path",
+                (*query_trigrams, len(query_trigrams)),
+            )
+
+        return _under(prefix, [row[0] for row in rows])
+
+    def oversized(self, prefix=""):
+        """
+        Get the files too large to index (over SEARCH_MAX_FILE_BYTES).
+
+        Searches skip them, so callers can say which files went unsearched.
+
+        Args:
+            prefix: Only return paths under this relative directory
+
+        Returns:
+            list: Sorted relative paths
+        """
+        rows = self._conn.execute(
+            "SELECT path FROM files WHERE size > ? ORDER BY path",
+            (self.max_file_bytes,),
+        )
+        return _under(prefix, [row[0] for row in rows])
+
+
+def _inside(root, rel_path):
+    """Check that a walked file (or the file it links to) is under root."""
+    try:
+        resolve_path(root, rel_path)
+    except SandboxError:
+        return False
+    return True
+
+
+def _under(prefix, paths):
+    """Keep the paths under a relative directory ("" or "." keeps all)."""
+    prefix = prefix.strip("/")
+    if prefix in ("", "."):
+        return paths
+    return [path for path in paths if path.startswith(prefix + "/")]
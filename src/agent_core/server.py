@@ -0,0 +1,440 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import uuid
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.normpath(os.path.join(current_dir, ".."))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from agent_core.checkpoint import checkpoint_path  # noqa: E402
+from agent_core.engine import (  # noqa: E402
+    MAX_ITERATIONS,
+    resume_session,
+    run_session,
+)
+from agent_core.llm_cache import CACHE_MODES  # noqa: E402
+
+# Largest request body accepted, in bytes
+MAX_REQUEST_BYTES = 1024 * 1024
+
+# Session ids name checkpoint files, so only these characters are allowed
+SESSION_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+}
+
+
+class RequestError(Exception):
+    """An HTTP request that is answered with an error status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+async def read_request(reader):
+    """
+    Read one HTTP/1.x request.
+
+    Returns:
+        tuple: (method, path, body) with the body as bytes
+
+    Raises:
+        RequestError: If the request is malformed or too large
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.LimitOverrunError:
+        raise RequestError(413, "Request headers too large")
+
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split(" ")
+    if len(parts) != 3:
+        raise RequestError(400, "Malformed request line")
+    method, path = parts[0].upper(), parts[1].split("?", 1)[0]
+
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise RequestError(400, "Invalid Content-Length")
+    if length > MAX_REQUEST_BYTES:
+        raise RequestError(413, "Request body too large")
+    body = await reader.readexactly(length) if length > 0 else b""
+    return method, path, body
+
+
+def _response_head(status, content_type):
+    return (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Cache-Control: no-store\r\n"
+        f"Connection: close\r\n\r\n"
+    ).encode("latin-1")
+
+
+async def send_json(writer, status, payload):
+    """Write a complete JSON response."""
+    writer.write(_response_head(status, "application/json"))
+    writer.write(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+    await writer.drain()
+
+
+class AgentServer:
+    """
+    Local HTTP server that runs agent sessions in one long-lived process.
+
+    LangChain, the tools, the settings and the model client are loaded
+    once, so each query only costs its model and tool calls. Sessions run
+    concurrently on the server's event loop (at most max_sessions at once);
+    each has its own messages, session id and trace context, while the
+    AgentModel, its connection pool and the tool caches are shared.
+
+    Endpoints:
+        POST /sessions: Run a query, given as JSON {"query": ...} with
+            optional "session_id" and "stream" (stream model text), or
+            continue a checkpointed session with {"resume": session_id}.
+            A new session may not reuse the id of a checkpointed or
+            running session (409).
+            The response is NDJSON: a "session" event, then the progress
+            events of run_agent_loop, and finally "done" or "error".
+        GET /health: Server status and session counters
+
+    Args:
+        checkpoint: Checkpoint new sessions (default: CHECKPOINTS from
+                    settings); needed for {"resume": ...}
+    """
+
+    def __init__(self, agent_model, system_template, tool_workers=1,
+                 max_sessions=4, max_iterations=MAX_ITERATIONS,
+                 checkpoint=None):
+        self.agent_model = agent_model
+        self.system_template = system_template
+        self.tool_workers = tool_workers
+        self.max_iterations = max_iterations
+        self.checkpoint = checkpoint
+        self.max_sessions = max(1, max_sessions)
+        self.active_sessions = 0
+        self.completed_sessions = 0
+        self.failed_sessions = 0
+        self._slots = asyncio.Semaphore(self.max_sessions)
+        self._running_ids = set()
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        """
+        Start listening.
+
+        Returns:
+            tuple: (host, port) the server is bound to
+        """
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        try:
+            method, path, body = await read_request(reader)
+            if path == "/health":
+                if method != "GET":
+                    raise RequestError(405, "Use GET /health")
+                await send_json(writer, 200, {
+                    "status": "ok",
+                    "model": self.agent_model.model,
+                    "active_sessions": self.active_sessions,
+                    "completed_sessions": self.completed_sessions,
+                    "failed_sessions": self.failed_sessions,
+                    "max_sessions": self.max_sessions,
+                })
+            elif path == "/sessions":
+                if method != "POST":
+                    raise RequestError(405, "Use POST /sessions")
+                await self._run_session(
+                    _parse_session_request(body), reader, writer
+                )
+            else:
+                raise RequestError(404, f"No such endpoint: {path}")
+        except RequestError as e:
+            await send_json(writer, e.status, {"error": str(e)})
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _run_session(self, request, reader, writer):
+        """Run one session and stream its events as NDJSON lines."""
+        session_id = request.get("resume") or request.get("session_id") or (
+            uuid.uuid4().hex[:12]
+        )
+        if session_id in self._running_ids:
+            raise RequestError(409, f"Session {session_id} is already running")
+        if not request.get("resume") and os.path.exists(
+            checkpoint_path(session_id)
+        ):
+            raise RequestError(
+                409,
+                f"Session {session_id} already has a checkpoint; continue "
+                f"it with {{\"resume\": \"{session_id}\"}} or pick "
+                f"another id",
+            )
+        self._running_ids.add(session_id)
+        try:
+            await self._stream_session(request, session_id, reader, writer)
+        finally:
+            self._running_ids.discard(session_id)
+
+    async def _stream_session(self, request, session_id, reader, writer):
+        events = asyncio.Queue()
+
+        async def session():
+            try:
+                async with self._slots:
+                    self.active_sessions += 1
+                    try:
+                        result = await self._start(
+                            request, session_id, events.put_nowait
+                        )
+                    finally:
+                        self.active_sessions -= 1
+                events.put_nowait({
+                    "event": "done",
+                    "session_id": session_id,
+                    "response": result["response"],
+                    "usage": result["usage"],
+                    "iterations": result["iterations"],
+                    "llm_cache_hits": result["llm_cache"]["hits"],
+                })
+                self.completed_sessions += 1
+            except Exception as e:
+                events.put_nowait({
+                    "event": "error",
+                    "session_id": session_id,
+                    "error": f"{type(e).__name__}: {e}",
+                })
+                self.failed_sessions += 1
+            finally:
+                events.put_nowait(None)
+
+        writer.write(_response_head(200, "application/x-ndjson"))
+        events.put_nowait({"event": "session", "session_id": session_id})
+        # A new task gets its own copy of the trace context
+        task = asyncio.ensure_future(session())
+        # Nothing is written while a tool runs, so also watch for the
+        # client closing the connection
+        disconnected = asyncio.ensure_future(_wait_for_disconnect(reader))
+        next_event = None
+        try:
+            while True:
+                next_event = asyncio.ensure_future(events.get())
+                await asyncio.wait(
+                    (next_event, disconnected),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not next_event.done():
+                    raise ConnectionResetError("Client disconnected")
+                event = next_event.result()
+                if event is None:
+                    break
+                writer.write(
+                    (json.dumps(event, ensure_ascii=False) + "\n").encode(
+                        "utf-8"
+                    )
+                )
+                await writer.drain()
+        except ConnectionError:
+            # The client went away; stop spending tokens on the session
+            # (it stays checkpointed and can be resumed)
+            task.cancel()
+        finally:
+            disconnected.cancel()
+            if next_event is not None:
+                next_event.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    def _start(self, request, session_id, on_event):
+        loop_kwargs = {
+            "tool_workers": self.tool_workers,
+            "max_iterations": self.max_iterations,
+            "stream": request.get("stream", False),
+            "on_event": on_event,
+        }
+        if request.get("resume"):
+            return resume_session(self.agent_model, session_id, **loop_kwargs)
+        return run_session(
+            self.agent_model,
+            self.system_template,
+            request["query"],
+            session_id=session_id,
+            checkpoint=self.checkpoint,
+            **loop_kwargs,
+        )
+
+
+async def _wait_for_disconnect(reader):
+    """Return once the client has closed its side of the connection."""
+    try:
+        while await reader.read(4096):
+            pass
+    except ConnectionError:
+        pass
+
+
+def _parse_session_request(body):
+    """Validate the JSON body of POST /sessions."""
+    try:
+        request = json.loads(body or b"{}")
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise RequestError(400, "Request body must be JSON")
+    if not isinstance(request, dict):
+        raise RequestError(400, "Request body must be a JSON object")
+    if not request.get("resume") and (
+        not isinstance(request.get("query"), str) or not request["query"]
+    ):
+        raise RequestError(400, "'query' must be a non-empty string")
+    if not isinstance(request.get("stream", False), bool):
+        raise RequestError(400, "'stream' must be a boolean")
+    for key in ("resume", "session_id"):
+        value = request.get(key)
+        if value is not None and (
+            not isinstance(value, str) or
+            not SESSION_ID_PATTERN.fullmatch(value)
+        ):
+            raise RequestError(
+                400, f"'{key}' may only contain ASCII letters, digits, - "
+                f"and _"
+            )
+    return request
+
+
+async def serve(agent_model, system_template, host, port, tool_workers,
+                max_sessions):
+    server = AgentServer(
+        agent_model,
+        system_template,
+        tool_workers=tool_workers,
+        max_sessions=max_sessions,
+    )
+    # Create the model client now, on the server's event loop, so the
+    # first query doesn't pay for it
+    if agent_model.cache_mode != "replay":
+        agent_model.llm_with_tools
+    host, port = await server.start(host, port)
+    print(f"Agent server listening on http://{host}:{port}", flush=True)
+    await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve agent sessions over HTTP on localhost"
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        default=None,
+        help="Address to bind (default: SERVER_HOST from settings)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=None,
+        help="Port to bind (default: SERVER_PORT from settings)"
+    )
+    parser.add_argument(
+        "--max-sessions",
+        type=int,
+        default=None,
+        help=(
+            "Maximum number of sessions to run at once "
+            "(default: SERVER_MAX_SESSIONS from settings)"
+        )
+    )
+    parser.add_argument(
+        "--tool-workers",
+        type=int,
+        default=None,
+        help=(
+            "Maximum number of tool calls from one response to run "
+            "concurrently (default: MAX_TOOL_WORKERS from settings)"
+        )
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        default=None,
+        help="Append timing spans to this JSONL file"
+    )
+    parser.add_argument(
+        "--llm-cache",
+        choices=CACHE_MODES,
+        default=None,
+        help="LLM response cache mode (default: LLM_CACHE_MODE)"
+    )
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+
+    from agent_core.engine import AgentModel
+    from agent_core.providers.prompt_loader import (
+        get_active_system_prompt,
+        get_settings,
+    )
+    from agent_core.tracing import configure_tracing
+
+    load_dotenv()
+
+    settings = get_settings()
+    system_template, parameters = get_active_system_prompt()
+    configure_tracing(
+        args.trace if args.trace is not None
+        else settings.get("TRACE_FILE")
+    )
+    agent_model = AgentModel(
+        os.environ.get("OPENAI_MODEL"),
+        parameters.get("temperature", 0),
+        cache_mode=args.llm_cache,
+    )
+
+    def setting(value, key, default):
+        return value if value is not None else settings.get(key, default)
+
+    try:
+        asyncio.run(serve(
+            agent_model,
+            system_template,
+            setting(args.host, "SERVER_HOST", "127.0.0.1"),
+            setting(args.port, "SERVER_PORT", 8765),
+            setting(args.tool_workers, "MAX_TOOL_WORKERS", 1),
+            setting(args.max_sessions, "SERVER_MAX_SESSIONS", 4),
+        ))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
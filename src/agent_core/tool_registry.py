@@ -0,0 +1,218 @@
+import asyncio
+import importlib
+import pkgutil
+
+# Registered tools by name, in the order their modules were loaded
+TOOLS = {}
+
+
+class ToolArgumentError(ValueError):
+    """Raised when tool call arguments don't match the tool's schema."""
+
+
+class Tool:
+    """
+    A tool's schema, implementations and scheduling metadata.
+
+    Attributes:
+        name: The tool name from the schema
+        schema: The OpenAI function schema bound to the model
+        func: The synchronous implementation
+        async_func: The async implementation (defaults to running func in a
+                    worker thread)
+        read_only: True if the tool only reads from the working directory
+        writes: True if the tool modifies the file named by "file_path"
+        cache_path: (argument, default) naming the path the tool's results
+                    are cached on, or None if results are not cached
+        validate: Function checking a dict of arguments against the schema;
+                  returns the keyword arguments to call the tool with
+    """
+
+    def __init__(self, schema, func, read_only=False, writes=False,
+                 cache_path=None):
+        self.name = schema["function"]["name"]
+        self.schema = schema
+        self.func = func
+        self.async_func = self._run_in_thread
+        self.read_only = read_only
+        self.writes = writes
+        self.cache_path = cache_path
+        self.validate = compile_validator(
+            schema["function"].get("parameters", {"type": "object"}),
+            closed=True,
+        )
+
+    async def _run_in_thread(self, **kwargs):
+        return await asyncio.to_thread(self.func, **kwargs)
+
+
+def register_tool(schema, read_only=False, writes=False, cache_path=None):
+    """
+    Decorator registering a function as the implementation of a tool.
+
+    Args:
+        schema: The tool's OpenAI function schema
+        read_only: The tool only reads from the working directory
+        writes: The tool modifies the file named by its "file_path" argument
+        cache_path: (argument, default) of the path results are cached on
+
+    Returns:
+        function: Decorator returning the function unchanged
+    """
+    def decorator(func):
+        tool = Tool(schema, func, read_only, writes, cache_path)
+        if tool.name in TOOLS:
+            raise ValueError(f"Tool {tool.name!r} is registered twice")
+        TOOLS[tool.name] = tool
+        return func
+    return decorator
+
+
+def register_async(name):
+    """
+    Decorator registering the async implementation of a registered tool.
+
+    Args:
+        name: The tool name
+
+    Returns:
+        function: Decorator returning the coroutine function unchanged
+    """
+    def decorator(func):
+        TOOLS[name].async_func = func
+        return func
+    return decorator
+
+
+def load_tools(package="agent_core.tools"):
+    """
+    Import every module of a package so its tools register themselves.
+
+    Returns:
+        dict: The registry (TOOLS)
+    """
+    module = importlib.import_module(package)
+    for info in sorted(pkgutil.iter_modules(module.__path__),
+                       key=lambda info: info.name):
+        importlib.import_module(f"{package}.{info.name}")
+    return TOOLS
+
+
+def _type_error(where, expected):
+    return ToolArgumentError(f"'{where}' must be {expected}")
+
+
+def compile_validator(schema, where="arguments", closed=False):
+    """
+    Compile a JSON schema into a function that checks a value against it.
+
+    Supports the subset of JSON Schema used by the tool schemas: object
+    (properties, required), array (items), string, integer, number, boolean
+    and enum. Compiling once per tool keeps per-call validation to a few
+    isinstance checks. A single string is accepted where an array of
+    strings is expected (the tools have always accepted that), and None for
+    an optional property means the property was not given.
+
+    Args:
+        schema: The JSON schema
+        where: Name of the value, used in error messages
+        closed: Reject object properties the schema does not list (used for
+                the top-level arguments, which become keyword arguments)
+
+    Returns:
+        function: Takes a value and returns the (possibly normalized) value;
+                  raises ToolArgumentError when it doesn't match
+    """
+    kind = schema.get("type")
+    enum = schema.get("enum")
+
+    if kind == "object":
+        properties = {
+            name: compile_validator(
+                sub_schema,
+                name if where == "arguments" else f"{where}.{name}",
+            )
+            for name, sub_schema in schema.get("properties", {}).items()
+        }
+        required = tuple(schema.get("required", ()))
+        closed = closed or schema.get("additionalProperties") is False
+
+        def check(value):
+            if not isinstance(value, dict):
+                raise _type_error(where, "an object")
+            result = {}
+            for key, item in value.items():
+                check_item = properties.get(key)
+                if check_item is None:
+                    if closed:
+                        raise ToolArgumentError(
+                            f"unexpected argument '{key}' (expected "
+                            f"{', '.join(properties) or 'no arguments'})"
+                        )
+                    result[key] = item
+                elif item is None and key not in required:
+                    continue
+                else:
+                    result[key] = check_item(item)
+            missing = [key for key in required if key not in result]
+            if missing:
+                raise ToolArgumentError(
+                    f"missing required argument "
+                    f"{', '.join(repr(key) for key in missing)}"
+                )
+            return result
+
+    elif kind == "array":
+        items_schema = schema.get("items", {})
+        check_item = compile_validator(items_schema, f"{where}[]")
+        wrap_strings = items_schema.get("type") == "string"
+
+        def check(value):
+            if wrap_strings and isinstance(value, str):
+                return [value]
+            if not isinstance(value, list):
+                raise _type_error(where, "an array")
+            return [check_item(item) for item in value]
+
+    elif kind == "string":
+        def check(value):
+            if not isinstance(value, str):
+                raise _type_error(where, "a string")
+            return value
+
+    elif kind == "integer":
+        def check(value):
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise _type_error(where, "an integer")
+            return value
+
+    elif kind == "number":
+        def check(value):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise _type_error(where, "a number")
+            return value
+
+    elif kind == "boolean":
+        def check(value):
+            if not isinstance(value, bool):
+                raise _type_error(where, "a boolean")
+            return value
+
+    else:
+        def check(value):
+            return value
+
+    if enum is None:
+        return check
+
+    allowed = tuple(enum)
+
+    def check_enum(value):
+        value = check(value)
+        if value not in allowed:
+            raise ToolArgumentError(
+                f"'{where}' must be one of "
+                f"{', '.join(repr(option) for option in allowed)}"
+            )
+        return value
+    return check_enum
@@ -0,0 +1,360 @@
+import asyncio
+import os
+import re
+import sys
+import tempfile
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.normpath(os.path.join(current_dir, "..", ".."))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from agent_core.sandbox import SandboxError, resolve_path  # noqa: E402
+from agent_core.tool_registry import (  # noqa: E402
+    register_async,
+    register_tool,
+)
+
+
+edit_file_schema = {
+    "type": "function",
+    "function": {
+        "name": "edit_file",
+        "description": (
+            "Edits an existing file in place by applying search/replace "
+            "blocks or a unified diff. Prefer this over write_file for "
+            "changes to existing files: only the changed text is sent. "
+            "Each search block must match exactly one place in the file."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": (
+                        "File path to edit, relative to the working directory"
+                    ),
+                },
+                "edits": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "search": {
+                                "type": "string",
+                                "description": (
+                                    "Exact text to find, including enough "
+                                    "surrounding lines to be unique"
+                                ),
+                            },
+                            "replace": {
+                                "type": "string",
+                                "description": "Text to put in its place",
+                            },
+                        },
+                        "required": ["search", "replace"],
+                    },
+                    "description": (
+                        "Search/replace blocks, applied in order. Use either "
+                        "edits or diff"
+                    ),
+                },
+                "diff": {
+                    "type": "string",
+                    "description": (
+                        "A unified diff of the file (with @@ hunk headers). "
+                        "Use either edits or diff"
+                    ),
+                },
+            },
+            "required": ["file_path"],
+        },
+    },
+}
+
+
+# Matches a unified diff hunk header such as "@@ -12,3 +12,4 @@"
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class EditError(Exception):
+    """An edit that cannot be applied; the message is shown to the model."""
+
+
+def _count_lines(text):
+    """Count the lines in a block of text (a final partial line counts)."""
+    if not text:
+        return 0
+    return text.count("\n") + (0 if text.endswith("\n") else 1)
+
+
+def _find_matches(text, search):
+    """
+    Find every place a search block starts, overlapping matches included.
+
+    Returns:
+        list: Start indexes in order
+    """
+    matches = []
+    index = text.find(search)
+    while index != -1:
+        matches.append(index)
+        index = text.find(search, index + 1)
+    return matches
+
+
+def _apply_search_replace(text, edits):
+    """
+    Apply search/replace blocks one after another.
+
+    Returns:
+        tuple: (new_text, changes) where changes lists
+               (line, removed_lines, added_lines) per edit
+    """
+    changes = []
+    for number, edit in enumerate(edits, start=1):
+        if not isinstance(edit, dict):
+            raise EditError(f"edit {number} must have search and replace")
+        search = edit.get("search")
+        replace = edit.get("replace")
+        if not isinstance(search, str) or not isinstance(replace, str):
+            raise EditError(f"edit {number} must have search and replace")
+        if not search:
+            raise EditError(f"edit {number} has an empty search block")
+
+        matches = _find_matches(text, search)
+        if not matches:
+            raise EditError(
+                f"search block of edit {number} was not found; copy it "
+                f"exactly from the current file"
+            )
+        if len(matches) > 1:
+            raise EditError(
+                f"search block of edit {number} matches {len(matches)} "
+                f"places; include more surrounding lines to make it unique"
+            )
+
+        index = matches[0]
+        line = text.count("\n", 0, index) + 1
+        text = text[:index] + replace + text[index + len(search):]
+        changes.append((line, _count_lines(search), _count_lines(replace)))
+    return text, changes
+
+
+def _parse_hunks(diff):
+    """
+    Split a unified diff into hunks.
+
+    Returns:
+        list: [old_start, old_lines, new_lines, removed, added] per hunk,
+              where the line lists have no line endings and removed/added
+              count the "-" and "+" lines
+    """
+    hunks = []
+    current = None
+    for raw_line in diff.splitlines():
+        header = HUNK_HEADER.match(raw_line)
+        if header:
+            current = [int(header.group(1)), [], [], 0, 0]
+            hunks.append(current)
+            continue
+        if current is None or raw_line.startswith("\\"):
+            # File headers ("---"/"+++") and "\ No newline at end of file"
+            continue
+        marker, line = raw_line[:1], raw_line[1:]
+        if marker == " " or raw_line == "":
+            current[1].append(line)
+            current[2].append(line)
+        elif marker == "-":
+            current[1].append(line)
+            current[3] += 1
+        elif marker == "+":
+            current[2].append(line)
+            current[4] += 1
+        else:
+            raise EditError(f"unexpected line in diff: {raw_line[:80]!r}")
+
+    if not hunks:
+        raise EditError("diff has no @@ hunk headers")
+    return hunks
+
+
+def _find_block(lines, block, start):
+    """
+    Find every place a block of lines occurs at or after start.
+
+    Returns:
+        list: Indexes of the block's first line
+    """
+    size = len(block)
+    first = block[0]
+    return [
+        i for i in range(start, len(lines) - size + 1)
+        if lines[i] == first and lines[i:i + size] == block
+    ]
+
+
+def _apply_diff(text, diff):
+    """
+    Apply a unified diff, tolerating hunks whose line numbers have drifted.
+
+    Returns:
+        tuple: (new_text, changes) like _apply_search_replace
+    """
+    newline = "\r\n" if "\r\n" in text else "\n"
+    keeps_final_newline = text.endswith(newline) or not text
+    lines = text.split(newline)
+    if lines[-1] == "":
+        lines.pop()
+
+    changes = []
+    start = 0
+    offset = 0
+    for number, (old_start, old_block, new_block, removed, added) in enumerate(
+        _parse_hunks(diff), start=1
+    ):
+        # The header's line numbers refer to the original file
+        expected = max(old_start - 1, 0) + offset
+        if old_block:
+            # A unique match is used wherever it is; among several, the one
+            # at the hunk's stated line wins
+            found = _find_block(lines, old_block, start)
+            if not found:
+                raise EditError(
+                    f"hunk {number} does not match the current file; "
+                    f"read the file again and regenerate the diff"
+                )
+            if len(found) == 1:
+                index = found[0]
+            elif expected in found:
+                index = expected
+            else:
+                raise EditError(
+                    f"hunk {number} matches {len(found)} places and none at "
+                    f"its stated line; include more context lines"
+                )
+        else:
+            # Pure insertion: "@@ -N,0" inserts after line N
+            index = min(old_start + offset, len(lines))
+
+        lines[index:index + len(old_block)] = new_block
+        start = index + len(new_block)
+        offset += len(new_block) - len(old_block)
+        changes.append((index + 1, removed, added))
+
+    new_text = newline.join(lines)
+    if lines and keeps_final_newline:
+        new_text += newline
+    return new_text, changes
+
+
+def _write_atomic(target_path, text):
+    """Replace a file's contents via a temporary file and a rename."""
+    mode = os.stat(target_path).st_mode
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(target_path),
+        prefix=f".{os.path.basename(target_path)}.",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        os.chmod(temp_path, mode & 0o7777)
+        os.replace(temp_path, target_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _summarize(file_path, changes, text):
+    """Describe the applied changes without repeating the file."""
+    added = sum(change[2] for change in changes)
+    removed = sum(change[1] for change in changes)
+    noun = "change" if len(changes) == 1 else "changes"
+    summary = [
+        f'Successfully edited "{file_path}": {len(changes)} {noun}, '
+        f"+{added} -{removed} lines (file now has {_count_lines(text)} "
+        f"lines)"
+    ]
+    for line, removed_lines, added_lines in changes:
+        summary.append(f"  line {line}: -{removed_lines} +{added_lines}")
+    return "\n".join(summary)
+
+
+@register_tool(edit_file_schema, writes=True)
+def edit_file(working_directory, file_path, edits=None, diff=None):
+    """
+    Apply search/replace blocks or a unified diff to a file.
+
+    Every edit is checked before anything is written; the file is then
+    replaced atomically, so a failed edit leaves it untouched.
+
+    Args:
+        working_directory: The base working directory that serves as the root
+        file_path: The file path to edit (relative to working_directory)
+        edits: List of {"search": ..., "replace": ...} blocks
+        diff: A unified diff of the file (used when edits is not given)
+
+    Returns:
+        A summary of the change or an error message prefixed with "Error:"
+    """
+    try:
+        # Resolve the path (following symlinks) and make sure it is
+        # inside the permitted directory
+        try:
+            _, target_path = resolve_path(working_directory, file_path)
+        except SandboxError:
+            return (
+                f'Error: Cannot edit "{file_path}" as it is outside '
+                f'the permitted working directory'
+            )
+
+        if not os.path.isfile(target_path):
+            return (
+                f'Error: File not found or is not a regular file: '
+                f'"{file_path}"'
+            )
+        if (edits is None) == (diff is None):
+            return "Error: Provide exactly one of edits or diff"
+
+        with open(target_path, "r", encoding="utf-8", newline="") as f:
+            text = f.read()
+
+        try:
+            if edits is not None:
+                new_text, changes = _apply_search_replace(text, edits)
+            else:
+                new_text, changes = _apply_diff(text, diff)
+        except EditError as e:
+            return f'Error: Cannot edit "{file_path}": {e}'
+
+        if new_text == text:
+            return f'No changes made to "{file_path}"'
+
+        _write_atomic(target_path, new_text)
+        return _summarize(file_path, changes, new_text)
+
+    except UnicodeDecodeError:
+        return (
+            f'Error: Cannot edit "{file_path}" as it is not a UTF-8 text file'
+        )
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+@register_async("edit_file")
+async def edit_file_async(working_directory, file_path, edits=None,
+                          diff=None):
+    """
+    Async version of edit_file that runs it in a worker thread.
+
+    Returns:
+        The same string edit_file returns
+    """
+    return await asyncio.to_thread(
+        edit_file, working_directory, file_path, edits, diff
+    )
@@ -0,0 +1,195 @@
+import asyncio
+import os
+import sys
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.normpath(os.path.join(current_dir, "..", ".."))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from agent_core.code_outline import OutlineCache  # noqa: E402
+from agent_core.file_walk import walk_entries  # noqa: E402
+from agent_core.providers.prompt_loader import (  # noqa: E402
+    get_cache_dir,
+    get_settings,
+)
+from agent_core.sandbox import SandboxError, resolve_path  # noqa: E402
+from agent_core.tool_registry import (  # noqa: E402
+    register_async,
+    register_tool,
+)
+
+
+get_code_outline_schema = {
+    "type": "function",
+    "function": {
+        "name": "get_code_outline",
+        "description": (
+            "Lists the classes, functions and methods of a Python file, or "
+            "of every .py file under a directory, with their signatures, "
+            "the first line of their docstrings and their line ranges "
+            "(L<start>-<end>). Use it to find a definition, then read just "
+            "those lines with get_file_content start_line/end_line."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": (
+                        "Python file or directory (package), relative to "
+                        "the working directory (default is '.')"
+                    ),
+                },
+            },
+        },
+    },
+}
+
+
+def format_outline(display_path, outline):
+    """
+    Render one file's outline as text.
+
+    Returns:
+        str: A '==> path (N lines) <==' header followed by one line per
+             symbol, indented by nesting depth
+    """
+    lines = [f"==> {display_path} ({outline['lines']} lines) <=="]
+    if "error" in outline:
+        lines.append(f"Error: {outline['error']}")
+        return "\n".join(lines)
+    if outline.get("doc"):
+        lines.append(f"# {outline['doc']}")
+    for symbol in outline["symbols"]:
+        line = (
+            f"{'    ' * symbol['depth']}{symbol['kind']} {symbol['name']}"
+            f"{symbol['signature']}  L{symbol['start']}-{symbol['end']}"
+        )
+        if symbol["doc"]:
+            line += f"  # {symbol['doc']}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _python_files(target_dir, working_dir_abs):
+    """
+    Find the .py files under a directory, skipping the cache directory.
+
+    Symlinks are resolved like any other tool path; links that lead outside
+    the working directory are skipped.
+
+    Returns:
+        list: (rel_path, resolved_path, stat) per file
+    """
+    cache_dir = os.path.relpath(get_cache_dir(), target_dir)
+    files = []
+    for rel_path, stat, is_dir in walk_entries(
+        target_dir, max_depth=0, include=("*.py",), exclude=(cache_dir,),
+        top=working_dir_abs,
+    ):
+        if is_dir:
+            continue
+        try:
+            _, path = resolve_path(
+                working_dir_abs, os.path.join(target_dir, rel_path)
+            )
+        except SandboxError:
+            continue
+        files.append((rel_path, path, stat))
+    return files
+
+
+@register_tool(get_code_outline_schema, read_only=True)
+def get_code_outline(working_directory, path="."):
+    """
+    Outline the Python code in a file or directory.
+
+    Outlines are built with the ast module and cached per file in a
+    persistent store under CACHE_DIR (see code_outline.OutlineCache),
+    keyed on the file's mtime and size, so repeated outlines of a package
+    only parse the files that changed. The result is capped at
+    OUTLINE_MAX_CHARS; a single outline longer than that is cut at a line
+    boundary.
+
+    Args:
+        working_directory: The base working directory that serves as the root
+        path: Python file or directory to outline (relative to
+              working_directory)
+
+    Returns:
+        A string with one outline section per file or an error message
+        prefixed with "Error:"
+    """
+    try:
+        try:
+            working_dir_abs, target = resolve_path(working_directory, path)
+        except SandboxError:
+            return (
+                f'Error: Cannot outline "{path}" as it is outside '
+                f'the permitted working directory'
+            )
+
+        if os.path.isfile(target):
+            if not target.endswith(".py"):
+                return f'Error: "{path}" is not a Python file'
+            files = [(target, os.path.relpath(target, working_dir_abs), None)]
+        elif os.path.isdir(target):
+            prefix = os.path.relpath(target, working_dir_abs)
+            prefix = "" if prefix == "." else prefix.replace(os.sep, "/") + "/"
+            files = [
+                (path, prefix + rel_path, stat)
+                for rel_path, path, stat in _python_files(
+                    target, working_dir_abs
+                )
+            ]
+            if not files:
+                return f'Error: No Python files found in "{path}"'
+        else:
+            return f'Error: "{path}" does not exist'
+
+        max_chars = get_settings().get("OUTLINE_MAX_CHARS", 20000)
+        sections = []
+        size = 0
+        cache = OutlineCache()
+        try:
+            for index, (file_path, display_path, stat) in enumerate(files):
+                section = format_outline(
+                    display_path, cache.get(file_path, stat)
+                )
+                if size + len(section) > max_chars:
+                    if not sections:
+                        # Keep the whole lines of a section too long alone
+                        cut = section.rfind("\n", 0, max_chars)
+                        sections.append(
+                            section[:cut] if cut > 0 else section[:max_chars]
+                        )
+                    sections.append(
+                        f"[...Outline truncated at {max_chars} characters "
+                        f"({index} of {len(files)} files complete); outline "
+                        f"a subdirectory or a single file, or read the rest "
+                        f"with get_file_content]"
+                    )
+                    break
+                sections.append(section)
+                size += len(section) + 2
+            if os.path.isdir(target):
+                cache.prune(target, {file_path for file_path, _, _ in files})
+        finally:
+            cache.close()
+        return "\n\n".join(sections)
+
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+@register_async("get_code_outline")
+async def get_code_outline_async(working_directory, path="."):
+    """
+    Async version of get_code_outline that runs it in a worker thread.
+
+    Returns:
+        The same string get_code_outline returns
+    """
+    return await asyncio.to_thread(get_code_outline, working_directory, path)
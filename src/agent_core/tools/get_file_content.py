@@ -1,3 +1,5 @@
+import asyncio
+import codecs
 import os
 import sys
 
@@ -8,13 +10,25 @@ if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 
 from agent_core.providers.prompt_loader import get_settings  # noqa: E402
+from agent_core.line_index import read_window  # noqa: E402
+from agent_core.sandbox import SandboxError, resolve_path  # noqa: E402
+from agent_core.tool_registry import (  # noqa: E402
+    register_async,
+    register_tool,
+)
+
+# Bytes sniffed from the start of a file to detect binary content
+BINARY_SNIFF_BYTES = 8192
 
 
 get_file_content_schema = {
     "type": "function",
     "function": {
         "name": "get_file_content",
-        "description": "Reads the content of a file.",
+        "description": (
+            "Reads the content of a file. Large files are truncated; use "
+            "start_line/end_line or offset/limit to read further windows."
+        ),
         "parameters": {
             "type": "object",
             "properties": {
@@ -25,6 +39,30 @@ get_file_content_schema = {
                         "directory"
                     ),
                 },
+                "start_line": {
+                    "type": "integer",
+                    "description": "First line to read (1-based)",
+                },
+                "end_line": {
+                    "type": "integer",
+                    "description": (
+                        "Last line to read, inclusive (requires start_line)"
+                    ),
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": (
+                        "Byte offset to start reading from (ignored when "
+                        "start_line is given)"
+                    ),
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": (
+                        "Maximum number of bytes to return (capped at the "
+                        "configured maximum)"
+                    ),
+                },
             },
             "required": ["file_path"],
         },
@@ -32,13 +70,151 @@ get_file_content_schema = {
 }
 
 
-def get_file_content(working_directory, file_path):
+def is_binary_file(path):
+    """
+    Check whether a file looks binary by sniffing its first bytes for NUL.
+
+    Args:
+        path: Absolute path of the file
+
+    Returns:
+        bool: True if the file appears to be binary
+    """
+    with open(path, "rb") as f:
+        return b"\0" in f.read(BINARY_SNIFF_BYTES)
+
+
+def check_readable_file(working_directory, file_path):
+    """
+    Resolve a path for reading and check that it is a text file in the
+    working directory.
+
+    Args:
+        working_directory: The base working directory that serves as the root
+        file_path: The file path to read (relative to working_directory)
+
+    Returns:
+        tuple: (target_file, error) with the resolved path, or None and an
+               error message prefixed with "Error:"
+    """
+    # Resolve the path (following symlinks) and make sure it is inside the
+    # permitted directory
+    try:
+        _, target_file = resolve_path(working_directory, file_path)
+    except SandboxError:
+        return None, (
+            f'Error: Cannot read "{file_path}" as it is outside '
+            f'the permitted working directory'
+        )
+
+    # Check if target_file is a regular file
+    if not os.path.isfile(target_file):
+        return None, (
+            f'Error: File not found or is not a regular file: '
+            f'"{file_path}"'
+        )
+
+    # Don't decode binary files into garbage
+    if is_binary_file(target_file):
+        return None, (
+            f'Error: "{file_path}" appears to be a binary file '
+            f'({os.path.getsize(target_file)} bytes); its content '
+            f'is not shown'
+        )
+    return target_file, None
+
+
+def _decode_window(data, trim_start):
+    """Decode a byte window, dropping UTF-8 characters cut at its edges."""
+    if trim_start:
+        # Skip UTF-8 continuation bytes left over from a cut character
+        skip = 0
+        while skip < min(len(data), 3) and (data[skip] & 0xC0) == 0x80:
+            skip += 1
+        data = data[skip:]
+    # A non-final incremental decode leaves out a character cut at the end
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    return decoder.decode(data, final=False)
+
+
+def _with_notice(content, notice):
+    """Append a position notice on its own line after the content."""
+    separator = "" if not content or content.endswith("\n") else "\n"
+    return f"{content}{separator}{notice}]"
+
+
+def _read_range(target_file, file_path, max_chars, start_line=None,
+                end_line=None, offset=None, limit=None):
+    """
+    Read a line range or byte window of a file.
+
+    Returns:
+        str: The window content followed by a short position notice
+    """
+    limit = max_chars if limit is None else max(1, min(limit, max_chars))
+
+    if start_line is not None:
+        start_line = max(1, start_line)
+        if end_line is not None and end_line < start_line:
+            return (
+                f'Error: end_line ({end_line}) is before start_line '
+                f'({start_line})'
+            )
+        window = read_window(
+            target_file, start=start_line, end=end_line, limit=limit
+        )
+        content = _decode_window(window["data"], False)
+        if window["start"] >= window["size"] and window["size"]:
+            return (
+                f'Error: "{file_path}" has only {window["total_lines"]} '
+                f'lines'
+            )
+        notice = (
+            f'[File "{file_path}": lines {window["first_line"]}-'
+            f'{window["last_line"]} of {window["total_lines"]}'
+        )
+        wanted_end = end_line or window["total_lines"]
+        if window["last_line"] < min(wanted_end, window["total_lines"]):
+            next_line = window["last_line"] + (
+                1 if window["data"].endswith(b"\n") else 0
+            )
+            notice += (
+                f'; truncated at {limit} bytes, continue with '
+                f'start_line={next_line}'
+            )
+        return _with_notice(content, notice)
+
+    window = read_window(target_file, offset=offset, limit=limit)
+    content = _decode_window(window["data"], window["start"] > 0)
+    notice = (
+        f'[File "{file_path}": bytes {window["start"]}-{window["end"]} of '
+        f'{window["size"]}'
+    )
+    if window["end"] < window["size"]:
+        notice += f'; continue with offset={window["end"]}'
+    return _with_notice(content, notice)
+
+
+@register_tool(
+    get_file_content_schema, read_only=True, cache_path=("file_path", None)
+)
+def get_file_content(working_directory, file_path, start_line=None,
+                     end_line=None, offset=None, limit=None):
     """
     Get the content of a file with security guardrails.
 
+    Without a range the first MAX_CHARS characters are returned. With
+    start_line/end_line or offset/limit only that window of the file is
+    read (via mmap and a cached line index), so reading deep into a large
+    file costs about the size of the window.
+
     Args:
         working_directory: The base working directory that serves as the root
         file_path: The file path to read (relative to working_directory)
+        start_line: Optional first line to read (1-based)
+        end_line: Optional last line to read (inclusive)
+        offset: Optional byte offset to start reading from
+        limit: Optional maximum number of bytes to return
 
     Returns:
         A string with file content or an error message prefixed with "Error:"
@@ -47,36 +223,18 @@ def get_file_content(working_directory, file_path):
         # Load MAX_CHARS from settings
         settings = get_settings()
         MAX_CHARS = settings.get("MAX_CHARS", 10000)
-        # Get absolute path of working_directory
-        working_dir_abs = os.path.abspath(working_directory)
-
-        # Construct target_file by joining the absolute working directory
-        # and file_path
-        target_file = os.path.join(working_dir_abs, file_path)
-
-        # Normalize the path to prevent directory traversal
-        target_file = os.path.normpath(target_file)
-
-        # Validation: Ensure target is inside the permitted directory
-        try:
-            common_path = os.path.commonpath([working_dir_abs, target_file])
-            if common_path != working_dir_abs:
-                return (
-                    f'Error: Cannot read "{file_path}" as it is outside '
-                    f'the permitted working directory'
-                )
-        except ValueError:
-            # This can happen on Windows with different drives
-            return (
-                f'Error: Cannot read "{file_path}" as it is outside '
-                f'the permitted working directory'
-            )
+        target_file, error = check_readable_file(working_directory, file_path)
+        if error:
+            return error
 
-        # Check if target_file is a regular file
-        if not os.path.isfile(target_file):
-            return (
-                f'Error: File not found or is not a regular file: '
-                f'"{file_path}"'
+        # Read only the requested window of the file
+        if any(v is not None for v in (start_line, end_line, offset, limit)):
+            if end_line is not None and start_line is None:
+                start_line = 1
+            return _read_range(
+                target_file, file_path, MAX_CHARS,
+                start_line=start_line, end_line=end_line,
+                offset=offset, limit=limit,
             )
 
         # Read file content with MAX_CHARS limit
@@ -85,12 +243,26 @@ def get_file_content(working_directory, file_path):
             # Check if file was truncated
             remaining = f.read(1)
             if remaining:
+                next_line = content.count("\n") + 1
                 content += (
                     f'\n[...File "{file_path}" truncated at {MAX_CHARS} '
-                    f'characters]'
+                    f'characters; continue with start_line={next_line}]'
                 )
 
         return content
 
     except Exception as e:
         return f"Error: {str(e)}"
+
+
+@register_async("get_file_content")
+async def get_file_content_async(working_directory, file_path, **kwargs):
+    """
+    Async version of get_file_content that runs it in a worker thread.
+
+    Returns:
+        The same string get_file_content returns
+    """
+    return await asyncio.to_thread(
+        get_file_content, working_directory, file_path, **kwargs
+    )
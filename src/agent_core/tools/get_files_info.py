@@ -1,5 +1,24 @@
 import argparse
+import asyncio
 import os
+import sys
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.normpath(os.path.join(current_dir, "..", ".."))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from agent_core.file_walk import as_patterns, walk_entries  # noqa: E402
+from agent_core.providers.prompt_loader import get_settings  # noqa: E402
+from agent_core.sandbox import SandboxError, resolve_path  # noqa: E402
+from agent_core.tool_registry import (  # noqa: E402
+    register_async,
+    register_tool,
+)
+
+# Upper bound for the page_size argument
+MAX_PAGE_SIZE = 1000
 
 
 get_files_info_schema = {
@@ -8,7 +27,9 @@ get_files_info_schema = {
         "name": "get_files_info",
         "description": (
             "Lists files in a specified directory relative to the working "
-            "directory, providing file size and directory status"
+            "directory, providing file size and directory status. Can walk "
+            "subdirectories (max_depth), filter with globs and return large "
+            "trees in pages (cursor)."
         ),
         "parameters": {
             "type": "object",
@@ -20,6 +41,47 @@ get_files_info_schema = {
                         "working directory (default is '.')"
                     ),
                 },
+                "max_depth": {
+                    "type": "integer",
+                    "description": (
+                        "How many directory levels to list (default 1, "
+                        "0 for unlimited)"
+                    ),
+                },
+                "include": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": (
+                        "Only list files whose path matches one of these "
+                        "globs (e.g. '*.py')"
+                    ),
+                },
+                "exclude": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": (
+                        "Skip files and directories whose path matches one "
+                        "of these globs"
+                    ),
+                },
+                "respect_gitignore": {
+                    "type": "boolean",
+                    "description": (
+                        "Skip paths ignored by .gitignore files and the .git "
+                        "directory (default true)"
+                    ),
+                },
+                "cursor": {
+                    "type": "string",
+                    "description": (
+                        "Continue a previous listing after this path (from "
+                        "its 'continue with cursor' notice)"
+                    ),
+                },
+                "page_size": {
+                    "type": "integer",
+                    "description": "Maximum number of entries to return",
+                },
             },
             "required": [],
         },
@@ -27,39 +89,36 @@ get_files_info_schema = {
 }
 
 
-def get_files_info(working_directory, directory="."):
+@register_tool(
+    get_files_info_schema, read_only=True, cache_path=("directory", ".")
+)
+def get_files_info(working_directory, directory=".", max_depth=1,
+                   include=None, exclude=None, respect_gitignore=True,
+                   cursor=None, page_size=None):
     """
     Get information about files in a directory with security guardrails.
 
     Args:
         working_directory: The base working directory that serves as the root
         directory: The directory to list (relative to working_directory)
+        max_depth: Number of directory levels to list (0 for unlimited)
+        include: Glob or list of globs a file must match to be listed
+        exclude: Glob or list of globs to skip
+        respect_gitignore: Skip paths ignored by .gitignore files
+        cursor: Continue a previous listing after this relative path
+        page_size: Maximum number of entries to return (default:
+                   LIST_PAGE_SIZE from settings)
 
     Returns:
         A string with file information or an error message prefixed with
         "Error:"
     """
     try:
-        # Get absolute path of working_directory
-        working_dir_abs = os.path.abspath(working_directory)
-
-        # Construct target_dir by joining the absolute working directory
-        # and directory
-        target_dir = os.path.join(working_dir_abs, directory)
-
-        # Normalize the path to prevent directory traversal
-        target_dir = os.path.normpath(target_dir)
-
-        # Validation: Ensure target is inside the permitted directory
+        # Resolve the path (following symlinks) and make sure it is
+        # inside the permitted directory
         try:
-            common_path = os.path.commonpath([working_dir_abs, target_dir])
-            if common_path != working_dir_abs:
-                return (
-                    f'Error: Cannot list "{directory}" as it is outside '
-                    f'the permitted working directory'
-                )
-        except ValueError:
-            # This can happen on Windows with different drives
+            root, target_dir = resolve_path(working_directory, directory)
+        except SandboxError:
             return (
                 f'Error: Cannot list "{directory}" as it is outside '
                 f'the permitted working directory'
@@ -69,21 +128,33 @@ def get_files_info(working_directory, directory="."):
         if not os.path.isdir(target_dir):
             return f'Error: "{directory}" is not a directory'
 
-        # Iterate through items in the directory
-        results = []
-        items = sorted(os.listdir(target_dir))
+        if page_size is None:
+            page_size = get_settings().get("LIST_PAGE_SIZE", 200)
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
 
-        for item in items:
-            item_path = os.path.join(target_dir, item)
-            try:
-                size = os.path.getsize(item_path)
-                is_dir = os.path.isdir(item_path)
+        # Collect one page of entries, plus one to detect a next page
+        results = []
+        last_path = None
+        entries = walk_entries(
+            target_dir,
+            max_depth=max(0, max_depth),
+            include=as_patterns(include),
+            exclude=as_patterns(exclude),
+            respect_gitignore=respect_gitignore,
+            cursor=cursor,
+            top=root,
+        )
+        for rel_path, stat, is_dir in entries:
+            if len(results) == page_size:
                 results.append(
-                    f"- {item}: file_size={size} bytes, is_dir={is_dir}"
+                    f'[...more entries; continue with cursor="{last_path}"]'
                 )
-            except (OSError, PermissionError):
-                # Skip items we can't access
-                continue
+                break
+            results.append(
+                f"- {rel_path}: file_size={stat.st_size} bytes, "
+                f"is_dir={is_dir}"
+            )
+            last_path = rel_path
 
         # Return formatted string with each item on a new line
         return "\n".join(results) if results else ""
@@ -92,6 +163,19 @@ def get_files_info(working_directory, directory="."):
         return f"Error: {str(e)}"
 
 
+@register_async("get_files_info")
+async def get_files_info_async(working_directory, directory=".", **kwargs):
+    """
+    Async version of get_files_info that runs it in a worker thread.
+
+    Returns:
+        The same string get_files_info returns
+    """
+    return await asyncio.to_thread(
+        get_files_info, working_directory, directory, **kwargs
+    )
+
+
 def main():
     """Command-line interface for get_files_info."""
     parser = argparse.ArgumentParser(
@@ -115,9 +199,51 @@ def main():
             "Defaults to '.'"
         )
     )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=1,
+        help="Number of directory levels to list (0 for unlimited)"
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        help="Only list files matching this glob (repeatable)"
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        help="Skip paths matching this glob (repeatable)"
+    )
+    parser.add_argument(
+        "--no-gitignore",
+        action="store_true",
+        help="Also list paths ignored by .gitignore files"
+    )
+    parser.add_argument(
+        "--cursor",
+        type=str,
+        default=None,
+        help="Continue a previous listing after this path"
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=None,
+        help="Maximum number of entries to return"
+    )
     args = parser.parse_args()
 
-    result = get_files_info(args.working_directory, args.directory)
+    result = get_files_info(
+        args.working_directory,
+        args.directory,
+        max_depth=args.max_depth,
+        include=args.include,
+        exclude=args.exclude,
+        respect_gitignore=not args.no_gitignore,
+        cursor=args.cursor,
+        page_size=args.page_size,
+    )
     print(result)
 
 
@@ -0,0 +1,265 @@
+import asyncio
+import os
+import sys
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.normpath(os.path.join(current_dir, "..", ".."))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from agent_core.file_walk import walk_entries  # noqa: E402
+from agent_core.providers.prompt_loader import get_settings  # noqa: E402
+from agent_core.sandbox import SandboxError, resolve_path  # noqa: E402
+from agent_core.tool_registry import (  # noqa: E402
+    register_async,
+    register_tool,
+)
+from agent_core.tools.get_file_content import (  # noqa: E402
+    check_readable_file,
+)
+
+GLOB_CHARS = "*?["
+
+
+read_files_schema = {
+    "type": "function",
+    "function": {
+        "name": "read_files",
+        "description": (
+            "Reads several files in one call and returns them one after "
+            "another, each under a '==> path <==' header. Give a list of "
+            "paths and/or a glob. The total size is limited and shared "
+            "fairly: small files are returned whole and the rest is split "
+            "among the larger files, which end with a truncation marker."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "paths": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": (
+                        "File paths to read, relative to the working "
+                        "directory"
+                    ),
+                },
+                "pattern": {
+                    "type": "string",
+                    "description": (
+                        "Glob selecting files to read (e.g. "
+                        "'src/agent_core/*.py'); a pattern without '/' "
+                        "matches file names anywhere in the tree"
+                    ),
+                },
+                "max_chars": {
+                    "type": "integer",
+                    "description": (
+                        "Total characters to return across all files "
+                        "(capped at the configured maximum)"
+                    ),
+                },
+            },
+        },
+    },
+}
+
+
+def share_budget(lengths, budget):
+    """
+    Split a character budget fairly across files (water-filling).
+
+    Files shorter than an equal share get everything they need; what they
+    leave over is split evenly among the longer files.
+
+    Args:
+        lengths: Characters available in each file
+        budget: Total characters to hand out
+
+    Returns:
+        list: Characters allotted to each file, in the order of lengths
+    """
+    allotted = [0] * len(lengths)
+    remaining = budget
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    for position, index in enumerate(order):
+        share = remaining // (len(order) - position)
+        allotted[index] = min(lengths[index], share)
+        remaining -= allotted[index]
+    return allotted
+
+
+def _glob_files(working_directory, pattern):
+    """
+    Find the files matching a glob, in sorted order.
+
+    The walk starts at the pattern's leading directories without glob
+    characters, so 'src/agent_core/*.py' doesn't scan the whole tree.
+    Paths ignored by .gitignore are skipped.
+    """
+    parts = pattern.strip("/").split("/")
+    base_parts = []
+    while len(parts) > 1 and not any(c in parts[0] for c in GLOB_CHARS):
+        base_parts.append(parts.pop(0))
+    base = "/".join(base_parts)
+
+    root, base_dir = resolve_path(working_directory, base or ".")
+    if not os.path.isdir(base_dir):
+        return []
+    prefix = f"{base}/" if base else ""
+    return [
+        prefix + rel_path
+        for rel_path, _, is_dir in walk_entries(
+            base_dir, max_depth=0, include=("/".join(parts),), top=root
+        )
+        if not is_dir
+    ]
+
+
+def _select_files(working_directory, paths, pattern, max_files):
+    """
+    Combine the listed paths and the glob matches.
+
+    Returns:
+        tuple: (file paths, number of matches left out, error message)
+    """
+    if not paths and not pattern:
+        return [], 0, "Error: Give a list of paths, a pattern, or both"
+
+    selected = list(dict.fromkeys(paths or ()))
+    if pattern:
+        try:
+            matched = _glob_files(working_directory, pattern)
+        except SandboxError:
+            return [], 0, (
+                f'Error: Cannot read "{pattern}" as it is outside '
+                f'the permitted working directory'
+            )
+        if not matched and not selected:
+            return [], 0, f'Error: No files match "{pattern}"'
+        seen = set(selected)
+        selected += [path for path in matched if path not in seen]
+
+    if len(selected) > max_files:
+        return selected[:max_files], len(selected) - max_files, None
+    return selected, 0, None
+
+
+def _read_head(working_directory, file_path, limit):
+    """
+    Read up to limit characters of a file, plus one to detect truncation.
+
+    Returns:
+        tuple: (text, error) where error is an "Error:" message or None
+    """
+    target_file, error = check_readable_file(working_directory, file_path)
+    if error:
+        return "", error
+    try:
+        with open(target_file, "r", encoding="utf-8") as f:
+            return f.read(limit + 1), None
+    except Exception as e:
+        return "", f"Error: {str(e)}"
+
+
+def _format_files(files, reads, budget, omitted):
+    """Share the budget across the read files and join them."""
+    lengths = [len(text) for text, _ in reads]
+    allotted = share_budget(lengths, budget)
+
+    sections = []
+    for file_path, (text, error), limit in zip(files, reads, allotted):
+        if error:
+            sections.append(f"==> {file_path} <==\n{error}")
+            continue
+        content = text[:limit]
+        if len(text) > limit:
+            separator = "" if not content or content.endswith("\n") else "\n"
+            next_line = content.count("\n") + 1
+            content += (
+                f'{separator}[...File "{file_path}" truncated at {limit} '
+                f'characters; continue with get_file_content '
+                f'start_line={next_line}]'
+            )
+        sections.append(f"==> {file_path} <==\n{content}")
+
+    if omitted:
+        sections.append(
+            f"[...{omitted} more matching files not read; narrow the "
+            f"pattern or read them in another call]"
+        )
+    return "\n\n".join(sections)
+
+
+def _limits(max_chars):
+    settings = get_settings()
+    budget = settings.get("READ_FILES_MAX_CHARS", 40000)
+    if max_chars is not None:
+        budget = max(1, min(max_chars, budget))
+    return budget, settings.get("READ_FILES_MAX_FILES", 20)
+
+
+@register_tool(read_files_schema, read_only=True)
+def read_files(working_directory, paths=None, pattern=None, max_chars=None):
+    """
+    Read several files in one call with a shared character budget.
+
+    Each file goes through the same checks as get_file_content (sandbox,
+    regular file, not binary). Up to the budget is read from every file,
+    then the budget is shared fairly (see share_budget), so a few large
+    files can't crowd out the small ones. At most READ_FILES_MAX_FILES
+    files are read.
+
+    Args:
+        working_directory: The base working directory that serves as the root
+        paths: File paths to read (relative to working_directory)
+        pattern: Glob selecting more files to read
+        max_chars: Total characters to return (default and cap:
+                   READ_FILES_MAX_CHARS from settings)
+
+    Returns:
+        A string with each file under a '==> path <==' header, or an error
+        message prefixed with "Error:"
+    """
+    try:
+        budget, max_files = _limits(max_chars)
+        files, omitted, error = _select_files(
+            working_directory, paths, pattern, max_files
+        )
+        if error:
+            return error
+        reads = [
+            _read_head(working_directory, file_path, budget)
+            for file_path in files
+        ]
+        return _format_files(files, reads, budget, omitted)
+
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+@register_async("read_files")
+async def read_files_async(working_directory, paths=None, pattern=None,
+                           max_chars=None):
+    """
+    Async version of read_files that reads the files concurrently in
+    worker threads.
+
+    Returns:
+        The same string read_files returns
+    """
+    try:
+        budget, max_files = _limits(max_chars)
+        files, omitted, error = await asyncio.to_thread(
+            _select_files, working_directory, paths, pattern, max_files
+        )
+        if error:
+            return error
+        reads = await asyncio.gather(*(
+            asyncio.to_thread(_read_head, working_directory, file_path, budget)
+            for file_path in files
+        ))
+        return _format_files(files, reads, budget, omitted)
+
+    except Exception as e:
+        return f"Error: {str(e)}"
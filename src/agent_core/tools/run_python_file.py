@@ -1,5 +1,22 @@
+import asyncio
 import os
 import subprocess
+import sys
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.normpath(os.path.join(current_dir, "..", ".."))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from agent_core.providers.prompt_loader import get_settings  # noqa: E402
+from agent_core.output_capture import OutputCapture  # noqa: E402
+from agent_core.python_worker import get_fork_server  # noqa: E402
+from agent_core.sandbox import SandboxError, resolve_path  # noqa: E402
+from agent_core.tool_registry import (  # noqa: E402
+    register_async,
+    register_tool,
+)
 
 
 run_python_file_schema = {
@@ -35,6 +52,126 @@ run_python_file_schema = {
 }
 
 
+# Seconds a script may run before it is killed
+TIMEOUT_SECONDS = 30
+
+
+def _resolve_python_file(working_directory, file_path):
+    """
+    Validate a script path against the working directory.
+
+    Args:
+        working_directory: The base working directory that serves as the root
+        file_path: The Python file path to execute (relative to
+                   working_directory)
+
+    Returns:
+        tuple: (working_dir_abs, target_file, error) where error is an
+               "Error:" string or None when the script may be executed
+    """
+    # Resolve the path (following symlinks) and make sure it is inside
+    # the permitted directory
+    try:
+        working_dir_abs, target_file = resolve_path(
+            working_directory, file_path
+        )
+    except SandboxError:
+        return os.path.abspath(working_directory), None, (
+            f'Error: Cannot execute "{file_path}" as it is outside '
+            f'the permitted working directory'
+        )
+
+    # Check if target_file is a regular file
+    if not os.path.isfile(target_file):
+        return working_dir_abs, target_file, (
+            f'Error: "{file_path}" does not exist or is not a regular file'
+        )
+
+    # Check if file ends with .py
+    if not file_path.endswith(".py"):
+        return working_dir_abs, target_file, (
+            f'Error: "{file_path}" is not a Python file'
+        )
+
+    return working_dir_abs, target_file, None
+
+
+def _format_output(returncode, stdout, stderr, killed_after=None):
+    """
+    Format a finished script's exit code and output for the model.
+
+    Args:
+        returncode: The script's exit code
+        stdout: Captured standard output text
+        stderr: Captured standard error text
+        killed_after: Output byte limit the script was killed for, if any
+
+    Returns:
+        str: The formatted result string
+    """
+    output_parts = []
+
+    if killed_after is not None:
+        output_parts.append(
+            f"Process killed after writing more than {killed_after} bytes "
+            f"of output"
+        )
+    # Add return code if non-zero
+    elif returncode != 0:
+        output_parts.append(f"Process exited with code {returncode}")
+
+    # Handle stdout and stderr
+    if not stdout and not stderr:
+        return "No output produced"
+
+    if stdout:
+        output_parts.append(f"STDOUT:\n{stdout}")
+    if stderr:
+        output_parts.append(f"STDERR:\n{stderr}")
+
+    return "\n".join(output_parts)
+
+
+def _decode_output(data):
+    """Decode captured bytes the way subprocess.run(text=True) does."""
+    text = data.decode("utf-8", errors="replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _new_capture():
+    """Create an OutputCapture sized from the settings."""
+    settings = get_settings()
+    return OutputCapture(
+        settings.get("PYTHON_OUTPUT_MAX_BYTES", 32768),
+        settings.get("PYTHON_OUTPUT_KILL_BYTES", 67108864),
+    )
+
+
+def _format_capture(returncode, capture):
+    """Format a script's result from its bounded output capture."""
+    return _format_output(
+        returncode,
+        capture.stdout.text(_decode_output),
+        capture.stderr.text(_decode_output),
+        capture.kill_bytes if capture.killed else None,
+    )
+
+
+def _fork_server():
+    """
+    Get the forkserver when PYTHON_EXECUTION_BACKEND selects it.
+
+    Returns:
+        ForkServer or None: None means scripts run in a fresh subprocess
+    """
+    settings = get_settings()
+    backend = settings.get("PYTHON_EXECUTION_BACKEND", "subprocess")
+    if backend != "forkserver" or not hasattr(os, "fork"):
+        return None
+    return get_fork_server(settings.get("PYTHON_WORKER_PRELOAD") or ())
+
+
+@register_tool(run_python_file_schema)
 def run_python_file(working_directory, file_path, args=None):
     """
     Execute a Python file with security guardrails.
@@ -50,77 +187,124 @@ def run_python_file(working_directory, file_path, args=None):
         "Error:"
     """
     try:
-        # Get absolute path of working_directory
-        working_dir_abs = os.path.abspath(working_directory)
+        working_dir_abs, target_file, error = _resolve_python_file(
+            working_directory, file_path
+        )
+        if error:
+            return error
 
-        # Construct target_file by joining the absolute working directory
-        # and file_path
-        target_file = os.path.join(working_dir_abs, file_path)
+        capture = _new_capture()
+        fork_server = _fork_server()
+        if fork_server is not None:
+            returncode = fork_server.run(
+                target_file, args, working_dir_abs, TIMEOUT_SECONDS, capture
+            )
+            return _format_capture(returncode, capture)
 
-        # Normalize the path to prevent directory traversal
-        target_file = os.path.normpath(target_file)
+        # Construct command list
+        command = ["python", target_file]
+        if args is not None:
+            command.extend(args)
 
-        # Validation: Ensure target is inside the permitted directory
+        # Run the Python file, reading its output as it is produced
+        process = subprocess.Popen(
+            command,
+            cwd=working_dir_abs,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        readers = capture.drain(process.stdout, process.stderr, process.kill)
         try:
-            common_path = os.path.commonpath([working_dir_abs, target_file])
-            if common_path != working_dir_abs:
-                return (
-                    f'Error: Cannot execute "{file_path}" as it is outside '
-                    f'the permitted working directory'
-                )
-        except ValueError:
-            # This can happen on Windows with different drives
-            return (
-                f'Error: Cannot execute "{file_path}" as it is outside '
-                f'the permitted working directory'
-            )
+            returncode = process.wait(timeout=TIMEOUT_SECONDS)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            for reader in readers:
+                reader.join()
 
-        # Check if target_file is a regular file
-        if not os.path.isfile(target_file):
-            return (
-                f'Error: "{file_path}" does not exist or is not a regular file'
-            )
+        return _format_capture(returncode, capture)
+
+    except subprocess.TimeoutExpired:
+        return (
+            f"Error: executing Python file: Process timed out after "
+            f"{TIMEOUT_SECONDS} seconds"
+        )
+    except Exception as e:
+        return f"Error: executing Python file: {e}"
+
+
+@register_async("run_python_file")
+async def run_python_file_async(working_directory, file_path, args=None):
+    """
+    Async version of run_python_file that does not block the event loop.
 
-        # Check if file ends with .py
-        if not file_path.endswith(".py"):
-            return f'Error: "{file_path}" is not a Python file'
+    Cancelling the calling task kills the script. On the forkserver backend
+    the script runs from a worker thread and is only stopped by its timeout.
+
+    Args:
+        working_directory: The base working directory that serves as the root
+        file_path: The Python file path to execute (relative to
+                   working_directory)
+        args: Optional list of command-line arguments to pass to the script
+
+    Returns:
+        A string with execution output or an error message prefixed with
+        "Error:"
+    """
+    try:
+        working_dir_abs, target_file, error = await asyncio.to_thread(
+            _resolve_python_file, working_directory, file_path
+        )
+        if error:
+            return error
+
+        if _fork_server() is not None:
+            # The forkserver client blocks while the script runs
+            return await asyncio.to_thread(
+                run_python_file, working_directory, file_path, args
+            )
 
         # Construct command list
         command = ["python", target_file]
         if args is not None:
             command.extend(args)
 
-        # Run the Python file using subprocess
-        result = subprocess.run(
-            command,
+        process = await asyncio.create_subprocess_exec(
+            *command,
             cwd=working_dir_abs,
-            capture_output=True,
-            text=True,
-            timeout=30
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
+        capture = _new_capture()
 
-        # Format output
-        output_parts = []
-
-        # Add return code if non-zero
-        if result.returncode != 0:
-            output_parts.append(
-                f"Process exited with code {result.returncode}"
+        async def communicate():
+            # Awaited here (not handed to wait_for) so that a cancelled
+            # gather's exception is always retrieved
+            await asyncio.gather(
+                capture.drain_async(
+                    process.stdout, process.stderr, process.kill
+                ),
+                process.wait(),
             )
 
-        # Handle stdout and stderr
-        if not result.stdout and not result.stderr:
-            return "No output produced"
-
-        if result.stdout:
-            output_parts.append(f"STDOUT:\n{result.stdout}")
-        if result.stderr:
-            output_parts.append(f"STDERR:\n{result.stderr}")
+        try:
+            await asyncio.wait_for(communicate(), timeout=TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            return (
+                f"Error: executing Python file: Process timed out after "
+                f"{TIMEOUT_SECONDS} seconds"
+            )
+        finally:
+            # Timed out, or the calling task was cancelled (Ctrl-C in the
+            # REPL, a server client going away): don't leave the script
+            # running on its own
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
 
-        return "\n".join(output_parts)
+        return _format_capture(process.returncode, capture)
 
-    except subprocess.TimeoutExpired:
-        return "Error: executing Python file: Process timed out after 30 seconds"
     except Exception as e:
         return f"Error: executing Python file: {e}"
-
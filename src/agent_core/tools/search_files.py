@@ -0,0 +1,246 @@
+import asyncio
+import os
+import re
+import sys
+
+# Add src directory to Python path for imports
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.normpath(os.path.join(current_dir, "..", ".."))
+if src_dir not in sys.path:
+    sys.path.insert(0, src_dir)
+
+from agent_core.file_walk import as_patterns, matches  # noqa: E402
+from agent_core.search_index import SearchIndex  # noqa: E402
+from agent_core.sandbox import SandboxError, resolve_path  # noqa: E402
+from agent_core.tool_registry import (  # noqa: E402
+    register_async,
+    register_tool,
+)
+
+# Upper bound for the max_results argument
+MAX_RESULTS_LIMIT = 500
+
+# Longest line shown in a result before it is cut
+MAX_LINE_CHARS = 200
+
+# Unsearched (too large) files named in a result
+MAX_SKIPPED_NAMES = 10
+
+
+search_files_schema = {
+    "type": "function",
+    "function": {
+        "name": "search_files",
+        "description": (
+            "Searches the contents of every file in the working directory "
+            "(or a subdirectory) for a string or regex and returns matching "
+            "lines as path:line: text. Use this to find where a symbol or "
+            "string lives instead of reading files one by one."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "pattern": {
+                    "type": "string",
+                    "description": "Text (or regex, see 'regex') to find",
+                },
+                "directory": {
+                    "type": "string",
+                    "description": (
+                        "Directory to search, relative to the working "
+                        "directory (default is '.')"
+                    ),
+                },
+                "include": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": (
+                        "Only search files whose path matches one of these "
+                        "globs (e.g. '*.py')"
+                    ),
+                },
+                "regex": {
+                    "type": "boolean",
+                    "description": "Treat pattern as a regular expression",
+                },
+                "case_sensitive": {
+                    "type": "boolean",
+                    "description": "Match case exactly (default false)",
+                },
+                "context_lines": {
+                    "type": "integer",
+                    "description": (
+                        "Lines of context to show around each match"
+                    ),
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum number of matches (default 50)",
+                },
+            },
+            "required": ["pattern"],
+        },
+    },
+}
+
+
+def _shorten(line):
+    line = line.rstrip("\r\n")
+    if len(line) > MAX_LINE_CHARS:
+        return line[:MAX_LINE_CHARS] + "..."
+    return line
+
+
+def _with_skipped(result, skipped):
+    """Name the files that were too large to search."""
+    if not skipped:
+        return result
+    names = ", ".join(skipped[:MAX_SKIPPED_NAMES])
+    if len(skipped) > MAX_SKIPPED_NAMES:
+        names += f" and {len(skipped) - MAX_SKIPPED_NAMES} more"
+    return (
+        f"{result}\n[Not searched, larger than SEARCH_MAX_FILE_BYTES: "
+        f"{names}; read them with get_file_content]"
+    )
+
+
+@register_tool(search_files_schema, read_only=True)
+def search_files(working_directory, pattern, directory=".", include=None,
+                 regex=False, case_sensitive=False, context_lines=0,
+                 max_results=50):
+    """
+    Search file contents with security guardrails.
+
+    Candidate files come from a persistent trigram index of the working
+    directory (see search_index.SearchIndex), which is refreshed from file
+    mtimes; only candidates are opened and scanned line by line.
+
+    Args:
+        working_directory: The base working directory that serves as the root
+        pattern: Text or regex to search for
+        directory: Directory to search (relative to working_directory)
+        include: Glob or list of globs a file path must match
+        regex: Treat pattern as a regular expression
+        case_sensitive: Match case exactly
+        context_lines: Lines of context shown around each match
+        max_results: Maximum number of matching lines to return
+
+    Returns:
+        A string with one "path:line: text" entry per match, or an error
+        message prefixed with "Error:"
+    """
+    try:
+        # Resolve the path (following symlinks) and make sure it is
+        # inside the permitted directory
+        try:
+            working_dir_abs, target_dir = resolve_path(
+                working_directory, directory
+            )
+        except SandboxError:
+            return (
+                f'Error: Cannot search "{directory}" as it is outside '
+                f'the permitted working directory'
+            )
+
+        if not os.path.isdir(target_dir):
+            return f'Error: "{directory}" is not a directory'
+        if not pattern:
+            return "Error: pattern must not be empty"
+
+        flags = 0 if case_sensitive else re.IGNORECASE
+        try:
+            matcher = re.compile(
+                pattern if regex else re.escape(pattern), flags
+            )
+        except re.error as e:
+            return f"Error: invalid regex: {e}"
+
+        max_results = max(1, min(max_results, MAX_RESULTS_LIMIT))
+        context_lines = max(0, context_lines)
+        include = as_patterns(include)
+        prefix = os.path.relpath(target_dir, working_dir_abs).replace(
+            os.sep, "/"
+        )
+
+        index = SearchIndex(working_dir_abs)
+        try:
+            index.update()
+            # Regexes can't be filtered by trigrams, so scan every file
+            paths = index.candidates(
+                literal=None if regex else pattern, prefix=prefix
+            )
+            skipped = [
+                rel_path for rel_path in index.oversized(prefix=prefix)
+                if not include or matches(rel_path, include)
+            ]
+        finally:
+            index.close()
+
+        results = []
+        match_count = 0
+        for rel_path in paths:
+            if include and not matches(rel_path, include):
+                continue
+            try:
+                # The link may have been changed since it was indexed
+                _, path = resolve_path(working_dir_abs, rel_path)
+                with open(
+                    path, "r", encoding="utf-8", errors="replace"
+                ) as f:
+                    lines = f.readlines()
+            except (OSError, SandboxError):
+                continue
+
+            last_shown = -1
+            for number, line in enumerate(lines):
+                if not matcher.search(line):
+                    continue
+                if match_count == max_results:
+                    results.append(
+                        f"[...results truncated at {max_results} matches]"
+                    )
+                    return _with_skipped("\n".join(results), skipped)
+                match_count += 1
+
+                first = max(number - context_lines, last_shown + 1)
+                if context_lines and results and first > last_shown + 1:
+                    results.append("--")
+                for context in range(first, number):
+                    results.append(
+                        f"{rel_path}-{context + 1}- "
+                        f"{_shorten(lines[context])}"
+                    )
+                results.append(f"{rel_path}:{number + 1}: {_shorten(line)}")
+                last_shown = number
+                for context in range(
+                    number + 1, min(number + 1 + context_lines, len(lines))
+                ):
+                    if matcher.search(lines[context]):
+                        break
+                    results.append(
+                        f"{rel_path}-{context + 1}- "
+                        f"{_shorten(lines[context])}"
+                    )
+                    last_shown = context
+
+        if not results:
+            return _with_skipped(
+                f'No matches found for "{pattern}"', skipped
+            )
+        return _with_skipped("\n".join(results), skipped)
+
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+@register_async("search_files")
+async def search_files_async(working_directory, pattern, **kwargs):
+    """
+    Async version of search_files that runs it in a worker thread.
+
+    Returns:
+        The same string search_files returns
+    """
+    return await asyncio.to_thread(
+        search_files, working_directory, pattern, **kwargs
+    )
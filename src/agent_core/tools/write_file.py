@@ -1,5 +1,9 @@
+import asyncio
 import os
 
+from agent_core.sandbox import SandboxError, resolve_path
+from agent_core.tool_registry import register_async, register_tool
+
 
 write_file_schema = {
     "type": "function",
@@ -26,6 +30,7 @@ write_file_schema = {
 }
 
 
+@register_tool(write_file_schema, writes=True)
 def write_file(working_directory, file_path, content):
     """
     Write content to a file with security guardrails.
@@ -39,26 +44,11 @@ def write_file(working_directory, file_path, content):
         A success message or an error message prefixed with "Error:"
     """
     try:
-        # Get absolute path of working_directory
-        working_dir_abs = os.path.abspath(working_directory)
-
-        # Construct target_path by joining the absolute working directory
-        # and file_path
-        target_path = os.path.join(working_dir_abs, file_path)
-
-        # Normalize the path to prevent directory traversal
-        target_path = os.path.normpath(target_path)
-
-        # Validation: Ensure target is inside the permitted directory
+        # Resolve the path (following symlinks) and make sure it is
+        # inside the permitted directory
         try:
-            common_path = os.path.commonpath([working_dir_abs, target_path])
-            if common_path != working_dir_abs:
-                return (
-                    f'Error: Cannot write to "{file_path}" as it is outside '
-                    f'the permitted working directory'
-                )
-        except ValueError:
-            # This can happen on Windows with different drives
+            _, target_path = resolve_path(working_directory, file_path)
+        except SandboxError:
             return (
                 f'Error: Cannot write to "{file_path}" as it is outside '
                 f'the permitted working directory'
@@ -88,3 +78,15 @@ def write_file(working_directory, file_path, content):
     except Exception as e:
         return f"Error: {str(e)}"
 
+
+@register_async("write_file")
+async def write_file_async(working_directory, file_path, content):
+    """
+    Async version of write_file that runs it in a worker thread.
+
+    Returns:
+        The same string write_file returns
+    """
+    return await asyncio.to_thread(
+        write_file, working_directory, file_path, content
+    )
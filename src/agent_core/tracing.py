@@ -0,0 +1,239 @@
+import argparse
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Spans buffered in memory before they are appended to the trace file
+TRACE_BUFFER_SPANS = 64
+
+# Session and iteration that new spans belong to; asyncio tasks and
+# to_thread() calls inherit them from the code that started them
+_session_id = ContextVar("trace_session_id", default=None)
+_iteration = ContextVar("trace_iteration", default=None)
+
+
+class Tracer:
+    """
+    Buffered JSONL writer for timing spans.
+
+    Spans are kept in memory and appended to the trace file in batches of
+    buffer_size lines (and on flush()), so tracing adds no file I/O to
+    most LLM calls and tool dispatches.
+    """
+
+    def __init__(self, path, buffer_size=TRACE_BUFFER_SPANS):
+        self.path = path
+        self.buffer_size = buffer_size
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def record(self, span):
+        """Add a finished span, writing the buffer out once it is full."""
+        line = json.dumps(span, ensure_ascii=False)
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.buffer_size:
+                self._write_locked()
+
+    def flush(self):
+        """Append every buffered span to the trace file."""
+        with self._lock:
+            self._write_locked()
+
+    def _write_locked(self):
+        if not self._buffer:
+            return
+        parent_dir = os.path.dirname(self.path)
+        if parent_dir:
+            os.makedirs(parent_dir, exist_ok=True)
+        data = "\n".join(self._buffer) + "\n"
+        self._buffer = []
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(data)
+
+
+_tracer = None
+
+
+def configure_tracing(path):
+    """
+    Start writing spans to a JSONL file, or stop tracing.
+
+    Args:
+        path: Trace file to append to (None or "" disables tracing)
+
+    Returns:
+        Tracer or None: The active tracer
+    """
+    global _tracer
+    if _tracer is not None:
+        _tracer.flush()
+    _tracer = Tracer(path) if path else None
+    return _tracer
+
+
+def flush_tracing():
+    """Write out any spans still buffered by the active tracer."""
+    if _tracer is not None:
+        _tracer.flush()
+
+
+atexit.register(flush_tracing)
+
+
+def set_trace_session(session_id):
+    """Attribute spans started from the current context to a session."""
+    _session_id.set(session_id)
+
+
+def set_trace_iteration(iteration):
+    """Attribute spans started from the current context to an iteration."""
+    _iteration.set(iteration)
+
+
+@contextmanager
+def span(kind, **fields):
+    """
+    Time a block of code and record it as a span.
+
+    The yielded dict can be filled with extra fields (tokens, result size,
+    error flag) before the block ends. An exception marks the span as an
+    error and is re-raised. Does nothing when tracing is not configured.
+
+    Args:
+        kind: Span type, such as "llm", "tool" or "iteration"
+        **fields: Fields recorded with the span
+
+    Yields:
+        dict: The span record
+    """
+    tracer = _tracer
+    record = {
+        "kind": kind,
+        "session": _session_id.get(),
+        "iteration": _iteration.get(),
+        **fields,
+    }
+    if tracer is None:
+        yield record
+        return
+
+    start_time = time.time()
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException as e:
+        record["error"] = True
+        record.setdefault("error_type", type(e).__name__)
+        raise
+    finally:
+        record["start"] = round(start_time, 6)
+        record["duration_ms"] = round(
+            (time.perf_counter() - start) * 1000, 3
+        )
+        record.setdefault("error", False)
+        tracer.record(record)
+
+
+def read_spans(paths):
+    """
+    Read spans from one or more JSONL trace files.
+
+    Lines that are not valid JSON (for example a partly written last line)
+    are skipped.
+
+    Yields:
+        dict: One span per line
+    """
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(spans):
+    """
+    Aggregate span durations per LLM call, tool and iteration.
+
+    Args:
+        spans: Iterable of span dicts
+
+    Returns:
+        list: One dict per group with 'kind', 'name', 'count', 'errors',
+              'p50_ms', 'p95_ms', 'max_ms' and 'total_ms', slowest total
+              first
+    """
+    groups = {}
+    for record in spans:
+        kind = record.get("kind")
+        name = record.get("tool") or record.get("model") or ""
+        group = groups.setdefault(
+            (kind, name), {"durations": [], "errors": 0}
+        )
+        group["durations"].append(record.get("duration_ms", 0.0))
+        if record.get("error"):
+            group["errors"] += 1
+
+    rows = []
+    for (kind, name), group in groups.items():
+        durations = sorted(group["durations"])
+        rows.append({
+            "kind": kind,
+            "name": name,
+            "count": len(durations),
+            "errors": group["errors"],
+            "p50_ms": percentile(durations, 0.50),
+            "p95_ms": percentile(durations, 0.95),
+            "max_ms": durations[-1],
+            "total_ms": round(sum(durations), 3),
+        })
+    rows.sort(key=lambda row: row["total_ms"], reverse=True)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Summarize agent trace files (p50/p95 per span type)"
+    )
+    parser.add_argument("traces", nargs="+", help="JSONL trace files")
+    parser.add_argument(
+        "--json", action="store_true", help="Print the summary as JSON"
+    )
+    args = parser.parse_args()
+
+    rows = summarize(read_spans(args.traces))
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(
+        f"{'kind':<10} {'name':<20} {'count':>7} {'errors':>6} "
+        f"{'p50 ms':>10} {'p95 ms':>10} {'max ms':>10} {'total ms':>12}"
+    )
+    for row in rows:
+        print(
+            f"{row['kind'] or '':<10} {row['name']:<20} {row['count']:>7} "
+            f"{row['errors']:>6} {row['p50_ms']:>10.1f} "
+            f"{row['p95_ms']:>10.1f} {row['max_ms']:>10.1f} "
+            f"{row['total_ms']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
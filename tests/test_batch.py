@@ -0,0 +1,176 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+from langchain_core.messages import HumanMessage
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.batch import read_requests, run_batch  # noqa: E402
+from benchmarks.scripted_model import (  # noqa: E402
+    ScriptedAgentModel,
+    scripted_response,
+)
+
+INPUT_LINES = [
+    {"id": "q1", "query": "slow one"},
+    {"id": "q2", "query": "two"},
+    "",
+    {"request_id": "q3", "prompt": "three"},
+    {"id": "q4", "body": "four"},
+    {"id": "q5"},
+    "not json",
+    {"id": "q6", "query": "six"},
+]
+
+
+class AnsweringModel:
+    """
+    Stub model that answers each query directly after a short delay.
+
+    It records how many calls were in flight at once, and how many result
+    lines the output file had when each call started.
+    """
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lines_written = []
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        with open(self.output_path, encoding="utf-8") as f:
+            self.lines_written.append(len(f.readlines()))
+        query = next(
+            m.content for m in messages if isinstance(m, HumanMessage)
+        )
+        try:
+            await asyncio.sleep(0.3 if query.startswith("slow") else 0.05)
+        finally:
+            self.in_flight -= 1
+        return scripted_response(
+            content=f"Answer to {query}", prompt_tokens=10,
+            completion_tokens=1,
+        )
+
+
+def batch(input_path, output_path, model):
+    agent_model = ScriptedAgentModel([])
+    agent_model.llm_with_tools = model
+    with contextlib.redirect_stderr(io.StringIO()):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return asyncio.run(run_batch(
+                input_path, output_path, agent_model, "You are a test.",
+                concurrency=2,
+            ))
+
+
+def main():
+    all_passed = True
+    work_dir = tempfile.mkdtemp()
+    input_path = os.path.join(work_dir, "requests.jsonl")
+    output_path = os.path.join(work_dir, "results.jsonl")
+    with open(input_path, "w", encoding="utf-8") as f:
+        for line in INPUT_LINES:
+            f.write((json.dumps(line) if line else "") + "\n")
+
+    # Test 1: Ids and queries are read from any of the supported keys
+    print("Test 1: read_requests")
+    records = list(read_requests(input_path))
+    expected = [
+        ("q1", "slow one"), ("q2", "two"), ("q3", "three"), ("q4", "four"),
+        ("q5", None), ("line_7", None), ("q6", "six"),
+    ]
+    if records == expected:
+        print(f"  ✓ {len(records)} records, blank line skipped")
+    else:
+        print(f"  ✗ Got {records}")
+        all_passed = False
+    print()
+
+    model = AnsweringModel(output_path)
+    counts = batch(input_path, output_path, model)
+    with open(output_path, encoding="utf-8") as f:
+        results = [json.loads(line) for line in f]
+
+    # Test 2: One result per record, failures included
+    print("Test 2: Every record gets a result line")
+    by_id = {result["id"]: result for result in results}
+    if (counts == {"completed": 5, "failed": 2, "skipped": 0}
+            and len(results) == 7
+            and by_id["q3"]["response"] == "Answer to three"
+            and by_id["q5"]["error"] == "ValueError: record has no query"
+            and by_id["line_7"]["error"] is not None):
+        print(f"  ✓ {counts}")
+    else:
+        print(f"  ✗ Counts {counts}, results {results}")
+        all_passed = False
+    print()
+
+    # Test 3: No more than `concurrency` sessions at once
+    print("Test 3: Concurrency is capped at 2")
+    if model.max_in_flight == 2:
+        print("  ✓ At most 2 model calls in flight")
+    else:
+        print(f"  ✗ {model.max_in_flight} model calls in flight")
+        all_passed = False
+    print()
+
+    # Test 4: Results are written as sessions finish, not at the end
+    print("Test 4: Results are written incrementally")
+    # q1 is slow, so later sessions start after earlier results are written
+    if (model.lines_written[0] == 0 and model.lines_written[-1] > 0
+            and results[-1]["id"] == "q1"):
+        print(f"  ✓ Lines on disk at each model call: "
+              f"{model.lines_written}")
+    else:
+        print(f"  ✗ Lines on disk at each model call: "
+              f"{model.lines_written}, order "
+              f"{[result['id'] for result in results]}")
+        all_passed = False
+    print()
+
+    # Test 5: A rerun skips the ids that already succeeded
+    print("Test 5: Rerun skips completed ids")
+    rerun_model = AnsweringModel(output_path)
+    counts = batch(input_path, output_path, rerun_model)
+    with open(output_path, encoding="utf-8") as f:
+        rerun_ids = [json.loads(line)["id"] for line in f][len(results):]
+    if (counts == {"completed": 0, "failed": 2, "skipped": 5}
+            and rerun_model.calls == 0
+            and sorted(rerun_ids) == ["line_7", "q5"]):
+        print(f"  ✓ {counts}, only the failed records were retried")
+    else:
+        print(f"  ✗ Counts {counts}, {rerun_model.calls} model calls, "
+              f"new results {rerun_ids}")
+        all_passed = False
+    print()
+
+    for path in (input_path, output_path):
+        os.remove(path)
+    os.rmdir(work_dir)
+
+    if all_passed:
+        print("All tests passed!")
+    else:
+        print("Some tests failed!")
+    return all_passed
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
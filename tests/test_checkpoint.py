@@ -0,0 +1,123 @@
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import uuid
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.checkpoint import (  # noqa: E402
+    CheckpointError,
+    SessionCheckpoint,
+)
+from agent_core.engine import resume_session, run_session  # noqa: E402
+from benchmarks.scripted_model import (  # noqa: E402
+    ScriptedAgentModel,
+    scripted_response,
+    tool_call,
+)
+
+
+def read_readme(turn):
+    return scripted_response(
+        tool_calls=[tool_call(
+            "get_file_content",
+            {"file_path": "README.md", "limit": 20},
+            f"call_{turn}",
+        )],
+        prompt_tokens=100,
+        completion_tokens=10,
+    )
+
+
+SCRIPT = [
+    read_readme(0),
+    read_readme(1),
+    read_readme(2),
+    scripted_response(content="Done.", prompt_tokens=100,
+                      completion_tokens=5),
+]
+
+
+def run(coroutine):
+    # Tools print every call; keep the test output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(coroutine)
+
+
+def main():
+    session_id = f"test_{uuid.uuid4().hex[:8]}"
+    path = None
+    try:
+        # Test 1: A session that runs out of iterations is checkpointed
+        print("Test 1: Session stopped after 2 of 4 iterations")
+        result = run(run_session(
+            ScriptedAgentModel(SCRIPT), "You are a test.", "Read it.",
+            max_iterations=2, session_id=session_id, checkpoint=True,
+        ))
+        checkpoint, messages, info = SessionCheckpoint.load(session_id)
+        path = checkpoint.path
+        print(f"Checkpoint: {checkpoint.iterations} iterations, "
+              f"{len(messages)} messages, "
+              f"{checkpoint.prompt_tokens} prompt tokens")
+        if (result["response"] is None and checkpoint.iterations == 2 and
+                len(messages) == 6 and checkpoint.prompt_tokens == 200 and
+                info["prompt"] == "Read it."):
+            print("✓ Messages, usage and iteration count saved")
+        else:
+            print("✗ Checkpoint does not match the session")
+        print()
+
+        # Test 2: A partial last line (crash mid-write) is ignored
+        print("Test 2: Checkpoint with a torn last line")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"type": "iteration", "iter')
+        _, torn_messages, _ = SessionCheckpoint.load(session_id)
+        if len(torn_messages) == len(messages):
+            print("✓ Partial line dropped")
+        else:
+            print("✗ Partial line should be dropped")
+        print()
+
+        # Test 3: Resuming continues where the session stopped, even from a
+        # checkpoint whose last line was only partly written
+        print("Test 3: Resuming the session from a torn checkpoint")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"type": "iteration", "iteration": 3, "mess')
+        result = run(resume_session(
+            ScriptedAgentModel(SCRIPT[2:]), session_id, max_iterations=5,
+        ))
+        print(f"Response: {result['response']!r} after "
+              f"{result['iterations']} iterations, "
+              f"usage {result['usage']}")
+        if (result["response"] == "Done." and result["iterations"] == 4 and
+                result["usage"]["prompt_tokens"] == 400 and
+                len(result["messages"]) == 9):
+            print("✓ Session finished with the earlier usage included")
+        else:
+            print("✗ Resumed session should finish after 2 more iterations")
+        print()
+
+        # Test 4: A finished session's checkpoint is deleted
+        print("Test 4: Resuming a finished session")
+        try:
+            run(resume_session(ScriptedAgentModel([]), session_id))
+            print("✗ Resuming a finished session should fail")
+        except CheckpointError as e:
+            print(f"Error: {e}")
+            if os.path.exists(path):
+                print("✗ Checkpoint of the finished session was kept")
+            else:
+                print("✓ Checkpoint deleted, finished session rejected")
+        print()
+    finally:
+        if path and os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
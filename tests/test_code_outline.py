@@ -0,0 +1,176 @@
+import os
+import sys
+import tempfile
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+import agent_core.tools.get_code_outline as outline_tool  # noqa: E402
+from agent_core.code_outline import OutlineCache  # noqa: E402
+from agent_core.tools.get_code_outline import get_code_outline  # noqa: E402
+
+MODULE = '''"""Shapes and their areas."""
+import math
+
+
+class Shape:
+    """Base class of all shapes."""
+
+    def area(self) -> float:
+        raise NotImplementedError
+
+
+class Circle(Shape):
+    def __init__(self, radius):
+        self.radius = radius
+
+    @property
+    def area(self):
+        """Area of the circle."""
+        def square(x):
+            return x * x
+        return math.pi * square(self.radius)
+
+
+async def load(path, *, strict=False):
+    return path
+'''
+
+
+def main():
+    with tempfile.TemporaryDirectory() as working_dir:
+        os.makedirs(os.path.join(working_dir, "pkg"))
+        module_path = os.path.join(working_dir, "pkg", "shapes.py")
+        with open(module_path, "w") as f:
+            f.write(MODULE)
+        with open(os.path.join(working_dir, "pkg", "broken.py"), "w") as f:
+            f.write("def broken(:\n")
+
+        # Test 1: Classes, methods and functions with line ranges
+        print("Test 1: Outlining pkg/shapes.py")
+        result = get_code_outline(working_dir, "pkg/shapes.py")
+        print(f"Result:\n{result}")
+        expected = [
+            "# Shapes and their areas.",
+            "class Shape  L5-9  # Base class of all shapes.",
+            "    def area(self) -> float  L8-9",
+            "class Circle(Shape)  L12-21",
+            "    def area(self)  L16-21  # Area of the circle.",
+            "async def load(path, *, strict=False)  L24-25",
+        ]
+        missing = [line for line in expected if line not in result]
+        if not missing and "square" not in result:
+            print("✓ Outline has signatures, docstrings and line ranges")
+        else:
+            print(f"✗ Missing lines: {missing}")
+        print()
+
+        # Test 2: A directory outlines every Python file
+        print("Test 2: Outlining the pkg directory")
+        result = get_code_outline(working_dir, "pkg")
+        print(f"Result:\n{result}")
+        if ("==> pkg/shapes.py (25 lines) <==" in result
+                and "==> pkg/broken.py" in result
+                and "Error: cannot parse (line 1)" in result):
+            print("✓ Every file listed, unparsable file reported")
+        else:
+            print("✗ Directory outline FAILED")
+        print()
+
+        # Test 3: Outlines are reused until the file changes
+        print("Test 3: Cache hits and invalidation by mtime")
+        cache = OutlineCache(os.path.join(working_dir, "outline.sqlite"))
+        try:
+            cache.get(module_path)
+            cache.get(module_path)
+            first = (cache.hits, cache.misses)
+            with open(module_path, "a") as f:
+                f.write("\n\ndef added():\n    pass\n")
+            outline = cache.get(module_path)
+            names = [symbol["name"] for symbol in outline["symbols"]]
+        finally:
+            cache.close()
+        print(f"Result: hits/misses {first}, then {names}")
+        if first == (1, 1) and "added" in names and cache.misses == 2:
+            print("✓ Unchanged file served from cache, changed file parsed")
+        else:
+            print("✗ Cache did not behave as expected")
+        print()
+
+        # Test 4: A single outline longer than OUTLINE_MAX_CHARS is cut
+        print("Test 4: Outlining pkg/shapes.py with OUTLINE_MAX_CHARS=120")
+        get_settings = outline_tool.get_settings
+        outline_tool.get_settings = lambda: {"OUTLINE_MAX_CHARS": 120}
+        try:
+            result = get_code_outline(working_dir, "pkg/shapes.py")
+        finally:
+            outline_tool.get_settings = get_settings
+        print(f"Result:\n{result}")
+        body = result.rsplit("\n", 1)[0]
+        if (len(body) <= 120 and "class Shape  L5-9" in body
+                and "Circle" not in body
+                and "(0 of 1 files complete)" in result):
+            print("✓ Outline cut at a line boundary with a notice")
+        else:
+            print("✗ Outline should be cut to OUTLINE_MAX_CHARS")
+        print()
+
+        # Test 5: Outlines of deleted files are pruned
+        print("Test 5: Pruning the outline of a deleted file")
+        pkg_dir = os.path.join(working_dir, "pkg")
+        extra_path = os.path.join(pkg_dir, "extra.py")
+        with open(extra_path, "w") as f:
+            f.write("def extra():\n    pass\n")
+        cache = OutlineCache(os.path.join(working_dir, "prune.sqlite"))
+        try:
+            cache.get(module_path)
+            cache.get(extra_path)
+            os.remove(extra_path)
+            removed = cache.prune(pkg_dir, {module_path})
+            paths = [row[0] for row in cache._conn.execute(
+                "SELECT path FROM outlines"
+            )]
+        finally:
+            cache.close()
+        print(f"Result: removed {removed}, left {paths}")
+        if removed == 1 and paths == [module_path]:
+            print("✓ Only the deleted file's outline was dropped")
+        else:
+            print("✗ Prune did not behave as expected")
+        print()
+
+        # Test 6: Symlinked modules that lead outside are skipped
+        print("Test 6: Security check - a link to a module outside")
+        with tempfile.TemporaryDirectory() as outside_dir:
+            secret = os.path.join(outside_dir, "secret.py")
+            with open(secret, "w") as f:
+                f.write('def leaked_secret_fn():\n    """secret doc"""\n')
+            os.symlink(secret, os.path.join(working_dir, "pkg", "evil.py"))
+            os.symlink(
+                "shapes.py", os.path.join(working_dir, "pkg", "alias.py")
+            )
+            result = get_code_outline(working_dir, "pkg")
+            direct = get_code_outline(working_dir, "pkg/evil.py")
+        print(f"Result:\n{result}")
+        if ("leaked_secret_fn" not in result and "evil.py" not in result
+                and "==> pkg/alias.py" in result
+                and direct.startswith("Error:")):
+            print("✓ Outside link skipped, inner link outlined")
+        else:
+            print("✗ Security check FAILED - outside module was outlined")
+        print()
+
+        # Test 7: Security check - outlining outside the working directory
+        print("Test 7: Security check - outlining /etc")
+        result = get_code_outline(working_dir, "/etc")
+        print(f"Result: {result}")
+        if result.startswith("Error:") and "outside" in result:
+            print("✓ Security check passed - outline was blocked")
+        else:
+            print("✗ Security check FAILED")
+
+
+if __name__ == "__main__":
+    main()
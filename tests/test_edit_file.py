@@ -0,0 +1,104 @@
+import os
+import sys
+import tempfile
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.tools.edit_file import edit_file  # noqa: E402
+
+ORIGINAL = (
+    "def add(a, b):\n"
+    "    return a + b\n"
+    "\n"
+    "def sub(a, b):\n"
+    "    return a + b\n"
+)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as working_dir:
+        path = os.path.join(working_dir, "ops.py")
+        with open(path, "w") as f:
+            f.write(ORIGINAL)
+
+        # Test 1: A unique search/replace block is applied
+        print("Test 1: Fixing sub() with a search/replace block")
+        result = edit_file(working_dir, "ops.py", edits=[{
+            "search": "def sub(a, b):\n    return a + b\n",
+            "replace": "def sub(a, b):\n    return a - b\n",
+        }])
+        print(f"Result:\n{result}")
+        with open(path) as f:
+            content = f.read()
+        if result.startswith("Successfully") and "return a - b" in content:
+            print("✓ Edit applied")
+        else:
+            print("✗ Edit NOT applied")
+        print()
+
+        # Test 2: An ambiguous anchor is rejected and nothing is written
+        print("Test 2: Search block that matches twice")
+        result = edit_file(working_dir, "ops.py", edits=[{
+            "search": "(a, b):", "replace": "(x, y):",
+        }])
+        print(f"Result: {result}")
+        with open(path) as f:
+            unchanged = f.read() == content
+        if result.startswith("Error:") and "2 places" in result and unchanged:
+            print("✓ Ambiguous edit rejected, file untouched")
+        else:
+            print("✗ Ambiguous edit should be rejected")
+        print()
+
+        # Test 3: A unified diff is applied even if its line numbers drifted
+        print("Test 3: Applying a unified diff with an off-by-one header")
+        diff = (
+            "--- a/ops.py\n"
+            "+++ b/ops.py\n"
+            "@@ -2,2 +2,3 @@\n"
+            " def add(a, b):\n"
+            "+    \"\"\"Add two numbers.\"\"\"\n"
+            "     return a + b\n"
+        )
+        result = edit_file(working_dir, "ops.py", diff=diff)
+        print(f"Result:\n{result}")
+        with open(path) as f:
+            lines = f.read().splitlines()
+        if result.startswith("Successfully") and lines[1].strip() == (
+            '"""Add two numbers."""'
+        ):
+            print("✓ Diff applied")
+        else:
+            print("✗ Diff NOT applied")
+        print()
+
+        # Test 4: Security check - editing outside the working directory
+        print("Test 4: Security check - editing ../ops.py")
+        result = edit_file(working_dir, "../ops.py", edits=[])
+        print(f"Result: {result}")
+        if result.startswith("Error:") and "outside" in result:
+            print("✓ Security check passed - edit was blocked")
+        else:
+            print("✗ Security check FAILED - edit should be blocked")
+        print()
+
+        # Test 5: Overlapping matches make a search block ambiguous
+        print("Test 5: Search block 'aa' in 'aaa' (overlapping matches)")
+        with open(os.path.join(working_dir, "a.txt"), "w") as f:
+            f.write("aaa\n")
+        result = edit_file(working_dir, "a.txt", edits=[{
+            "search": "aa", "replace": "b",
+        }])
+        print(f"Result: {result}")
+        if result.startswith("Error:") and "2 places" in result:
+            print("✓ Overlapping matches counted, edit rejected")
+        else:
+            print("✗ Overlapping matches should make the edit ambiguous")
+        print()
+
+
+if __name__ == "__main__":
+    main()
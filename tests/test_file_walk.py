@@ -0,0 +1,163 @@
+import os
+import sys
+import tempfile
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.file_walk import walk_entries  # noqa: E402
+from agent_core.tools.get_files_info import get_files_info  # noqa: E402
+
+
+def write(working_dir, rel_path, text=""):
+    path = os.path.join(working_dir, *rel_path.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def listed(result):
+    """Get the paths of a get_files_info result."""
+    return [
+        line[2:].split(":", 1)[0]
+        for line in result.splitlines() if line.startswith("- ")
+    ]
+
+
+def check(name, ok, detail):
+    print(f"{'✓' if ok else '✗'} {name}")
+    if not ok:
+        print(f"  Got: {detail}")
+    return ok
+
+
+def main():
+    all_passed = True
+    with tempfile.TemporaryDirectory() as working_dir:
+        write(working_dir, ".gitignore", "__pycache__/\n/build\n*.log\n")
+        write(working_dir, "main.py")
+        write(working_dir, "debug.log")
+        write(working_dir, "build/out.txt")
+        write(working_dir, "sub/.gitignore", "secret.txt\n!keep.log\n")
+        write(working_dir, "sub/a.py")
+        write(working_dir, "sub/secret.txt")
+        write(working_dir, "sub/keep.log")
+        write(working_dir, "sub/other.log")
+        write(working_dir, "sub/__pycache__/a.pyc")
+        write(working_dir, "sub/build/kept.txt")
+        write(working_dir, "sub/deep/b.py")
+        write(working_dir, "sub/deep/deeper/c.py")
+
+        # Test 1: .gitignore rules of the listed directory and below
+        print("Test 1: Listing the whole tree")
+        paths = listed(get_files_info(working_dir, ".", max_depth=0))
+        all_passed &= check(
+            "Ignored files and directories are skipped",
+            "debug.log" not in paths and "build" not in paths
+            and "sub/secret.txt" not in paths
+            and "sub/__pycache__" not in paths
+            and "sub/other.log" not in paths
+            and "sub/keep.log" in paths,
+            paths,
+        )
+        all_passed &= check(
+            "Anchored '/build' only ignores the top-level build",
+            "sub/build/kept.txt" in paths,
+            paths,
+        )
+        print()
+
+        # Test 2: Rules from .gitignore files above the listed directory
+        print("Test 2: Listing sub (rules from the parent .gitignore)")
+        paths = listed(get_files_info(working_dir, "sub", max_depth=0))
+        all_passed &= check(
+            "Parent rules apply relative to their own folder",
+            "__pycache__" not in paths and "other.log" not in paths
+            and "keep.log" in paths and "secret.txt" not in paths
+            and "build/kept.txt" in paths,
+            paths,
+        )
+        paths = listed(get_files_info(
+            working_dir, "sub", max_depth=0, respect_gitignore=False
+        ))
+        all_passed &= check(
+            "respect_gitignore=False lists everything",
+            "__pycache__/a.pyc" in paths and "secret.txt" in paths,
+            paths,
+        )
+        print()
+
+        # Test 3: max_depth
+        print("Test 3: max_depth")
+        paths = listed(get_files_info(working_dir, "sub", max_depth=1))
+        all_passed &= check(
+            "max_depth=1 lists only direct children",
+            "deep" in paths and "deep/b.py" not in paths,
+            paths,
+        )
+        paths = listed(get_files_info(working_dir, "sub", max_depth=2))
+        all_passed &= check(
+            "max_depth=2 lists one more level",
+            "deep/b.py" in paths and "deep/deeper/c.py" not in paths,
+            paths,
+        )
+        print()
+
+        # Test 4: include and exclude globs
+        print("Test 4: include and exclude globs")
+        paths = listed(get_files_info(
+            working_dir, "sub", max_depth=0, include=["*.py"]
+        ))
+        all_passed &= check(
+            "include lists only matching files",
+            paths == ["a.py", "deep/b.py", "deep/deeper/c.py"],
+            paths,
+        )
+        paths = listed(get_files_info(
+            working_dir, "sub", max_depth=0, include="*.py", exclude="deep"
+        ))
+        all_passed &= check(
+            "exclude skips a whole directory",
+            paths == ["a.py"],
+            paths,
+        )
+        print()
+
+        # Test 5: Cursor paging returns every entry exactly once
+        print("Test 5: Paging with page_size=2")
+        expected = [
+            rel_path for rel_path, _, _ in walk_entries(
+                os.path.join(working_dir, "sub"), max_depth=0,
+                top=working_dir,
+            )
+        ]
+        pages = []
+        cursor = None
+        while True:
+            result = get_files_info(
+                working_dir, "sub", max_depth=0, page_size=2, cursor=cursor
+            )
+            pages.append(listed(result))
+            if "cursor=" not in result:
+                break
+            cursor = result.rsplit('cursor="', 1)[1].split('"', 1)[0]
+        paged = [path for page in pages for path in page]
+        all_passed &= check(
+            f"{len(pages)} pages hold the full listing in order",
+            paged == expected and all(len(page) <= 2 for page in pages),
+            pages,
+        )
+        print()
+
+    if all_passed:
+        print("All tests passed!")
+    else:
+        print("Some tests failed!")
+    return all_passed
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
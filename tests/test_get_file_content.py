@@ -1,5 +1,6 @@
 import os
 import sys
+import tempfile
 
 # Add root and src directories to Python path
 root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -59,6 +60,81 @@ def main():
         print("✗ Error handling FAILED - should return error")
     print()
 
+    with tempfile.TemporaryDirectory() as working_dir:
+        with open(os.path.join(working_dir, "lines.txt"), "w") as f:
+            f.write("".join(f"line {i}\n" for i in range(1, 11)))
+        with open(os.path.join(working_dir, "utf8.txt"), "wb") as f:
+            f.write("aéb\n".encode("utf-8"))
+
+        # Test 6: A line range returns just those lines
+        print("Test 6: Reading lines.txt with start_line=3, end_line=5")
+        result = get_file_content(
+            working_dir, "lines.txt", start_line=3, end_line=5
+        )
+        print(f"Result: {result!r}")
+        if result == (
+            'line 3\nline 4\nline 5\n[File "lines.txt": lines 3-5 of 10]'
+        ):
+            print("✓ Line range read")
+        else:
+            print("✗ Line range FAILED")
+        print()
+
+        # Test 7: Ranges past the end or backwards are errors
+        print("Test 7: start_line=20 and end_line before start_line")
+        past_end = get_file_content(working_dir, "lines.txt", start_line=20)
+        backwards = get_file_content(
+            working_dir, "lines.txt", start_line=5, end_line=2
+        )
+        print(f"Results: {past_end} / {backwards}")
+        if (past_end == 'Error: "lines.txt" has only 10 lines'
+                and backwards.startswith("Error: end_line (2)")):
+            print("✓ Invalid ranges rejected")
+        else:
+            print("✗ Invalid ranges should be rejected")
+        print()
+
+        # Test 8: A line range cut by limit says where to continue
+        print("Test 8: Reading from line 1 with limit=20")
+        result = get_file_content(
+            working_dir, "lines.txt", start_line=1, limit=20
+        )
+        print(f"Result: {result!r}")
+        if result.endswith(
+            "truncated at 20 bytes, continue with start_line=3]"
+        ):
+            print("✓ Continuation notice found")
+        else:
+            print("✗ Continuation notice NOT found")
+        print()
+
+        # Test 9: Byte windows with offset/limit
+        print("Test 9: Reading lines.txt with offset=7, limit=14")
+        middle = get_file_content(
+            working_dir, "lines.txt", offset=7, limit=14
+        )
+        last = get_file_content(working_dir, "lines.txt", offset=63)
+        print(f"Results: {middle!r} / {last!r}")
+        if (middle == 'line 2\nline 3\n[File "lines.txt": bytes 7-21 of '
+                      '71; continue with offset=21]'
+                and last == 'line 10\n[File "lines.txt": bytes 63-71 of 71]'):
+            print("✓ Byte windows read, continuation only before the end")
+        else:
+            print("✗ Byte windows FAILED")
+        print()
+
+        # Test 10: A UTF-8 character cut at a window edge is dropped
+        print("Test 10: Cutting 'é' (2 bytes) at the end and the start")
+        head = get_file_content(working_dir, "utf8.txt", offset=0, limit=2)
+        tail = get_file_content(working_dir, "utf8.txt", offset=2, limit=3)
+        print(f"Results: {head!r} / {tail!r}")
+        if (head.startswith("a\n[") and tail.startswith("b\n[")
+                and "\ufffd" not in head + tail):
+            print("✓ Partial characters dropped without replacement marks")
+        else:
+            print("✗ Partial characters were NOT dropped")
+        print()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,135 @@
+import os
+import sys
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from langchain_core.messages import (  # noqa: E402
+    AIMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+
+from agent_core.history import (  # noqa: E402
+    compact_history,
+    estimate_history_tokens,
+)
+from agent_core.providers.prompt_loader import get_settings  # noqa: E402
+
+TURNS = 12
+
+
+def build_history():
+    """A session of TURNS model turns, each reading two large files."""
+    messages = [
+        SystemMessage(content="You are a test."),
+        HumanMessage(content="Summarize the project."),
+    ]
+    for turn in range(TURNS):
+        calls = [
+            {"name": "get_file_content", "args": {"file_path": f"f{i}.py"},
+             "id": f"call_{turn}_{i}", "type": "tool_call"}
+            for i in range(2)
+        ]
+        messages.append(AIMessage(content="", tool_calls=calls))
+        for call in calls:
+            messages.append(ToolMessage(
+                content=f"# {call['id']}\n" + "x = 1\n" * 1500,
+                tool_call_id=call["id"],
+                name=call["name"],
+            ))
+    messages.append(AIMessage(content="Done."))
+    return messages
+
+
+def tool_pairs(messages):
+    """
+    Check that each tool call is answered right after its AIMessage.
+
+    Returns:
+        list: Problems found (empty if every pair is intact)
+    """
+    problems = []
+    pending = []
+    for message in messages:
+        if message.type == "tool":
+            if not pending or message.tool_call_id != pending.pop(0):
+                problems.append(f"unexpected result {message.tool_call_id}")
+            continue
+        if pending:
+            problems.append(f"unanswered calls {pending}")
+        pending = [call["id"] for call in getattr(message, "tool_calls", [])]
+    if pending:
+        problems.append(f"unanswered calls {pending}")
+    return problems
+
+
+def main():
+    all_passed = True
+    budget = get_settings().get("HISTORY_TOKEN_BUDGET", 32000)
+    messages = build_history()
+    original = list(messages)
+    stats = compact_history(messages, budget)
+    print(f"Budget {budget}: {stats}")
+
+    # Test 1: The compacted history fits the budget
+    print("Test 1: History fits HISTORY_TOKEN_BUDGET")
+    if (stats["tokens_before"] > budget
+            and stats["tokens_after"] <= budget
+            and estimate_history_tokens(messages) == stats["tokens_after"]
+            and stats["elided_messages"] > 0):
+        print(f"  ✓ {stats['tokens_before']} -> {stats['tokens_after']}")
+    else:
+        print("  ✗ History still over budget")
+        all_passed = False
+    print()
+
+    # Test 2: No tool call loses its result
+    print("Test 2: Every tool call keeps its ToolMessage")
+    problems = tool_pairs(messages)
+    if not problems and len(messages) == len(original):
+        print(f"  ✓ {TURNS * 2} calls still paired with their results")
+    else:
+        print(f"  ✗ {problems}")
+        all_passed = False
+    print()
+
+    # Test 3: The system prompt, the query and recent turns are untouched
+    print("Test 3: System, first user message and recent turns kept")
+    recent = len(original) - 4  # Last tool turn and the final answer
+    if (messages[0] is original[0] and messages[1] is original[1]
+            and all(a is b for a, b in zip(messages[recent:],
+                                           original[recent:]))
+            and all(m is o for m, o in zip(messages, original)
+                    if m.type == "ai")):
+        print("  ✓ Only older tool outputs were replaced")
+    else:
+        print("  ✗ A message that should be kept was changed")
+        all_passed = False
+    print()
+
+    # Test 4: Elided outputs say so and keep a preview
+    print("Test 4: Elided outputs keep a preview")
+    elided = [m for m in messages if "elided to save context" in m.content]
+    if (len(elided) == stats["elided_messages"]
+            and all(m.content.startswith(f"# {m.tool_call_id}")
+                    for m in elided)):
+        print(f"  ✓ {len(elided)} outputs replaced by a preview")
+    else:
+        print("  ✗ Elided outputs are missing their preview")
+        all_passed = False
+    print()
+
+    if all_passed:
+        print("All tests passed!")
+    else:
+        print("Some tests failed!")
+    return all_passed
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,120 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.engine import AgentModel  # noqa: E402
+from agent_core.llm_cache import (  # noqa: E402
+    LLMCacheMiss,
+    LLMResponseCache,
+    cache_key,
+)
+from langchain_core.messages import (  # noqa: E402
+    AIMessage,
+    HumanMessage,
+    SystemMessage,
+)
+
+TOOLS = [{"type": "function", "function": {"name": "get_files_info"}}]
+
+
+class CountingModel:
+    """Stand-in for the tool-bound chat model that counts its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": "get_files_info", "args": {},
+                         "id": f"call_{self.calls}"}],
+        )
+
+
+def conversation(query):
+    return [SystemMessage(content="You are a test."),
+            HumanMessage(content=query)]
+
+
+def main():
+    all_passed = True
+    messages = conversation("List the files.")
+
+    # Test 1: The key covers the model, the tools and the conversation only
+    print("Test 1: Cache keys")
+    key = cache_key("gpt-test", 0, TOOLS, messages)
+    with_ids = conversation("List the files.")
+    for message in with_ids:
+        message.id = "run-specific"
+    other_tools = TOOLS + [
+        {"type": "function", "function": {"name": "write_file"}}
+    ]
+    if (cache_key("gpt-test", 0, TOOLS, with_ids) == key
+            and cache_key("gpt-other", 0, TOOLS, messages) != key
+            and cache_key("gpt-test", 0, other_tools, messages) != key
+            and cache_key("gpt-test", 0, TOOLS, conversation("Hi")) != key):
+        print("✓ Key changes with the model, tools and messages, not ids")
+    else:
+        print("✗ Cache key does not cover the right fields")
+        all_passed = False
+    print()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = LLMResponseCache(os.path.join(cache_dir, "llm.sqlite"))
+        fake = CountingModel()
+        agent_model = AgentModel("gpt-test", cache_mode="off")
+        agent_model.llm_with_tools = fake
+        agent_model.cache = cache
+        agent_model.cache_mode = "read-through"
+        try:
+            # Test 2: A miss calls the model, the repeat is a hit
+            print("Test 2: Miss then hit in read-through mode")
+            first = asyncio.run(agent_model.ainvoke(messages))
+            second = asyncio.run(agent_model.ainvoke(messages))
+            if (fake.calls == 1
+                    and "llm_cache" not in first.response_metadata
+                    and second.response_metadata.get("llm_cache") == "hit"
+                    and second.tool_calls == first.tool_calls):
+                print("✓ Model called once, second answer replayed")
+            else:
+                print(f"✗ Model called {fake.calls} times")
+                all_passed = False
+            print()
+
+            # Test 3: Replay mode never calls the model
+            print("Test 3: Replay mode")
+            agent_model.cache_mode = "replay"
+            replayed = asyncio.run(agent_model.ainvoke(messages))
+            try:
+                asyncio.run(agent_model.ainvoke(conversation("Other")))
+                missed = False
+            except LLMCacheMiss:
+                missed = True
+            if (missed and fake.calls == 1
+                    and replayed.response_metadata.get("llm_cache") == "hit"):
+                print("✓ Hit replayed, miss raised LLMCacheMiss")
+            else:
+                print(f"✗ LLMCacheMiss raised: {missed}, "
+                      f"model calls: {fake.calls}")
+                all_passed = False
+            print()
+        finally:
+            cache.close()
+
+    if all_passed:
+        print("All tests passed!")
+    else:
+        print("Some tests failed!")
+    return all_passed
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
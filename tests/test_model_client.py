@@ -0,0 +1,162 @@
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+import agent_core.providers.model_client as model_client  # noqa: E402
+from agent_core.engine import AgentModel  # noqa: E402
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+
+class StubOpenAIHandler(BaseHTTPRequestHandler):
+    """
+    Minimal OpenAI-compatible chat completions endpoint.
+
+    Answers the first request with a 429, rejects any request that sets a
+    temperature, and answers everything else with "hello".
+    """
+
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        StubOpenAIHandler.requests.append(body)
+
+        if len(StubOpenAIHandler.requests) == 1:
+            self._reply(429, {"error": {"message": "Rate limit reached"}},
+                        {"retry-after": "0"})
+        elif "temperature" in body:
+            self._reply(400, {"error": {
+                "message": "Unsupported parameter: 'temperature'",
+                "type": "invalid_request_error",
+            }})
+        else:
+            self._reply(200, {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "hello"},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 5, "completion_tokens": 1,
+                          "total_tokens": 6},
+            })
+
+    def _reply(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RateLimitError(Exception):
+    """A 429 error whose response asks for a retry after some seconds."""
+
+    status_code = 429
+
+    def __init__(self, retry_after):
+        super().__init__("Rate limit reached")
+        self.response = type(
+            "Response", (), {"headers": {"retry-after": str(retry_after)}}
+        )
+
+
+async def ask(model, temperature):
+    agent_model = AgentModel(model, temperature, cache_mode="off")
+    response = await agent_model.ainvoke([HumanMessage(content="hi")])
+    return agent_model, response
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOpenAIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["OPENAI_API_KEY"] = "test-key"
+    os.environ["OPENAI_BASE_URL"] = (
+        f"http://127.0.0.1:{server.server_address[1]}/v1"
+    )
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Keep the stub model's capabilities out of the real cache
+        capabilities_file = os.path.join(cache_dir, "capabilities.json")
+        model_client._capabilities_path = lambda: capabilities_file
+        model_client._capabilities = None
+
+        # Test 1: A 429 is retried and a rejected temperature is dropped
+        print("Test 1: Rate limit, then temperature rejected, then success")
+        _, response = asyncio.run(ask("stub-model", 0.7))
+        sent = StubOpenAIHandler.requests
+        print(f"Response: {response.content!r} after {len(sent)} requests")
+        if (response.content == "hello" and len(sent) == 3 and
+                "temperature" in sent[1] and "temperature" not in sent[2]):
+            print("✓ Retried past the 429 and the temperature error")
+        else:
+            print("✗ Expected 3 requests ending in success")
+        print()
+
+        # Test 2: The capability is cached on disk for later runs
+        print("Test 2: A new model instance skips the failing temperature")
+        with open(capabilities_file) as f:
+            cached = json.load(f)
+        print(f"Cached capabilities: {cached}")
+        model_client._capabilities = None
+        StubOpenAIHandler.requests = [{}]
+        _, response = asyncio.run(ask("stub-model", 0.7))
+        sent = StubOpenAIHandler.requests[1:]
+        if (cached == {"stub-model": {"temperature": False}} and
+                len(sent) == 1 and "temperature" not in sent[0]):
+            print("✓ Temperature left out up front")
+        else:
+            print("✗ Temperature should be left out after it was rejected")
+        print()
+
+        # Test 3: Sessions on the same loop share one connection pool
+        print("Test 3: Connection pool reuse")
+
+        async def pools():
+            first, _ = await ask("stub-model", 0)
+            second, _ = await ask("stub-model", 0)
+            client = first.llm_with_tools.bound.http_async_client
+            return client is not None and (
+                client is second.llm_with_tools.bound.http_async_client
+            )
+
+        if asyncio.run(pools()):
+            print("✓ Both models use the same HTTP client")
+        else:
+            print("✗ Models should share one HTTP client")
+        print()
+
+    # Test 4: A long retry-after is capped at LLM_RETRY_MAX_SECONDS
+    print("Test 4: retry-after of one hour")
+    delay = model_client.retry_delay(RateLimitError(3600), 0)
+    cap = model_client.get_settings().get("LLM_RETRY_MAX_SECONDS", 30)
+    print(f"Delay: {delay}s (cap {cap}s)")
+    if delay == cap:
+        print("✓ Server delay capped")
+    else:
+        print("✗ Server delay should be capped")
+    print()
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
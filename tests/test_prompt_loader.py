@@ -0,0 +1,112 @@
+import os
+import sys
+import tempfile
+from types import MappingProxyType
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.providers.prompt_loader import (  # noqa: E402
+    clear_cache,
+    get_settings,
+    load_yaml,
+)
+
+
+def main():
+    all_passed = True
+    work_dir = tempfile.mkdtemp()
+    path = os.path.join(work_dir, "settings.yaml")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("name: first\nlimits:\n  depth: 2\ntags:\n  - a\n  - b\n")
+
+    # Test 1: An unchanged file is served from the cache
+    print("Test 1: Cache hit for an unchanged file")
+    first = load_yaml(path)
+    second = load_yaml(path)
+    settings = get_settings()
+    if first is second and first["name"] == "first" and (
+        get_settings() is settings
+    ):
+        print("  ✓ Same snapshot returned without re-parsing")
+    else:
+        print(f"  ✗ Got {dict(first)} and {dict(second)}")
+        all_passed = False
+    print()
+
+    # Test 2: A change of size is picked up
+    print("Test 2: Invalidation when the size changes")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("name: second, longer\n")
+    changed = load_yaml(path)
+    if changed is not first and changed["name"] == "second, longer":
+        print(f"  ✓ Re-read: name = {changed['name']!r}")
+    else:
+        print(f"  ✗ Stale snapshot: {dict(changed)}")
+        all_passed = False
+    print()
+
+    # Test 3: A change of mtime alone is picked up too
+    print("Test 3: Invalidation when only the mtime changes")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("name: third, longer!\n")  # Same size as before
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    touched = load_yaml(path)
+    if touched is not changed and touched["name"] == "third, longer!":
+        print(f"  ✓ Re-read: name = {touched['name']!r}")
+    else:
+        print(f"  ✗ Stale snapshot: {dict(touched)}")
+        all_passed = False
+    print()
+
+    # Test 4: Snapshots are read-only, including nested values
+    print("Test 4: Returned snapshots are immutable")
+    failures = []
+    for name, change in (
+        ("top-level set", lambda: first.__setitem__("name", "x")),
+        ("nested set", lambda: first["limits"].__setitem__("depth", 3)),
+        ("list append", lambda: first["tags"].append("c")),
+        ("settings set", lambda: settings.__setitem__("CACHE_DIR", "/")),
+    ):
+        try:
+            change()
+            failures.append(name)
+        except (TypeError, AttributeError):
+            pass
+    if (not failures and isinstance(first, MappingProxyType)
+            and isinstance(first["limits"], MappingProxyType)
+            and first["tags"] == ("a", "b")
+            and isinstance(settings, MappingProxyType)):
+        print("  ✓ Mappings are MappingProxyType, lists are tuples")
+    else:
+        print(f"  ✗ Mutation allowed: {failures}")
+        all_passed = False
+    print()
+
+    # Test 5: clear_cache() forces a re-parse
+    print("Test 5: clear_cache()")
+    clear_cache()
+    reloaded = load_yaml(path)
+    if reloaded is not touched and reloaded == touched:
+        print("  ✓ New snapshot with the same contents")
+    else:
+        print("  ✗ Cached snapshot returned after clear_cache()")
+        all_passed = False
+    print()
+
+    os.remove(path)
+    os.rmdir(work_dir)
+
+    if all_passed:
+        print("All tests passed!")
+    else:
+        print("Some tests failed!")
+    return all_passed
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,100 @@
+import asyncio
+import os
+import sys
+import tempfile
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.tools.read_files import (  # noqa: E402
+    read_files,
+    read_files_async,
+    share_budget,
+)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as working_dir:
+        os.makedirs(os.path.join(working_dir, "pkg"))
+        files = {
+            "small.py": "x = 1\n",
+            "pkg/medium.py": "y = 2\n" * 50,
+            "pkg/large.py": "z = 3\n" * 1000,
+        }
+        for path, text in files.items():
+            with open(os.path.join(working_dir, path), "w") as f:
+                f.write(text)
+        with open(os.path.join(working_dir, "data.bin"), "wb") as f:
+            f.write(b"\0\1\2")
+
+        # Test 1: Water-filling gives short files everything they need
+        print("Test 1: Sharing a budget of 300 across 10, 100 and 1000")
+        allotted = share_budget([10, 100, 1000], 300)
+        print(f"Result: {allotted}")
+        if allotted == [10, 100, 190]:
+            print("✓ Leftover budget goes to the largest file")
+        else:
+            print("✗ Budget NOT shared fairly")
+        print()
+
+        # Test 2: A list of paths comes back in one payload
+        print("Test 2: Reading three files with max_chars=1000")
+        result = read_files(
+            working_dir,
+            paths=["small.py", "pkg/medium.py", "pkg/large.py"],
+            max_chars=1000,
+        )
+        print(f"Result (start):\n{result[:200]}")
+        headers = [line for line in result.splitlines()
+                   if line.startswith("==> ")]
+        if (len(headers) == 3 and files["small.py"] in result
+                and files["pkg/medium.py"] in result
+                and 'File "pkg/large.py" truncated at 694 characters'
+                in result):
+            print("✓ Small files whole, large file truncated with a marker")
+        else:
+            print("✗ Unexpected payload")
+        print()
+
+        # Test 3: A glob selects files; async version reads concurrently
+        print("Test 3: Reading pkg/*.py with the async version")
+        result = asyncio.run(read_files_async(working_dir, pattern="pkg/*.py"))
+        headers = [line for line in result.splitlines()
+                   if line.startswith("==> ")]
+        print(f"Headers: {headers}")
+        if ("==> pkg/large.py <==" in result
+                and "==> pkg/medium.py <==" in result
+                and "small.py" not in result):
+            print("✓ Glob matched only the pkg files")
+        else:
+            print("✗ Glob matches wrong")
+        print()
+
+        # Test 4: Sandbox and binary checks are shared with get_file_content
+        print("Test 4: Files outside the sandbox and binary files")
+        result = read_files(
+            working_dir, paths=["../outside.txt", "data.bin", "small.py"]
+        )
+        print(f"Result:\n{result}")
+        if ("outside the permitted working directory" in result
+                and "appears to be a binary file" in result
+                and "x = 1" in result):
+            print("✓ Bad files report errors, the others are still read")
+        else:
+            print("✗ Checks FAILED")
+        print()
+
+        # Test 5: Nothing to read
+        print("Test 5: No paths and no pattern")
+        result = read_files(working_dir)
+        print(f"Result: {result}")
+        if result.startswith("Error:"):
+            print("✓ Error returned")
+        else:
+            print("✗ Expected an error")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+import uuid
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.call_function import PROJECT_ROOT  # noqa: E402
+from agent_core.repl import InteractiveSession, run_repl  # noqa: E402
+from benchmarks.scripted_model import (  # noqa: E402
+    ScriptedAgentModel,
+    scripted_response,
+    tool_call,
+)
+
+SCRIPT = [
+    # Turn 1: read a file, then answer
+    scripted_response(
+        tool_calls=[tool_call(
+            "get_file_content",
+            {"file_path": "README.md", "limit": 5},
+            "call_0",
+        )],
+        prompt_tokens=100,
+        completion_tokens=10,
+    ),
+    scripted_response(content="It is a README.", prompt_tokens=150,
+                      completion_tokens=5),
+    # Turn 2: a follow-up answered from the history alone
+    scripted_response(content="Yes, the same one.", prompt_tokens=160,
+                      completion_tokens=4),
+]
+
+
+def lines(*inputs):
+    """Build a read_line function returning the given lines, then EOF."""
+    remaining = list(inputs)
+
+    def read_line(prompt):
+        if not remaining:
+            raise EOFError
+        return remaining.pop(0)
+    return read_line
+
+
+class SlowModel(ScriptedAgentModel):
+    """A scripted model whose calls hang until they are cancelled."""
+
+    async def ainvoke(self, messages):
+        await asyncio.sleep(30)
+        return await super().ainvoke(messages)
+
+
+def interrupting(*inputs):
+    """
+    Build a read_line function that sends Ctrl-C at "^C" entries.
+
+    A "^C" input raises KeyboardInterrupt like input() does at the prompt;
+    "slow ..." inputs are returned, and SIGINT is sent shortly after, while
+    the turn runs.
+    """
+    remaining = list(inputs)
+
+    def read_line(prompt):
+        if not remaining:
+            raise EOFError
+        line = remaining.pop(0)
+        if line == "^C":
+            raise KeyboardInterrupt
+        if line.startswith("slow"):
+            asyncio.get_running_loop().call_later(
+                0.2, os.kill, os.getpid(), signal.SIGINT
+            )
+        return line
+    return read_line
+
+
+def interrupting_script(pid_path, *inputs):
+    """
+    Build a read_line function that sends Ctrl-C once a script is running.
+
+    SIGINT is sent after the first input, as soon as the script has
+    written its pid to pid_path.
+    """
+    remaining = list(inputs)
+
+    async def interrupt_when_started():
+        while not os.path.exists(pid_path):
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.05)
+        os.kill(os.getpid(), signal.SIGINT)
+
+    def read_line(prompt):
+        if not remaining:
+            raise EOFError
+        if len(remaining) == len(inputs):
+            asyncio.ensure_future(interrupt_when_started())
+        return remaining.pop(0)
+    return read_line
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def main():
+    all_passed = True
+    session = InteractiveSession(
+        ScriptedAgentModel(SCRIPT), "You are a test."
+    )
+    transcript_path = os.path.join(
+        tempfile.mkdtemp(), "transcript.json"
+    )
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        asyncio.run(run_repl(session, lines(
+            "What is README.md?",
+            "Is it the same file?",
+            "/usage",
+            f"/save {transcript_path}",
+            "This turn fails",
+        )))
+    output = output.getvalue()
+
+    # Test 1: Turns share one conversation
+    print("Test 1: Follow-up turns append to the same history")
+    types = [message.type for message in session.messages]
+    expected = ["system", "human", "ai", "tool", "ai", "human", "ai"]
+    if types == expected and session.turns == 2:
+        print(f"  ✓ {len(types)} messages after 2 turns")
+    else:
+        print(f"  ✗ Got {types} after {session.turns} turns")
+        all_passed = False
+    print()
+
+    # Test 2: Usage per turn and for the session
+    print("Test 2: Usage is tracked per turn and in total")
+    if (session.last_usage == {"prompt_tokens": 160,
+                               "completion_tokens": 4}
+            and session.total_usage == {"prompt_tokens": 410,
+                                        "completion_tokens": 19}
+            and "Last turn: 160 prompt + 4 completion tokens" in output):
+        print("  ✓ Last turn 160+4, session 410+19")
+    else:
+        print(f"  ✗ last {session.last_usage}, total {session.total_usage}")
+        all_passed = False
+    print()
+
+    # Test 3: A failed turn leaves the history as it was
+    print("Test 3: A failed turn is rolled back")
+    if len(session.messages) == 7 and "Error: Scripted model" in output:
+        print("  ✓ History unchanged after the error")
+    else:
+        print(f"  ✗ {len(session.messages)} messages")
+        all_passed = False
+    print()
+
+    # Test 4: /save writes the transcript
+    print("Test 4: /save writes the transcript")
+    try:
+        with open(transcript_path, encoding="utf-8") as f:
+            transcript = json.load(f)
+        if (transcript["turns"] == 2
+                and len(transcript["messages"]) == 7
+                and transcript["usage"]["prompt_tokens"] == 410):
+            print("  ✓ Transcript has 7 messages")
+        else:
+            print(f"  ✗ Unexpected transcript: {transcript}")
+            all_passed = False
+    except (OSError, ValueError) as e:
+        print(f"  ✗ {e}")
+        all_passed = False
+    finally:
+        if os.path.exists(transcript_path):
+            os.remove(transcript_path)
+    print()
+
+    # Test 5: /clear keeps only the system prompt
+    print("Test 5: /clear starts a new conversation")
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(run_repl(session, lines("/clear", "/exit", "unused")))
+    if ([message.type for message in session.messages] == ["system"]
+            and session.turns == 0
+            and session.total_usage["prompt_tokens"] == 410):
+        print("  ✓ History cleared, session usage kept")
+    else:
+        print(f"  ✗ {len(session.messages)} messages left")
+        all_passed = False
+    print()
+
+    # Test 6: Ctrl-C cancels a turn; at an empty prompt it exits
+    print("Test 6: Ctrl-C during a turn and at the prompt")
+    slow_session = InteractiveSession(SlowModel([]), "You are a test.")
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        asyncio.run(run_repl(slow_session, interrupting(
+            "slow question", "/usage", "^C", "never read",
+        )))
+    output = output.getvalue()
+    if ("Turn cancelled." in output and "Turns: 0" in output
+            and [m.type for m in slow_session.messages] == ["system"]):
+        print("  ✓ Turn cancelled and rolled back, Ctrl-C at prompt exits")
+    else:
+        print(f"  ✗ Output:\n{output}")
+        all_passed = False
+    print()
+
+    # Test 7: Ctrl-C while a tool runs a script kills the script
+    print("Test 7: Ctrl-C during run_python_file")
+    # Tools run in the project root, so work in a scratch directory there
+    rel_dir = f"tests/_repl_{uuid.uuid4().hex[:8]}"
+    work_dir = os.path.join(PROJECT_ROOT, rel_dir)
+    os.makedirs(work_dir)
+    pid_path = os.path.join(work_dir, "pid.txt")
+    finished_path = os.path.join(work_dir, "finished.txt")
+    with open(os.path.join(work_dir, "slow.py"), "w") as f:
+        # Scripts run in the project root, so write to fixed paths
+        f.write(
+            "import os, time\n"
+            f"with open({rel_dir + '/pid.txt'!r}, 'w') as f:\n"
+            "    f.write(str(os.getpid()))\n"
+            "time.sleep(1)\n"
+            f"open({rel_dir + '/finished.txt'!r}, 'w').close()\n"
+        )
+    script_session = InteractiveSession(ScriptedAgentModel([
+        scripted_response(tool_calls=[tool_call(
+            "run_python_file", {"file_path": f"{rel_dir}/slow.py"}, "call_0",
+        )]),
+    ]), "You are a test.")
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            asyncio.run(run_repl(script_session, interrupting_script(
+                pid_path, "run the script",
+            )))
+        with open(pid_path) as f:
+            pid = int(f.read())
+        # Give the script time to finish, had it been left running
+        time.sleep(1.2)
+        if ("Turn cancelled." in output.getvalue()
+                and not process_alive(pid)
+                and not os.path.exists(finished_path)
+                and [m.type for m in script_session.messages] == ["system"]):
+            print("  ✓ Turn cancelled and the script was killed")
+        else:
+            print(f"  ✗ Script alive: {process_alive(pid)}, output:\n"
+                  f"{output.getvalue()}")
+            all_passed = False
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print()
+
+    if all_passed:
+        print("All tests passed!")
+    else:
+        print("Some tests failed!")
+    return all_passed
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -1,12 +1,44 @@
+import asyncio
 import os
 import sys
+import tempfile
+import time
 
 # Add root and src directories to Python path
 root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 sys.path.insert(0, os.path.join(root_dir, "src"))
 sys.path.insert(0, root_dir)
 
-from agent_core.tools.run_python_file import run_python_file  # noqa: E402
+from agent_core.python_worker import ForkServer  # noqa: E402
+from agent_core.tools import run_python_file as run_module  # noqa: E402
+from agent_core.tools.run_python_file import (  # noqa: E402
+    run_python_file,
+    run_python_file_async,
+)
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+async def cancel_script(working_dir, script):
+    """Start a script, cancel it once it wrote its pid, return the pid."""
+    pid_path = os.path.join(working_dir, "pid.txt")
+    task = asyncio.ensure_future(run_python_file_async(working_dir, script))
+    while not os.path.exists(pid_path):
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(0.05)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    with open(pid_path) as f:
+        return int(f.read())
 
 
 def main():
@@ -70,6 +102,77 @@ def main():
         print("✗ Extension check FAILED - should reject non-Python file")
     print()
 
+    # Test 7: The forkserver backend returns the same output as a subprocess
+    print("Test 7: Running a script on the forkserver backend")
+    if hasattr(os, "fork"):
+        with tempfile.TemporaryDirectory() as working_dir:
+            with open(os.path.join(working_dir, "echo.py"), "w") as f:
+                f.write(
+                    "import os, sys\n"
+                    "print(os.getcwd() == sys.argv[1], sys.argv[2:])\n"
+                    "sys.stderr.write('warning\\n')\n"
+                    "sys.exit(3)\n"
+                )
+            args = [working_dir, "a", "b c"]
+            expected = run_python_file(working_dir, "echo.py", args)
+            fork_server = ForkServer()
+            original = run_module._fork_server
+            run_module._fork_server = lambda: fork_server
+            try:
+                result = run_python_file(working_dir, "echo.py", args)
+            finally:
+                run_module._fork_server = original
+                fork_server.close()
+        print(f"Result:\n{result}")
+        if result == expected and "True ['a', 'b c']" in result:
+            print("✓ Forkserver output matches subprocess output")
+        else:
+            print("✗ Forkserver output DIFFERS from subprocess output")
+    else:
+        print("✓ Skipped - os.fork is not available")
+    print()
+
+    # Test 8: Chatty scripts are cut to a bounded head and tail
+    print("Test 8: Running a script that prints 5 MB")
+    with tempfile.TemporaryDirectory() as working_dir:
+        with open(os.path.join(working_dir, "chatty.py"), "w") as f:
+            f.write(
+                "print('FIRST')\n"
+                "for _ in range(50000):\n"
+                "    print('x' * 99)\n"
+                "print('LAST')\n"
+            )
+        result = run_python_file(working_dir, "chatty.py")
+    print(f"Result length: {len(result)}")
+    if (len(result) < 100000 and "FIRST" in result and "LAST" in result
+            and "bytes of output dropped" in result):
+        print("✓ Output kept head and tail and reported dropped bytes")
+    else:
+        print("✗ Output was NOT bounded as expected")
+    print()
+
+    # Test 9: Cancelling the async version kills the script
+    print("Test 9: Cancelling a running script")
+    with tempfile.TemporaryDirectory() as working_dir:
+        with open(os.path.join(working_dir, "slow.py"), "w") as f:
+            f.write(
+                "import os, time\n"
+                "with open('pid.txt', 'w') as f:\n"
+                "    f.write(str(os.getpid()))\n"
+                "time.sleep(1)\n"
+                "open('finished.txt', 'w').close()\n"
+            )
+        pid = asyncio.run(cancel_script(working_dir, "slow.py"))
+        alive = process_alive(pid)
+        time.sleep(1.5)
+        finished = os.path.exists(os.path.join(working_dir, "finished.txt"))
+    print(f"Script {pid}: alive {alive}, finished {finished}")
+    if not alive and not finished:
+        print("✓ Script killed when its task was cancelled")
+    else:
+        print("✗ Script kept running after the cancel")
+    print()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,61 @@
+import os
+import sys
+import tempfile
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.tools.get_file_content import get_file_content  # noqa: E402
+from agent_core.tools.write_file import write_file  # noqa: E402
+
+
+def main():
+    with tempfile.TemporaryDirectory() as base_dir:
+        working_dir = os.path.join(base_dir, "project")
+        outside_dir = os.path.join(base_dir, "outside")
+        os.makedirs(os.path.join(working_dir, "pkg"))
+        os.makedirs(outside_dir)
+        with open(os.path.join(outside_dir, "secret.txt"), "w") as f:
+            f.write("secret\n")
+        with open(os.path.join(working_dir, "pkg", "module.py"), "w") as f:
+            f.write("VALUE = 1\n")
+        os.symlink(outside_dir, os.path.join(working_dir, "escape"))
+        os.symlink("pkg", os.path.join(working_dir, "alias"))
+
+        # Test 1: A symlinked directory pointing outside is blocked
+        print("Test 1: Security check - reading escape/secret.txt")
+        result = get_file_content(working_dir, "escape/secret.txt")
+        print(f"Result: {result}")
+        if result.startswith("Error:") and "outside" in result:
+            print("✓ Security check passed - read was blocked")
+        else:
+            print("✗ Security check FAILED - read should be blocked")
+        print()
+
+        # Test 2: Writing through the same link is blocked too
+        print("Test 2: Security check - writing escape/new.txt")
+        result = write_file(working_dir, "escape/new.txt", "x")
+        print(f"Result: {result}")
+        if result.startswith("Error:") and not os.path.exists(
+            os.path.join(outside_dir, "new.txt")
+        ):
+            print("✓ Security check passed - write was blocked")
+        else:
+            print("✗ Security check FAILED - write should be blocked")
+        print()
+
+        # Test 3: A symlink that stays inside the working directory works
+        print("Test 3: Reading alias/module.py (link to pkg/)")
+        result = get_file_content(working_dir, "alias/module.py")
+        print(f"Result: {result}")
+        if result.startswith("VALUE = 1"):
+            print("✓ Link inside the working directory followed")
+        else:
+            print("✗ Link inside the working directory should work")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import contextlib
+import os
+import sys
+import tempfile
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.search_index import SearchIndex, mark_stale  # noqa: E402
+from agent_core.tools.search_files import search_files  # noqa: E402
+
+
+@contextlib.contextmanager
+def removing_index(working_dir):
+    """Delete the index search_files builds for working_dir afterwards."""
+    try:
+        yield
+    finally:
+        index = SearchIndex(working_dir)
+        index.close()
+        for suffix in ("", "-journal", "-wal", "-shm"):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(index.db_path + suffix)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as working_dir, \
+            removing_index(working_dir):
+        os.makedirs(os.path.join(working_dir, "pkg"))
+        with open(os.path.join(working_dir, "main.py"), "w") as f:
+            f.write("from pkg.calculator import Calculator\n\nprint(1)\n")
+        with open(os.path.join(working_dir, "pkg", "calculator.py"), "w") as f:
+            f.write("class Calculator:\n    def evaluate(self, text):\n")
+
+        # Test 1: Literal search finds the definition with file:line
+        print("Test 1: Searching for 'def evaluate'")
+        result = search_files(working_dir, "def evaluate")
+        print(f"Result:\n{result}")
+        if "pkg/calculator.py:2:" in result:
+            print("✓ Match found with file and line number")
+        else:
+            print("✗ Match NOT found")
+        print()
+
+        # Test 2: Case-insensitive by default, include filter applies
+        print("Test 2: Searching for 'CALCULATOR' in pkg/*.py only")
+        result = search_files(working_dir, "CALCULATOR", include=["pkg/*"])
+        print(f"Result:\n{result}")
+        if "main.py" not in result and "pkg/calculator.py:1:" in result:
+            print("✓ Include filter and case folding work")
+        else:
+            print("✗ Include filter or case folding FAILED")
+        print()
+
+        # Test 3: The index picks up a file written after the first search
+        print("Test 3: Searching for text in a newly written file")
+        with open(os.path.join(working_dir, "new.py"), "w") as f:
+            f.write("NEEDLE = 42\n")
+        mark_stale(working_dir)
+        result = search_files(working_dir, "needle")
+        print(f"Result:\n{result}")
+        if "new.py:1:" in result:
+            print("✓ Index updated incrementally")
+        else:
+            print("✗ New file NOT found")
+        print()
+
+        # Test 4: Security check - searching outside the working directory
+        print("Test 4: Security check - searching /etc")
+        result = search_files(working_dir, "root", directory="/etc")
+        print(f"Result: {result}")
+        if result.startswith("Error:") and "outside" in result:
+            print("✓ Security check passed - search was blocked")
+        else:
+            print("✗ Security check FAILED - search should be blocked")
+        print()
+
+        # Test 5: Non-ASCII letters fold the same in the index and search
+        print("Test 5: Literal search for 'ärger' in a file with 'Ärger'")
+        with open(os.path.join(working_dir, "notes.txt"), "w",
+                  encoding="utf-8") as f:
+            f.write("Viel Ärger\n")
+        mark_stale(working_dir)
+        literal = search_files(working_dir, "ärger")
+        print(f"Result:\n{literal}")
+        if "notes.txt:1:" in literal:
+            print("✓ Case-insensitive literal search finds 'Ärger'")
+        else:
+            print("✗ Non-ASCII literal search FAILED")
+        print()
+
+        # Test 6: Files too large to index are named in the result
+        print("Test 6: Searching with a file over SEARCH_MAX_FILE_BYTES")
+        with open(os.path.join(working_dir, "huge.log"), "w") as f:
+            f.write("x" * (1024 * 1024 + 1))
+        mark_stale(working_dir)
+        result = search_files(working_dir, "needle")
+        print(f"Result:\n{result}")
+        if "new.py:1:" in result and "Not searched" in result and (
+            "huge.log" in result
+        ):
+            print("✓ Skipped file is reported")
+        else:
+            print("✗ Skipped file NOT reported")
+        print()
+
+        # Test 7: Symlinks to files outside the working directory
+        print("Test 7: Security check - a link to a file outside")
+        with tempfile.TemporaryDirectory() as outside_dir:
+            secret = os.path.join(outside_dir, "secret.txt")
+            with open(secret, "w") as f:
+                f.write("TOPSECRET token=abc\n")
+            os.symlink(secret, os.path.join(working_dir, "link.txt"))
+            os.symlink("notes.txt", os.path.join(working_dir, "inner.txt"))
+            mark_stale(working_dir)
+            leaked = search_files(working_dir, "TOPSECRET")
+            regex = search_files(working_dir, "TOP.ECRET", regex=True)
+            inner = search_files(working_dir, "Ärger")
+        print(f"Results: {leaked!r} / {regex!r}")
+        if ("token=abc" not in leaked + regex
+                and "inner.txt:1:" in inner):
+            print("✓ Link leaving the sandbox skipped, inner link searched")
+        else:
+            print("✗ Security check FAILED - outside file was searched")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+
+from langchain_core.messages import HumanMessage, ToolMessage
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.call_function import PROJECT_ROOT  # noqa: E402
+from agent_core.checkpoint import checkpoint_path  # noqa: E402
+from agent_core.server import AgentServer  # noqa: E402
+from benchmarks.scripted_model import (  # noqa: E402
+    ScriptedAgentModel,
+    scripted_response,
+    tool_call,
+)
+
+
+class EchoChatModel:
+    """
+    Stub model that reads README.md once and then answers with the query.
+
+    Its answers depend only on the session's own messages, so concurrent
+    sessions can be checked for isolation. It records how many calls were
+    in flight at once.
+    """
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    async def ainvoke(self, messages):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        query = next(
+            m.content for m in messages if isinstance(m, HumanMessage)
+        )
+        if not isinstance(messages[-1], ToolMessage):
+            return scripted_response(
+                tool_calls=[tool_call(
+                    "get_file_content",
+                    {"file_path": "README.md", "limit": 5},
+                    "call_0",
+                )],
+                prompt_tokens=10,
+                completion_tokens=1,
+            )
+        return scripted_response(
+            content=f"Answer to {query} after {len(messages)} messages",
+            prompt_tokens=10,
+            completion_tokens=1,
+        )
+
+
+async def request(port, method, path, payload=None):
+    """Send one HTTP request; returns (status, body lines)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    head, _, body = data.partition(b"\r\n\r\n")
+    status = int(head.split(b" ")[1])
+    return status, body.decode().splitlines()
+
+
+async def scenario():
+    model = EchoChatModel()
+    agent_model = ScriptedAgentModel([])
+    agent_model.llm_with_tools = model
+    server = AgentServer(
+        agent_model, "You are a test.", max_sessions=4, checkpoint=False
+    )
+    _, port = await server.start("127.0.0.1", 0)
+    # A session id that already has a checkpoint from an earlier run
+    taken_id = f"test_{uuid.uuid4().hex[:8]}"
+    with open(checkpoint_path(taken_id), "w") as f:
+        f.write("{}\n")
+    try:
+        first, second = await asyncio.gather(
+            request(port, "POST", "/sessions",
+                    {"query": "first", "session_id": "s1"}),
+            request(port, "POST", "/sessions",
+                    {"query": "second", "session_id": "s2"}),
+        )
+        health = await request(port, "GET", "/health")
+        errors = await asyncio.gather(
+            request(port, "POST", "/sessions", {"prompt": "x"}),
+            request(port, "GET", "/sessions"),
+            request(port, "GET", "/missing"),
+            request(port, "POST", "/sessions",
+                    {"query": "x", "session_id": taken_id}),
+            request(port, "POST", "/sessions",
+                    {"query": "x", "session_id": "s\u00e9ance"}),
+            request(port, "POST", "/sessions", {"resume": "../s1"}),
+        )
+    finally:
+        await server.close()
+        os.remove(checkpoint_path(taken_id))
+    return model, first, second, health, errors
+
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+async def disconnect_during_script(rel_dir):
+    """
+    Start a session whose tool call runs slow.py, and hang up once the
+    script has written its pid. Returns (pid, server).
+    """
+    pid_path = os.path.join(PROJECT_ROOT, rel_dir, "pid.txt")
+    agent_model = ScriptedAgentModel([
+        scripted_response(tool_calls=[tool_call(
+            "run_python_file", {"file_path": f"{rel_dir}/slow.py"}, "call_0",
+        )]),
+        scripted_response(content="Never reached."),
+    ])
+    server = AgentServer(agent_model, "You are a test.", checkpoint=False)
+    _, port = await server.start("127.0.0.1", 0)
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = json.dumps({"query": "Run it."}).encode()
+        writer.write(
+            f"POST /sessions HTTP/1.1\r\nHost: localhost\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+        while not os.path.exists(pid_path):
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.05)
+        writer.close()
+        # Let the server notice and cancel the session
+        for _ in range(20):
+            await asyncio.sleep(0.05)
+            if server.active_sessions == 0:
+                break
+    finally:
+        await server.close()
+    with open(pid_path) as f:
+        return int(f.read()), server
+
+
+def main():
+    all_passed = True
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        model, first, second, health, errors = asyncio.run(scenario())
+
+    # Test 1: Each session streams its own events and answer
+    print("Test 1: Concurrent sessions stream isolated NDJSON events")
+    for (status, lines), session_id, query in (
+        (first, "s1", "first"), (second, "s2", "second")
+    ):
+        events = [json.loads(line) for line in lines]
+        kinds = [event["event"] for event in events]
+        done = events[-1]
+        expected = ["session", "iteration", "llm", "tool_result",
+                    "iteration", "llm", "done"]
+        if (status == 200 and kinds == expected
+                and done["session_id"] == session_id
+                and done["response"] == f"Answer to {query} after 4 messages"
+                and done["iterations"] == 2
+                and done["usage"]["prompt_tokens"] == 20
+                and events[3]["tool"] == "get_file_content"
+                and not events[3]["error"]):
+            print(f"  ✓ {session_id}: {done['response']!r}")
+        else:
+            print(f"  ✗ {session_id}: status {status}, events {kinds}")
+            print(f"    {done}")
+            all_passed = False
+    print()
+
+    # Test 2: The sessions ran at the same time
+    print("Test 2: Sessions overlap instead of running one after another")
+    if model.max_in_flight == 2:
+        print("  ✓ Two model calls were in flight at once")
+    else:
+        print(f"  ✗ At most {model.max_in_flight} model call(s) in flight")
+        all_passed = False
+    print()
+
+    # Test 3: Health endpoint counts sessions
+    print("Test 3: GET /health")
+    status, lines = health
+    info = json.loads(lines[0]) if lines else {}
+    if (status == 200 and info.get("completed_sessions") == 2
+            and info.get("active_sessions") == 0):
+        print(f"  ✓ {info}")
+    else:
+        print(f"  ✗ status {status}: {info}")
+        all_passed = False
+    print()
+
+    # Test 4: Bad requests get HTTP errors
+    print("Test 4: Invalid requests are rejected")
+    for (status, lines), expected in zip(
+        errors, (400, 405, 404, 409, 400, 400)
+    ):
+        if status == expected:
+            print(f"  ✓ {status}: {json.loads(lines[0])['error']}")
+        else:
+            print(f"  ✗ Expected {expected}, got {status}: {lines}")
+            all_passed = False
+    print()
+
+    # Test 5: A client that hangs up while a tool runs cancels the tool
+    print("Test 5: Disconnect while run_python_file runs")
+    # Tools run in the project root, so work in a scratch directory there
+    rel_dir = f"tests/_server_{uuid.uuid4().hex[:8]}"
+    work_dir = os.path.join(PROJECT_ROOT, rel_dir)
+    os.makedirs(work_dir)
+    finished_path = os.path.join(work_dir, "finished.txt")
+    with open(os.path.join(work_dir, "slow.py"), "w") as f:
+        # Scripts run in the project root, so write to fixed paths
+        f.write(
+            "import os, time\n"
+            f"with open({rel_dir + '/pid.txt'!r}, 'w') as f:\n"
+            "    f.write(str(os.getpid()))\n"
+            "time.sleep(1)\n"
+            f"open({rel_dir + '/finished.txt'!r}, 'w').close()\n"
+        )
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            pid, server = asyncio.run(disconnect_during_script(rel_dir))
+        # Give the script time to finish, had it been left running
+        time.sleep(1.2)
+        if (not process_alive(pid) and not os.path.exists(finished_path)
+                and server.active_sessions == 0
+                and server.completed_sessions == 0):
+            print("  ✓ Session cancelled and the script was killed")
+        else:
+            print(f"  ✗ Script alive: {process_alive(pid)}, finished: "
+                  f"{os.path.exists(finished_path)}, active sessions: "
+                  f"{server.active_sessions}")
+            all_passed = False
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print()
+
+    if all_passed:
+        print("All tests passed!")
+    else:
+        print("Some tests failed!")
+    return all_passed
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
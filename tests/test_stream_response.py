@@ -0,0 +1,148 @@
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+
+from langchain_core.messages import AIMessageChunk
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.call_function import TOOLS, tool_cache  # noqa: E402
+from agent_core.engine import build_messages, stream_response  # noqa: E402
+from benchmarks.scripted_model import ScriptedAgentModel  # noqa: E402
+
+
+def read_chunk(index, limit):
+    """A complete get_file_content call for one streamed chunk."""
+    return AIMessageChunk(content="", tool_call_chunks=[{
+        "name": "get_file_content",
+        "args": json.dumps({"file_path": "README.md", "limit": limit}),
+        "id": f"call_{index}",
+        "index": index,
+    }])
+
+
+class StreamingModel:
+    """
+    Stub model that streams the given chunks with a pause between them.
+
+    If fail is set, the stream raises it after the last chunk, like a
+    dropped connection. The time the stream ended is kept in ended_at.
+    """
+
+    def __init__(self, chunks, pause=0.2, fail=None):
+        self.chunks = chunks
+        self.pause = pause
+        self.fail = fail
+        self.ended_at = None
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    async def astream(self, messages):
+        for chunk in self.chunks:
+            yield chunk
+            await asyncio.sleep(self.pause)
+        self.ended_at = asyncio.get_running_loop().time()
+        if self.fail is not None:
+            raise self.fail
+
+
+@contextlib.contextmanager
+def recorded_reads(delays):
+    """
+    Replace get_file_content with a read that sleeps delays[limit] and
+    records when each call started and whether it was cancelled.
+    """
+    tool = TOOLS["get_file_content"]
+    original = tool.async_func
+    calls = {"started": {}, "cancelled": []}
+
+    async def read(file_path, limit=None, **kwargs):
+        calls["started"][limit] = asyncio.get_running_loop().time()
+        try:
+            await asyncio.sleep(delays[limit])
+        except asyncio.CancelledError:
+            calls["cancelled"].append(limit)
+            raise
+        return f"read {limit} lines"
+
+    tool.async_func = read
+    tool_cache.clear()
+    try:
+        yield calls
+    finally:
+        tool.async_func = original
+        tool_cache.clear()
+
+
+async def stream(model):
+    agent_model = ScriptedAgentModel([])
+    agent_model.llm_with_tools = model
+    with contextlib.redirect_stdout(io.StringIO()):
+        return await stream_response(
+            agent_model, build_messages("You are a test.", "Read it."),
+            tool_workers=2,
+        )
+
+
+def main():
+    all_passed = True
+
+    # Test 1: Tools start while the response streams; results keep order
+    print("Test 1: Early dispatch and result order")
+    model = StreamingModel([read_chunk(0, 1), read_chunk(1, 2)])
+    # The first call is slower, so it finishes after the second one
+    with recorded_reads({1: 0.5, 2: 0.05}) as calls:
+        response, results = asyncio.run(stream(model))
+    contents = [result["content"] for result in results]
+    if (calls["started"].get(1, model.ended_at) < model.ended_at
+            and [call["id"] for call in response.tool_calls]
+            == ["call_0", "call_1"]
+            and contents == ["read 1 lines", "read 2 lines"]):
+        print("  ✓ First tool started before the stream ended, "
+              "results in call order")
+    else:
+        print(f"  ✗ Started {calls['started']}, stream ended "
+              f"{model.ended_at}, results {contents}")
+        all_passed = False
+    print()
+
+    # Test 2: A failing stream cancels the tools it already started
+    print("Test 2: Stream error after a tool was dispatched")
+    model = StreamingModel(
+        [read_chunk(0, 1)], fail=ConnectionError("Stream dropped")
+    )
+
+    async def failing_stream():
+        try:
+            await stream(model)
+        except ConnectionError as e:
+            # Checked before asyncio.run() cancels leftover tasks itself
+            return str(e), list(calls["cancelled"])
+        return None, list(calls["cancelled"])
+
+    with recorded_reads({1: 5}) as calls:
+        error, cancelled = asyncio.run(failing_stream())
+    if error == "Stream dropped" and cancelled == [1]:
+        print("  ✓ Error raised and the running tool cancelled")
+    else:
+        print(f"  ✗ Error {error!r}, cancelled tools {cancelled}")
+        all_passed = False
+    print()
+
+    if all_passed:
+        print("All tests passed!")
+    else:
+        print("Some tests failed!")
+    return all_passed
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
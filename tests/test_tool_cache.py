@@ -0,0 +1,108 @@
+import contextlib
+import io
+import os
+import shutil
+import sys
+import uuid
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.call_function import (  # noqa: E402
+    PROJECT_ROOT,
+    ToolResultCache,
+    call_function,
+    tool_cache,
+)
+
+
+def run(name, **args):
+    # Tools print every call; keep the test output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        return call_function({"name": name, "args": args})["content"]
+
+
+def main():
+    all_passed = True
+    # Tools run in the project root, so work in a scratch directory there
+    rel_dir = f"tests/_tool_cache_{uuid.uuid4().hex[:8]}"
+    work_dir = os.path.join(PROJECT_ROOT, rel_dir)
+    os.makedirs(os.path.join(work_dir, "sub"))
+    with open(os.path.join(work_dir, "a.txt"), "w") as f:
+        f.write("first")
+    tool_cache.clear()
+    try:
+        # Test 1: Reading an unchanged file twice hits the cache
+        print("Test 1: Repeated read")
+        first = run("get_file_content", file_path=f"{rel_dir}/a.txt")
+        second = run("get_file_content", file_path=f"{rel_dir}/a.txt")
+        stats = tool_cache.stats()
+        print(f"Stats: {stats}")
+        if first == second == "first" and stats["hits"] == 1:
+            print("✓ Second read served from the cache")
+        else:
+            print(f"✗ Got {first!r}, {second!r}")
+            all_passed = False
+        print()
+
+        # Test 2: Writes, through a tool or not, make the next read a miss
+        print("Test 2: Reads after writes")
+        run("write_file", file_path=f"{rel_dir}/a.txt", content="second")
+        after_tool = run("get_file_content", file_path=f"{rel_dir}/a.txt")
+        with open(os.path.join(work_dir, "a.txt"), "w") as f:
+            f.write("third!")
+        after_outside = run("get_file_content", file_path=f"{rel_dir}/a.txt")
+        if after_tool == "second" and after_outside == "third!":
+            print("✓ Both reads returned the new content")
+        else:
+            print(f"✗ Got {after_tool!r} and {after_outside!r}")
+            all_passed = False
+        print()
+
+        # Test 3: Recursive listings see files added in subdirectories
+        print("Test 3: Recursive listing after a change in a subdirectory")
+        run("get_files_info", directory=rel_dir, max_depth=0)
+        with open(os.path.join(work_dir, "sub", "new.txt"), "w") as f:
+            f.write("new")
+        listing = run("get_files_info", directory=rel_dir, max_depth=0)
+        if "sub/new.txt" in listing:
+            print("✓ New file listed")
+        else:
+            print(f"✗ Stale listing:\n{listing}")
+            all_passed = False
+        print()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        tool_cache.clear()
+
+    # Test 4: The byte cap evicts least recently used entries
+    print("Test 4: Byte-cap eviction")
+    cache = ToolResultCache(max_bytes=10, max_entries=10)
+    cache.put("a", "1234")
+    cache.put("b", "5678")
+    cache.get("a")
+    cache.put("c", "90ab")
+    cache.put("huge", "x" * 11)
+    stats = cache.stats()
+    print(f"Stats: {stats}")
+    if (cache.get("b") is None and cache.get("a") == "1234"
+            and cache.get("huge") is None
+            and stats["evictions"] == 1 and stats["bytes"] == 8):
+        print("✓ Least recently used entry evicted, oversized one skipped")
+    else:
+        print("✗ Eviction did not follow the byte cap")
+        all_passed = False
+    print()
+
+    if all_passed:
+        print("All tests passed!")
+    else:
+        print("Some tests failed!")
+    return all_passed
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,106 @@
+import os
+import sys
+import tempfile
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.call_function import (  # noqa: E402
+    TOOLS,
+    available_tools,
+    call_function,
+    function_map,
+)
+from agent_core.tracing import (  # noqa: E402
+    configure_tracing,
+    flush_tracing,
+    read_spans,
+)
+
+
+def main():
+    # Test 1: Every tool module registered its schema and implementations
+    print("Test 1: Registry matches the tool schemas")
+    names = [schema["function"]["name"] for schema in available_tools]
+    print(f"Tools: {', '.join(names)}")
+    if (names == list(TOOLS) and set(names) == set(function_map) and
+            all(tool.async_func is not None for tool in TOOLS.values())):
+        print("✓ Schemas, functions and async functions are in sync")
+    else:
+        print("✗ Registry is out of sync")
+    print()
+
+    # Test 2: A missing required argument is reported, not raised
+    print("Test 2: Calling get_file_content without file_path")
+    result = call_function({"name": "get_file_content", "args": {}})
+    print(f"Result: {result['content']}")
+    if result["content"].startswith("Error: Invalid arguments") and (
+        "file_path" in result["content"]
+    ):
+        print("✓ Missing argument rejected")
+    else:
+        print("✗ Missing argument should be rejected")
+    print()
+
+    # Test 3: Wrong types and unknown arguments are rejected
+    print("Test 3: Wrong argument type and an unknown argument")
+    wrong_type = call_function({
+        "name": "get_files_info", "args": {"max_depth": "2"},
+    })["content"]
+    unknown = call_function({
+        "name": "get_files_info", "args": {"dir": "src"},
+    })["content"]
+    print(f"Results: {wrong_type} / {unknown}")
+    if ("must be an integer" in wrong_type and
+            "unexpected argument 'dir'" in unknown):
+        print("✓ Invalid arguments rejected")
+    else:
+        print("✗ Invalid arguments should be rejected")
+    print()
+
+    # Test 4: The model cannot move the sandbox root
+    print("Test 4: Security check - working_directory from the model")
+    result = call_function({
+        "name": "get_file_content",
+        "args": {"file_path": "README.md", "working_directory": "/",
+                 "limit": 10},
+    })
+    print(f"Result: {result['content']}")
+    if result["content"].startswith("# AI Agent"):
+        print("✓ working_directory was ignored")
+    else:
+        print("✗ working_directory should be ignored")
+    print()
+
+    # Test 5: Rejected arguments are traced as failed tool calls
+    print("Test 5: Spans of calls with invalid arguments")
+    trace_path = os.path.join(tempfile.mkdtemp(), "trace.jsonl")
+    configure_tracing(trace_path)
+    try:
+        for call_id, name, args in [
+            ("wrong_type", "get_files_info", {"max_depth": "2"}),
+            ("missing", "get_file_content", {}),
+            ("unknown_key", "get_files_info", {"dir": "src"}),
+        ]:
+            call_function({"name": name, "args": args, "id": call_id})
+        flush_tracing()
+    finally:
+        configure_tracing(None)
+    spans = list(read_spans([trace_path]))
+    os.remove(trace_path)
+    print(f"Spans: {[(s['call_id'], s['tool'], s['error']) for s in spans]}")
+    if ([span["call_id"] for span in spans]
+            == ["wrong_type", "missing", "unknown_key"]
+            and all(span["kind"] == "tool" and span["error"] is True
+                    for span in spans)
+            and spans[1]["tool"] == "get_file_content"):
+        print("✓ Each rejected call has an error span")
+    else:
+        print("✗ Rejected calls should be traced as errors")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import asyncio
+import contextlib
+import io
+import os
+import shutil
+import sys
+import uuid
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.call_function import (  # noqa: E402
+    PROJECT_ROOT,
+    TOOLS,
+    call_functions,
+    call_functions_async,
+    tool_calls_conflict,
+)
+
+
+def call(name, call_id, **args):
+    return {"name": name, "args": args, "id": call_id, "type": "tool_call"}
+
+
+def quiet(func, *args, **kwargs):
+    # Tools print every call; keep the test output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def main():
+    all_passed = True
+    # Tools run in the project root, so work in a scratch directory there
+    rel_dir = f"tests/_scheduling_{uuid.uuid4().hex[:8]}"
+    work_dir = os.path.join(PROJECT_ROOT, rel_dir)
+    os.makedirs(work_dir)
+    try:
+        # Test 1: Only read-only tools may run side by side
+        print("Test 1: Conflict rules")
+        read = ("get_file_content", {"file_path": "a.txt"})
+        other_read = ("search_files", {"pattern": "x"})
+        write = ("write_file", {"file_path": "b.txt", "content": ""})
+        script = ("run_python_file", {"file_path": "s.py"})
+        cases = [
+            (read, other_read, False),
+            (write, read, True),
+            (script, read, True),
+            (read, script, True),
+            (script, script, True),
+            (write, ("edit_file", {"file_path": "c.txt"}), True),
+            (("no_such_tool", {}), read, True),
+        ]
+        failed = [
+            (first[0], second[0]) for first, second, expected in cases
+            if tool_calls_conflict(first, second) != expected
+        ]
+        if not failed:
+            print("✓ Reads run together; every other tool is ordered")
+        else:
+            print(f"✗ Wrong conflict result for {failed}")
+            all_passed = False
+        print()
+
+        # Test 2: A read after a write of the same path sees the new content
+        print("Test 2: write_file then get_file_content with 4 workers")
+        results = quiet(call_functions, [
+            call("write_file", "w", file_path=f"{rel_dir}/a.txt",
+                 content="fresh content"),
+            call("get_file_content", "r", file_path=f"{rel_dir}/a.txt"),
+        ], max_workers=4)
+        if results[1]["content"] == "fresh content":
+            print("✓ Read returned the written content")
+        else:
+            print(f"✗ Read returned {results[1]['content']!r}")
+            all_passed = False
+        print()
+
+        # Test 3: A read after a script sees the file the script wrote
+        print("Test 3: run_python_file then get_file_content (async)")
+        # Scripts run in the working directory, so write to a fixed path
+        with open(os.path.join(work_dir, "make.py"), "w") as f:
+            f.write(
+                "import time\n"
+                "time.sleep(0.3)\n"
+                f"with open({rel_dir + '/out.txt'!r}, 'w') as f:\n"
+                "    f.write('made by script')\n"
+            )
+        results = quiet(asyncio.run, call_functions_async([
+            call("run_python_file", "s", file_path=f"{rel_dir}/make.py"),
+            call("get_file_content", "r", file_path=f"{rel_dir}/out.txt"),
+        ], max_workers=4))
+        if results[1]["content"] == "made by script":
+            print("✓ Read waited for the script")
+        else:
+            print(f"✗ Read returned {results[1]['content']!r}")
+            all_passed = False
+        print()
+
+        # Test 4: Independent reads overlap
+        print("Test 4: Three reads run in parallel")
+        tool = TOOLS["get_file_content"]
+        original = tool.async_func
+        in_flight = {"now": 0, "max": 0}
+
+        async def slow_read(**kwargs):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.1)
+            in_flight["now"] -= 1
+            return await original(**kwargs)
+
+        tool.async_func = slow_read
+        try:
+            quiet(asyncio.run, call_functions_async([
+                call("get_file_content", f"r{i}", file_path="README.md",
+                     limit=10 + i)
+                for i in range(3)
+            ], max_workers=4))
+        finally:
+            tool.async_func = original
+        if in_flight["max"] == 3:
+            print("✓ All three reads were in flight at once")
+        else:
+            print(f"✗ At most {in_flight['max']} reads in flight")
+            all_passed = False
+        print()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if all_passed:
+        print("All tests passed!")
+    else:
+        print("Some tests failed!")
+    return all_passed
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
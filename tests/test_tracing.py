@@ -0,0 +1,114 @@
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+# Add root and src directories to Python path
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(root_dir, "src"))
+sys.path.insert(0, root_dir)
+
+from agent_core.call_function import call_function  # noqa: E402
+from agent_core.tracing import (  # noqa: E402
+    configure_tracing,
+    flush_tracing,
+    read_spans,
+    set_trace_iteration,
+    set_trace_session,
+    summarize,
+)
+
+
+def call(name, call_id, **args):
+    return {"name": name, "args": args, "id": call_id, "type": "tool_call"}
+
+
+def main():
+    all_passed = True
+    trace_path = os.path.join(tempfile.mkdtemp(), "trace.jsonl")
+    configure_tracing(trace_path)
+    set_trace_session("session-1")
+    set_trace_iteration(3)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            call_function(call(
+                "get_file_content", "ok", file_path="README.md", limit=3
+            ))
+            call_function(call("no_such_tool", "unknown"))
+            call_function(call("get_file_content", "invalid", file_path=1))
+        flush_tracing()
+    finally:
+        configure_tracing(None)
+    spans = {span["call_id"]: span for span in read_spans([trace_path])}
+
+    # Test 1: A successful call is traced with its result size
+    print("Test 1: Span of a successful tool call")
+    span = spans.get("ok", {})
+    if (span.get("kind") == "tool"
+            and span.get("tool") == "get_file_content"
+            and span.get("session") == "session-1"
+            and span.get("iteration") == 3
+            and span.get("error") is False
+            and span.get("result_chars", 0) > 0
+            and span.get("duration_ms", -1) >= 0):
+        print("✓ Span has tool, session, iteration, size and duration")
+    else:
+        print(f"✗ Unexpected span: {span}")
+        all_passed = False
+    print()
+
+    # Test 2: Calls rejected before running still get an error span
+    print("Test 2: Spans of an unknown tool and invalid arguments")
+    unknown = spans.get("unknown", {})
+    invalid = spans.get("invalid", {})
+    if (unknown.get("tool") == "no_such_tool"
+            and unknown.get("error") is True
+            and invalid.get("tool") == "get_file_content"
+            and invalid.get("error") is True
+            and "duration_ms" in invalid):
+        print("✓ Both calls traced as errors under their tool name")
+    else:
+        print(f"✗ Got {unknown} and {invalid}")
+        all_passed = False
+    print()
+
+    # Test 3: The summary groups the trace per tool
+    print("Test 3: Summary of the trace file")
+    rows = {row["name"]: row for row in summarize(read_spans([trace_path]))}
+    row = rows.get("get_file_content", {})
+    if (row.get("count") == 2 and row.get("errors") == 1
+            and rows.get("no_such_tool", {}).get("errors") == 1):
+        print("✓ get_file_content: 2 calls, 1 error; no_such_tool: 1 error")
+    else:
+        print(f"✗ Got {rows}")
+        all_passed = False
+    print()
+
+    # Test 4: Nearest-rank p50 and p95
+    print("Test 4: p50/p95 of 20 spans taking 1..20 ms")
+    rows = summarize(
+        {"kind": "tool", "tool": "t", "duration_ms": float(ms)}
+        for ms in range(20, 0, -1)
+    )
+    row = rows[0]
+    if (row["p50_ms"] == 10.0 and row["p95_ms"] == 19.0
+            and row["max_ms"] == 20.0 and row["total_ms"] == 210.0):
+        print("✓ p50 10 ms, p95 19 ms, max 20 ms, total 210 ms")
+    else:
+        print(f"✗ Got {row}")
+        all_passed = False
+    print()
+
+    os.remove(trace_path)
+
+    if all_passed:
+        print("All tests passed!")
+    else:
+        print("Some tests failed!")
+    return all_passed
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)